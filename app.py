@@ -1,54 +1,183 @@
 #!/usr/bin/env python3
 # 康威生命游戏Web应用
 
-from flask import Flask, render_template, jsonify, request
-from src.grid import Grid
-from src.evolution import Evolution
-from src.config import DEFAULT_GRID_WIDTH, DEFAULT_GRID_HEIGHT
+import os
+import re
+import uuid
+from flask import Flask, Response, render_template, jsonify, request, g
+from src.game_state import GameState
+from src.session_registry import SessionRegistry
+from src.history import remove_history, clear_history_dir
+from src.persistence import loads
+from src.pattern_io import parse_rle, parse_cells, format_rle, format_cells
+from src.stream_codec import encode_keyframe, encode_delta, encode_keepalive
+from src.metrics import Metrics
+from src.config import (
+    STREAM_KEEPALIVE_INTERVAL, SESSION_COOKIE_NAME, EVOLVE_MAX_STEPS,
+    HISTORY_ENABLED, HISTORY_DIR, METRICS_ENABLED, METRICS_PREFIX, LIFE_RULES
+)
+
+SESSION_ID_PATTERN = re.compile(r'[A-Za-z0-9_-]{1,64}')
 
 app = Flask(__name__)
 
-# 全局游戏状态
-class GameState:
-    def __init__(self):
-        self.grid = Grid(width=DEFAULT_GRID_WIDTH, height=DEFAULT_GRID_HEIGHT)
-        self.evolution = Evolution(self.grid)
-        self.generation = 0
-        self.is_running = False
+# 会话注册表：每个访问者拥有独立的网格
+registry = SessionRegistry()
+
+# 会话不会跨进程保留，上次运行留下的历史文件都已无主
+if HISTORY_ENABLED:
+    clear_history_dir(HISTORY_DIR)
+
+# 所有会话共用的性能指标，未启用时为None
+metrics = Metrics() if METRICS_ENABLED else None
+
+def get_session_id() -> str:
+    """从查询参数或Cookie中取会话ID，没有时使用默认会话"""
+    session_id = request.args.get('session') or request.cookies.get(SESSION_COOKIE_NAME)
+    if session_id and SESSION_ID_PATTERN.fullmatch(session_id):
+        return session_id
+    return 'default'
 
-# 创建游戏实例
-game = GameState()
+def get_game() -> GameState:
+    """获取当前请求对应的游戏会话；请求结束前持有租约，会话不会被换出"""
+    session_id = get_session_id()
+    game = registry.acquire(session_id)
+    g.setdefault('leased_games', []).append(game)
+    if HISTORY_ENABLED and game.history is None:
+        os.makedirs(HISTORY_DIR, exist_ok=True)
+        path = os.path.join(HISTORY_DIR, f'{session_id}.hist')
+        # 新建或恢复的会话从当前代重新记录，不接着旧文件追加
+        remove_history(path)
+        game.enable_history(path)
+    if metrics is not None and game.evolution.metrics is None:
+        game.evolution.enable_metrics(metrics)
+    return game
+
+@app.teardown_request
+def release_games(error=None):
+    """请求结束时归还会话租约"""
+    for game in g.pop('leased_games', []):
+        registry.release(game)
 
 @app.route('/')
 def index():
-    """主页面"""
-    return render_template('index.html', 
+    """主页面，首次访问时分配新的会话ID"""
+    session_id = request.cookies.get(SESSION_COOKIE_NAME)
+    if not session_id or not SESSION_ID_PATTERN.fullmatch(session_id):
+        session_id = uuid.uuid4().hex
+    game = registry.get(session_id)
+    response = app.make_response(render_template('index.html', 
                          width=game.grid.width, 
                          height=game.grid.height,
-                         generation=game.generation)
+                         generation=game.generation))
+    response.set_cookie(SESSION_COOKIE_NAME, session_id, samesite='Lax')
+    return response
 
 @app.route('/api/grid')
 def get_grid():
     """获取当前网格状态"""
+    game = get_game()
+    snapshot = game.snapshot
     return jsonify({
-        'grid': game.grid.grid,
-        'live_cells': list(game.grid.get_live_cells()),
-        'generation': game.generation
+        'grid': snapshot.rows,
+        'live_cells': list(snapshot.live_cells),
+        'generation': snapshot.generation,
+        'is_running': game.is_running,
+        'period': snapshot.period,
+        'status': describe_period(snapshot.period)
     })
 
+def describe_period(period):
+    """描述网格的周期状态"""
+    if period is None:
+        return 'evolving'
+    return f'stable with period {period}'
+
+def serialize_species(species):
+    """把物种（或快照中的物种记录）转换为可序列化的字典"""
+    return {
+        'id': species.species_id,
+        'group': list(species.group),
+        'stage': species.stage,
+        'survival_time': species.survival_time,
+        'evolution_progress': species.evolution_progress
+    }
+
+def stream_frames(game: GameState):
+    """生成增量流：先发关键帧，之后每代只发出生/死亡细胞，落后过多或网格被整体修改时改发关键帧"""
+    with game.lock:
+        game.streams += 1
+    try:
+        snapshot = game.snapshot
+        yield encode_keyframe(snapshot.live_cells, game.grid.width, game.grid.height, snapshot.generation)
+        yield from follow_frames(game, snapshot.epoch, snapshot.generation)
+    finally:
+        with game.lock:
+            game.streams -= 1
+
+def follow_frames(game: GameState, epoch: int, generation: int):
+    """持续推送增量帧、关键帧或保活帧"""
+    width = game.grid.width
+    while True:
+        # 带条件等待：检查与等待之间发生的通知不会丢失
+        with game.changed:
+            game.changed.wait_for(lambda: game.snapshot.generation != generation
+                                  or game.snapshot.epoch != epoch,
+                                  timeout=STREAM_KEEPALIVE_INTERVAL)
+        
+        snapshot = game.snapshot
+        if snapshot.epoch == epoch and snapshot.generation == generation:
+            yield encode_keepalive(generation)
+            continue
+        
+        pending = [delta for delta in list(game.deltas)
+                   if delta[0] >= generation and delta[1] <= snapshot.generation]
+        # 增量必须首尾相接；增量总字节数超过一帧位图时，直接发关键帧更省带宽
+        contiguous = (snapshot.epoch == epoch and pending and pending[0][0] == generation
+                      and all(previous[1] == current[0] for previous, current in zip(pending, pending[1:])))
+        if contiguous and sum(len(born) + len(died) for _, _, born, died in pending) * 4 < width * len(snapshot.rows) // 8:
+            for _, delta_generation, born, died in pending:
+                yield encode_delta(born, died, width, delta_generation)
+            generation = pending[-1][1]
+        else:
+            # 客户端跟不上时丢弃中间帧，直接跳到最新快照（载入存档后网格大小可能改变）
+            epoch = snapshot.epoch
+            generation = snapshot.generation
+            width = len(snapshot.rows[0]) if snapshot.rows else 0
+            yield encode_keyframe(snapshot.live_cells, width, len(snapshot.rows), generation)
+
+@app.route('/api/stream')
+def stream():
+    """二进制增量流（分块传输）"""
+    return Response(stream_frames(get_game()), mimetype='application/octet-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
 @app.route('/api/species')
 def get_species():
     """获取当前物种状态"""
-    species_list = game.evolution.get_species_manager().get_species_list()
-    species_data = []
-    
-    for species in species_list:
-        species_data.append({
-            'group': list(species.group),
-            'stage': species.stage,
-            'survival_time': species.survival_time,
-            'evolution_progress': species.evolution_progress
-        })
+    species_data = [serialize_species(species) for species in get_game().species_snapshot()]
+    
+    return jsonify({
+        'species': species_data,
+        'species_count': len(species_data)
+    })
+
+@app.route('/api/species_at')
+def get_species_at():
+    """查询指定位置（x, y）或矩形区域（x1, y1, x2, y2）内的物种"""
+    game = get_game()
+    args = request.args
+    
+    with game.lock:
+        species_manager = game.evolution.get_species_manager()
+        if all(key in args for key in ('x1', 'y1', 'x2', 'y2')):
+            species_list = species_manager.get_species_in_area(
+                args.get('x1', type=int), args.get('y1', type=int),
+                args.get('x2', type=int), args.get('y2', type=int))
+        else:
+            species = species_manager.get_species_at(args.get('x', type=int), args.get('y', type=int))
+            species_list = [species] if species is not None else []
+        species_data = [serialize_species(species) for species in species_list]
     
     return jsonify({
         'species': species_data,
@@ -57,24 +186,44 @@ def get_species():
 
 @app.route('/api/evolve', methods=['POST'])
 def evolve():
-    """执行一次演化"""
-    game.evolution.evolve(delta_time=0.1)
-    game.generation += 1
+    """执行演化；steps指定连续推进的代数，delta为真时返回首尾之间的出生/死亡细胞"""
+    game = get_game()
+    data = request.get_json(silent=True) or {}
+    steps = request.args.get('steps', data.get('steps', 1), type=int)
+    steps = max(1, min(steps, EVOLVE_MAX_STEPS))
     
-    return jsonify({
+    if steps == 1:
+        born, died = game.step(delta_time=0.1)
+    else:
+        born, died = game.step_n(steps, delta_time=0.1)
+    snapshot = game.snapshot
+    
+    result = {
         'success': True,
-        'generation': game.generation,
-        'live_cells': len(game.grid.get_live_cells())
-    })
+        'steps': steps,
+        'generation': snapshot.generation,
+        'live_cells': len(snapshot.live_cells),
+        'born_count': len(born),
+        'died_count': len(died),
+        'period': snapshot.period,
+        'status': describe_period(snapshot.period)
+    }
+    if data.get('delta') or request.args.get('delta'):
+        result['born'] = list(born)
+        result['died'] = list(died)
+    return jsonify(result)
 
 @app.route('/api/reset', methods=['POST'])
 def reset():
     """重置游戏"""
-    game.grid.reset()
-    game.generation = 0
-    game.is_running = False
-    # 重置物种管理器，确保清空物种列表
-    game.evolution = Evolution(game.grid)
+    game = get_game()
+    game.stop()
+    with game.lock:
+        game.grid.reset()
+        game.generation = 0
+        # 重置物种管理器，确保清空物种列表
+        game.evolution.reset_species()
+        game.touch()
     
     return jsonify({
         'success': True,
@@ -85,27 +234,35 @@ def reset():
 @app.route('/api/randomize', methods=['POST'])
 def randomize():
     """随机初始化网格"""
+    game = get_game()
     density = request.json.get('density', 0.3)
-    game.grid.randomize(density=density)
-    game.generation = 0
-    game.is_running = False
+    game.stop()
+    with game.lock:
+        game.grid.randomize(density=density)
+        game.evolution.reset_species()
+        game.generation = 0
+        game.touch()
+        live_cells = len(game.grid.live_cells)
     
     return jsonify({
         'success': True,
-        'generation': game.generation,
-        'live_cells': len(game.grid.get_live_cells())
+        'generation': 0,
+        'live_cells': live_cells
     })
 
 @app.route('/api/toggle_cell', methods=['POST'])
 def toggle_cell():
     """切换单个细胞状态"""
+    game = get_game()
     x = request.json.get('x')
     y = request.json.get('y')
     
     if x is not None and y is not None:
-        current_state = game.grid.grid[x][y]
-        new_state = 1 - current_state
-        game.grid.set_cell(x, y, new_state)
+        with game.lock:
+            current_state = game.grid.grid[x][y]
+            new_state = 1 - current_state
+            game.grid.set_cell(x, y, new_state)
+            game.touch()
         
         return jsonify({
             'success': True,
@@ -119,47 +276,216 @@ def toggle_cell():
 @app.route('/api/generate_center', methods=['POST'])
 def generate_center():
     """从画布中间生成指定数量的细胞"""
+    game = get_game()
     count = request.json.get('count', 100)
     centerX = request.json.get('centerX', game.grid.width // 2)
     centerY = request.json.get('centerY', game.grid.height // 2)
     
     # 重置网格
-    game.grid.reset()
-    game.generation = 0
-    game.is_running = False
-    
-    # 生成指定数量的细胞，分布在中心点周围
-    import random
-    radius = min(game.grid.width, game.grid.height) // 4
-    cells_generated = 0
-    
-    while cells_generated < count:
-        # 在中心点周围随机生成坐标
-        dx = random.randint(-radius, radius)
-        dy = random.randint(-radius, radius)
-        x = centerY + dy  # 注意x和y的对应关系
-        y = centerX + dx
+    game.stop()
+    with game.lock:
+        game.grid.reset()
+        game.evolution.reset_species()
+        game.generation = 0
+        
+        # 生成指定数量的细胞，分布在中心点周围
+        import random
+        radius = min(game.grid.width, game.grid.height) // 4
+        cells_generated = 0
         
-        # 检查坐标是否在网格范围内
-        if 0 <= x < game.grid.height and 0 <= y < game.grid.width:
-            # 设置细胞为存活状态
-            game.grid.set_cell(x, y, 1)
-            cells_generated += 1
+        while cells_generated < count:
+            # 在中心点周围随机生成坐标
+            dx = random.randint(-radius, radius)
+            dy = random.randint(-radius, radius)
+            x = centerY + dy  # 注意x和y的对应关系
+            y = centerX + dx
+            
+            # 检查坐标是否在网格范围内
+            if 0 <= x < game.grid.height and 0 <= y < game.grid.width:
+                # 设置细胞为存活状态
+                game.grid.set_cell(x, y, 1)
+                cells_generated += 1
+        game.touch()
     
     return jsonify({
         'success': True,
-        'generation': game.generation,
+        'generation': 0,
         'live_cells': cells_generated
     })
 
 @app.route('/api/toggle_run', methods=['POST'])
 def toggle_run():
-    """切换游戏运行状态"""
-    game.is_running = not game.is_running
+    """切换游戏运行状态，可传入running指定状态、steps_per_second指定速率"""
+    game = get_game()
+    data = request.get_json(silent=True) or {}
+    if 'steps_per_second' in data:
+        game.loop.set_rate(data['steps_per_second'])
+    
+    running = data.get('running', not game.is_running)
+    if running:
+        game.start()
+    else:
+        game.stop()
+    
     return jsonify({
         'success': True,
-        'is_running': game.is_running
+        'is_running': game.is_running,
+        'steps_per_second': game.loop.steps_per_second
     })
 
+@app.route('/api/speed', methods=['POST'])
+def set_speed():
+    """设置后台自动演化速率（代/秒）"""
+    game = get_game()
+    game.loop.set_rate(request.json.get('steps_per_second', game.loop.steps_per_second))
+    return jsonify({
+        'success': True,
+        'steps_per_second': game.loop.steps_per_second
+    })
+
+@app.route('/api/rule', methods=['GET', 'POST'])
+def rule():
+    """查询（GET）或切换（POST）演化规则，支持B/S记法和预设名称"""
+    game = get_game()
+    if request.method == 'POST':
+        try:
+            with game.lock:
+                game.evolution.set_rule(request.json.get('rule', ''))
+                game.touch()
+        except ValueError as error:
+            return jsonify({'success': False, 'error': str(error)}), 400
+    
+    return jsonify({
+        'success': True,
+        'rule': game.evolution.rule.notation,
+        'presets': LIFE_RULES
+    })
+
+@app.route('/api/save')
+def save():
+    """下载当前游戏状态（二进制存档，含物种状态和生存时间）"""
+    game = get_game()
+    data = game.to_bytes(compress=False)
+    return Response(data, mimetype='application/octet-stream',
+                    headers={'Content-Disposition': 'attachment; filename=game.gols'})
+
+@app.route('/api/load', methods=['POST'])
+def load():
+    """上传二进制存档，替换当前游戏状态"""
+    game = get_game()
+    try:
+        saved = loads(request.get_data())
+    except ValueError as error:
+        return jsonify({'success': False, 'error': str(error)}), 400
+    game.stop()
+    game.load_saved(saved)
+    
+    return jsonify({
+        'success': True,
+        'generation': saved.generation,
+        'live_cells': len(saved.grid.live_cells)
+    })
+
+PATTERN_FORMATS = {
+    'rle': (parse_rle, format_rle),
+    'cells': (parse_cells, format_cells),
+}
+
+@app.route('/api/pattern', methods=['GET', 'POST'])
+def pattern():
+    """导出（GET）或导入（POST）RLE/.cells图案"""
+    game = get_game()
+    if request.method == 'GET':
+        pattern_format = request.args.get('format', 'rle')
+        if pattern_format not in PATTERN_FORMATS:
+            return jsonify({'success': False, 'error': f'不支持的图案格式: {pattern_format}'}), 400
+        if pattern_format == 'rle':
+            text = format_rle(game.snapshot.live_cells, game.evolution.rule.notation)
+        else:
+            text = format_cells(game.snapshot.live_cells)
+        return Response(text, mimetype='text/plain')
+    
+    data = request.json
+    pattern_format = data.get('format', 'rle')
+    if pattern_format not in PATTERN_FORMATS:
+        return jsonify({'success': False, 'error': f'不支持的图案格式: {pattern_format}'}), 400
+    x, y = data.get('x', 0), data.get('y', 0)
+    # 只解析落在网格内的部分，超长的游程不会展开
+    height, width = game.grid.get_size()
+    try:
+        cells = PATTERN_FORMATS[pattern_format][0](data.get('text', ''), height - x, width - y)
+    except ValueError as error:
+        return jsonify({'success': False, 'error': str(error)}), 400
+    
+    game.stop()
+    with game.lock:
+        game.grid.load_pattern([(cell_x + x, cell_y + y) for (cell_x, cell_y) in cells])
+        game.evolution.reset_species()
+        game.generation = 0
+        game.touch()
+        live_cells = len(game.grid.live_cells)
+    
+    return jsonify({
+        'success': True,
+        'generation': 0,
+        'live_cells': live_cells
+    })
+
+@app.route('/api/history')
+def history():
+    """回放历史：带generation参数时返回该代（或之前最近一条记录）的网格，否则返回可回放范围"""
+    game = get_game()
+    recorder = game.history
+    if recorder is None:
+        return jsonify({'success': False, 'error': '未启用历史记录'}), 404
+    
+    generation = request.args.get('generation', type=int)
+    if generation is None:
+        first, last = recorder.generations()
+        return jsonify({
+            'success': True,
+            'first_generation': first,
+            'last_generation': last,
+            'keyframes': len(recorder.keyframe_generations),
+            'bytes': recorder.size(),
+            'records': recorder.records,
+            'record_seconds': recorder.record_seconds
+        })
+    
+    result = recorder.seek(generation)
+    if result is None:
+        return jsonify({'success': False, 'error': f'第{generation}代没有历史记录'}), 404
+    found, width, height, live_cells = result
+    grid = [[0] * width for _ in range(height)]
+    for (x, y) in live_cells:
+        grid[x][y] = 1
+    return jsonify({
+        'success': True,
+        'generation': found,
+        'grid': grid,
+        'live_cells': list(live_cells)
+    })
+
+@app.route('/api/sessions')
+def get_sessions():
+    """会话指标：常驻会话数量及每个会话占用的字节数"""
+    return jsonify(registry.metrics())
+
+@app.route('/api/metrics')
+def get_metrics():
+    """Prometheus文本格式的指标：会话统计，以及启用时的演化分阶段耗时与计数"""
+    sessions = registry.metrics()
+    lines = []
+    for name in ('resident_sessions', 'resident_bytes', 'evicted_sessions', 'evicted_bytes'):
+        lines.append(f'# TYPE {METRICS_PREFIX}_{name} gauge')
+        lines.append(f'{METRICS_PREFIX}_{name} {sessions[name]}')
+    for name in ('evictions', 'rehydrations'):
+        lines.append(f'# TYPE {METRICS_PREFIX}_{name}_total counter')
+        lines.append(f'{METRICS_PREFIX}_{name}_total {sessions[name]}')
+    text = '\n'.join(lines) + '\n'
+    if metrics is not None:
+        text += metrics.to_prometheus()
+    return Response(text, mimetype='text/plain; version=0.0.4')
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
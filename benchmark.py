@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# 康威生命游戏基准测试
+
+import argparse
+import sys
+from src.benchmark import (
+    default_cases, run_suite, save_baseline, load_baseline, compare, compare_kernels, compare_workers, PHASES
+)
+from src.config import (
+    BOUNDARY_TYPES, STEP_ENGINES, DEFAULT_STEP_ENGINE, GROUP_DETECTORS, DEFAULT_GROUP_DETECTOR,
+    BENCHMARK_SEED, BENCHMARK_SIZES, BENCHMARK_DENSITIES, BENCHMARK_GENERATIONS,
+    BENCHMARK_REGRESSION_TOLERANCE, BENCHMARK_REPEATS, BENCHMARK_MIN_PHASE_DELTA_MS
+)
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="康威生命游戏基准测试")
+    parser.add_argument('--sizes', type=int, nargs='+', default=BENCHMARK_SIZES, help="网格边长")
+    parser.add_argument('--densities', type=float, nargs='+', default=BENCHMARK_DENSITIES, help="初始密度")
+    parser.add_argument('--boundaries', nargs='+', choices=list(BOUNDARY_TYPES.values()),
+                        default=list(BOUNDARY_TYPES.values()), help="边界类型")
+    parser.add_argument('--engine', choices=list(STEP_ENGINES.values()), default=DEFAULT_STEP_ENGINE)
+    parser.add_argument('--detector', choices=list(GROUP_DETECTORS.values()), default=DEFAULT_GROUP_DETECTOR)
+    parser.add_argument('--generations', type=int, default=BENCHMARK_GENERATIONS, help="每个用例计时的代数")
+    parser.add_argument('--seed', type=int, default=BENCHMARK_SEED, help="随机初始化的种子")
+    parser.add_argument('--repeats', type=int, default=BENCHMARK_REPEATS, help="每个用例重复计时的次数，取中位数")
+    parser.add_argument('--save', metavar='PATH', help="把结果保存为JSON基线")
+    parser.add_argument('--compare', metavar='PATH', help="与已有基线对比，发现退化时返回非零退出码")
+    parser.add_argument('--tolerance', type=float, default=BENCHMARK_REGRESSION_TOLERANCE,
+                        help="允许的相对退化比例")
+    parser.add_argument('--min-delta', type=float, default=BENCHMARK_MIN_PHASE_DELTA_MS,
+                        help="单阶段耗时变化小于此值（毫秒）时不视为退化")
+    parser.add_argument('--kernels', action='store_true',
+                        help="只对比单步内核（逐格循环、分块查表、NumPy）的每秒代数")
+    parser.add_argument('--workers', type=int, nargs='+', metavar='N',
+                        help="只对比NumPy引擎与指定进程数的多进程引擎（需在多核机器上运行）")
+    return parser.parse_args(argv)
+
+def print_result(case, result):
+    """打印单个用例的结果"""
+    phases = " ".join(f"{phase}={result['phase_ms'][phase]:.2f}ms" for phase in PHASES)
+    print(f"{case.key:<48} {result['generations_per_second']:>9.2f} 代/秒  "
+          f"峰值内存 {result['peak_memory_bytes'] / 1024 / 1024:>7.1f} MB  {phases}")
+
+def run_kernels(args):
+    """打印各单步内核在每个用例上的每秒代数"""
+    for size in args.sizes:
+        for density in args.densities:
+            for boundary_type in args.boundaries:
+                results = compare_kernels(size, density, boundary_type, args.generations, args.seed)
+                baseline = results['python-loop']
+                line = "  ".join(f"{name}={value:.2f}代/秒(x{value / baseline:.1f})"
+                                 for name, value in results.items())
+                print(f"{boundary_type}/{size}/{density}: {line}")
+    return 0
+
+def run_workers(args):
+    """打印多进程引擎在不同进程数下相对NumPy单进程引擎的加速比"""
+    for size in args.sizes:
+        for density in args.densities:
+            for boundary_type in args.boundaries:
+                results = compare_workers(size, density, boundary_type, args.workers,
+                                          args.generations, args.seed)
+                baseline = results['numpy']
+                line = "  ".join(f"{name}={value:.2f}代/秒(x{value / baseline:.2f})"
+                                 for name, value in results.items())
+                print(f"{boundary_type}/{size}/{density}: {line}")
+    return 0
+
+def main(argv=None):
+    """基准测试入口"""
+    args = parse_args(argv)
+    if args.kernels:
+        return run_kernels(args)
+    if args.workers:
+        return run_workers(args)
+    cases = default_cases(args.sizes, args.densities, args.boundaries, args.engine, args.detector)
+    print(f"基准测试：{len(cases)} 个用例，每个 {args.generations} 代，重复 {args.repeats} 次，种子 {args.seed}")
+    suite = run_suite(cases, args.generations, args.seed, progress=print_result, repeats=args.repeats)
+
+    if args.save:
+        save_baseline(args.save, suite)
+        print(f"基线已保存到 {args.save}")
+
+    if args.compare:
+        regressions = compare(load_baseline(args.compare), suite, args.tolerance, args.min_delta)
+        if regressions:
+            print(f"\n发现 {len(regressions)} 项退化（容差 {args.tolerance:.0%}）:")
+            for item in regressions:
+                print(f"  {item['case']} {item['metric']}: {item['baseline']:.4g} -> "
+                      f"{item['current']:.4g} ({item['change']:+.1%})")
+            return 1
+        print("\n未发现退化")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+# 康威生命游戏批量实验
+
+import argparse
+import sys
+import time
+from src.experiments import build_runs, run_sweep
+from src.config import (
+    BOUNDARY_TYPES, STEP_ENGINES, DEFAULT_STEP_ENGINE, DEFAULT_GRID_WIDTH,
+    EXPERIMENT_GENERATIONS, EXPERIMENT_WORKERS
+)
+
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="并行运行(种子, 密度, 大小, 边界)组合的演化实验")
+    parser.add_argument('output', help="结果文件，扩展名为.csv或.ndjson/.jsonl")
+    parser.add_argument('--seeds', type=int, default=10, help="每个组合运行的种子数")
+    parser.add_argument('--seed-start', type=int, default=0, help="第一个种子")
+    parser.add_argument('--densities', type=float, nargs='+', default=[0.1, 0.2, 0.3, 0.4, 0.5])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[DEFAULT_GRID_WIDTH])
+    parser.add_argument('--boundaries', nargs='+', choices=list(BOUNDARY_TYPES.values()),
+                        default=list(BOUNDARY_TYPES.values()))
+    parser.add_argument('--generations', type=int, default=EXPERIMENT_GENERATIONS)
+    parser.add_argument('--workers', type=int, default=EXPERIMENT_WORKERS, help="进程数，默认使用全部CPU核")
+    parser.add_argument('--engine', choices=list(STEP_ENGINES.values()), default=DEFAULT_STEP_ENGINE)
+    parser.add_argument('--restart', action='store_true', help="忽略检查点，从头运行")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """批量实验入口"""
+    args = parse_args(argv)
+    seeds = list(range(args.seed_start, args.seed_start + args.seeds))
+    runs = build_runs(seeds, args.densities, args.sizes, args.boundaries)
+    start = time.perf_counter()
+
+    def progress(done, total, key):
+        elapsed = time.perf_counter() - start
+        print(f"[{done}/{total}] {key}  {done / elapsed:.2f} 次/秒", flush=True)
+
+    count = run_sweep(runs, args.output, args.generations, args.workers, args.engine,
+                      resume=not args.restart, progress=progress)
+    print(f"共 {len(runs)} 次实验，本次运行 {count} 次，其余已在检查点中；结果写入 {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,20 +1,43 @@
 #!/usr/bin/env python3
 # 康威生命游戏主程序
 
+import argparse
 import sys
 import time
 from src.grid import Grid
 from src.evolution import Evolution
-from src.config import DEFAULT_GRID_WIDTH, DEFAULT_GRID_HEIGHT
+from src.config import DEFAULT_GRID_WIDTH, DEFAULT_GRID_HEIGHT, DEFAULT_RULE
 
-def main():
+def parse_args(argv=None):
+    """解析命令行参数"""
+    parser = argparse.ArgumentParser(description="康威生命游戏 - 物种演化版")
+    parser.add_argument('--metrics', nargs='?', const='text', choices=['text', 'prometheus'],
+                        help="采集各阶段耗时与计数，结束时按表格(text)或Prometheus格式输出")
+    parser.add_argument('--rule', default=DEFAULT_RULE,
+                        help="演化规则：B/S记法（如 B36/S23）或预设名称（如 highlife）")
+    return parser.parse_args(argv)
+
+def print_metrics(metrics):
+    """以表格形式打印各阶段耗时分位数与计数器"""
+    summary = metrics.summary()
+    print("\n性能指标:")
+    for phase, stats in summary['phases'].items():
+        quantiles = " ".join(f"p{int(q * 100)}={value * 1000:.2f}ms"
+                             for q, value in stats['percentiles'].items())
+        print(f"  {phase:<18} 次数={stats['count']:<6} 总计={stats['total_seconds'] * 1000:.1f}ms {quantiles}")
+    for name, value in summary['counters'].items():
+        print(f"  {name:<18} {value}")
+
+def main(argv=None):
     """主程序入口"""
+    args = parse_args(argv)
     print("康威生命游戏 - 物种演化版")
     print("=" * 50)
     
     # 创建网格
     grid = Grid(width=DEFAULT_GRID_WIDTH, height=DEFAULT_GRID_HEIGHT)
-    evolution = Evolution(grid)
+    evolution = Evolution(grid, rule=args.rule)
+    metrics = evolution.enable_metrics() if args.metrics else None
     
     # 随机初始化网格
     grid.randomize(density=0.2)
@@ -23,34 +46,39 @@ def main():
     print(f"初始网格大小: {grid.get_size()}")
     print(f"初始存活细胞数量: {len(grid.get_live_cells())}")
     
-    # 运行演化循环
-    for generation in range(100):
-        # 执行一次演化
-        evolution.evolve(delta_time=0.1)
+    # 运行演化循环，每10代批量推进一次
+    for generation in range(10, 101, 10):
+        # 连续演化10代，物种在最后统一结算
+        evolution.evolve_n(10, delta_time=0.1)
+        
+        # 打印状态
+        live_cells = len(grid.get_live_cells())
+        species_list = evolution.get_species_list()
+        print(f"\n第 {generation} 代:")
+        print(f"  存活细胞数量: {live_cells}")
+        print(f"  物种数量: {len(species_list)}")
         
-        # 每10代打印一次状态
-        if generation % 10 == 0:
-            live_cells = len(grid.get_live_cells())
-            species_list = evolution.get_species_manager().get_species_list()
-            print(f"\n第 {generation+1} 代:")
-            print(f"  存活细胞数量: {live_cells}")
-            print(f"  物种数量: {len(species_list)}")
-            
-            # 打印物种阶段分布
-            stage_counts = {}
-            for species in species_list:
-                stage_counts[species.stage] = stage_counts.get(species.stage, 0) + 1
-            
-            if stage_counts:
-                print("  物种阶段分布:", end=" ")
-                for stage in sorted(stage_counts.keys()):
-                    print(f"阶段{stage}: {stage_counts[stage]}", end=" ")
-                print()
+        # 打印物种阶段分布
+        stage_counts = {}
+        for species in species_list:
+            stage_counts[species.stage] = stage_counts.get(species.stage, 0) + 1
+        
+        if stage_counts:
+            print("  物种阶段分布:", end=" ")
+            for stage in sorted(stage_counts.keys()):
+                print(f"阶段{stage}: {stage_counts[stage]}", end=" ")
+            print()
     
     print("\n" + "=" * 50)
     print("演化演示完成")
     print(f"最终存活细胞数量: {len(grid.get_live_cells())}")
-    print(f"最终物种数量: {len(evolution.get_species_manager().get_species_list())}")
+    print(f"最终物种数量: {len(evolution.get_species_list())}")
+    
+    if metrics is not None:
+        if args.metrics == 'prometheus':
+            print(metrics.to_prometheus(), end='')
+        else:
+            print_metrics(metrics)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,256 @@
+# 基准测试模块：测量演化、群体检测与物种结算随网格规模的变化
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import List, Tuple, Set, Dict, NamedTuple, Optional
+from src.grid import Grid
+from src.evolution import Evolution
+from src.engine import PythonEngine, NumpyEngine, LookupTableEngine, ParallelEngine, np
+from src.parallel import close_pool
+from src.config import (
+    BOUNDARY_TYPES, DEFAULT_STEP_ENGINE, DEFAULT_GROUP_DETECTOR,
+    BENCHMARK_SEED, BENCHMARK_SIZES, BENCHMARK_DENSITIES,
+    BENCHMARK_GENERATIONS, BENCHMARK_REGRESSION_TOLERANCE, BENCHMARK_REPEATS,
+    BENCHMARK_MIN_PHASE_DELTA_MS, BENCHMARK_NOISE_STDEVS
+)
+
+# 每代依次计时的阶段
+PHASES = ['step', 'detect_groups', 'species_update', 'process_evolution']
+
+class BenchmarkCase(NamedTuple):
+    """一个基准测试用例"""
+    size: int
+    density: float
+    boundary_type: str
+    engine: str = DEFAULT_STEP_ENGINE
+    detector: str = DEFAULT_GROUP_DETECTOR
+
+    @property
+    def key(self) -> str:
+        """用例在基线文件中的键"""
+        return f"{self.engine}/{self.detector}/{self.boundary_type}/{self.size}/{self.density}"
+
+def default_cases(sizes: List[int] = None, densities: List[float] = None,
+                  boundary_types: List[str] = None, engine: str = DEFAULT_STEP_ENGINE,
+                  detector: str = DEFAULT_GROUP_DETECTOR) -> List[BenchmarkCase]:
+    """生成网格大小 x 密度 x 边界类型的全部组合"""
+    sizes = sizes or BENCHMARK_SIZES
+    densities = densities or BENCHMARK_DENSITIES
+    boundary_types = boundary_types or list(BOUNDARY_TYPES.values())
+    return [BenchmarkCase(size, density, boundary_type, engine, detector)
+            for size in sizes for density in densities for boundary_type in boundary_types]
+
+def _setup(case: BenchmarkCase, seed: int) -> Evolution:
+    """按固定种子创建用例的初始网格"""
+    grid = Grid(width=case.size, height=case.size, boundary_type=case.boundary_type)
+    grid.randomize(case.density, seed=seed)
+    return Evolution(grid, engine=case.engine, detector=case.detector)
+
+def _run_generations(evolution: Evolution, generations: int, delta_time: float,
+                     timings: Dict[str, float] = None) -> None:
+    """逐代执行完整流程（推进、群体检测、物种更新与演化），可选地累计各阶段耗时
+
+    直接调用各组件而不是Evolution.evolve，避免周期回放等捷径影响测量
+    """
+    grid = evolution.grid
+    engine = evolution.engine
+    detector = evolution.group_detector
+    species_manager = evolution.species_manager
+    clock = time.perf_counter
+    for _ in range(generations):
+        start = clock()
+        engine.step(grid)
+        after_step = clock()
+        groups = detector.detect_groups()
+        after_groups = clock()
+        species_manager.update(groups, delta_time)
+        after_update = clock()
+        species_manager.process_evolution()
+        end = clock()
+        if timings is not None:
+            timings['step'] += after_step - start
+            timings['detect_groups'] += after_groups - after_step
+            timings['species_update'] += after_update - after_groups
+            timings['process_evolution'] += end - after_update
+
+def _stdev(values: List[float]) -> float:
+    """样本标准差，只有一次测量时为0"""
+    return statistics.stdev(values) if len(values) > 1 else 0.0
+
+def run_case(case: BenchmarkCase, generations: int = BENCHMARK_GENERATIONS,
+             seed: int = BENCHMARK_SEED, delta_time: float = 0.1,
+             memory_generations: int = 2, repeats: int = BENCHMARK_REPEATS) -> Dict:
+    """运行一个用例，返回每秒代数、各阶段平均耗时（毫秒）和峰值内存（字节）
+
+    计时重复repeats次，每次都从相同的初始网格开始，耗时取中位数并记录标准差供compare区分噪声；
+    计时与内存分开测量：tracemalloc会显著拖慢执行，只在另一份相同网格上跑少数几代
+    """
+    runs = []
+    for _ in range(max(1, repeats)):
+        evolution = _setup(case, seed)
+        initial_population = len(evolution.grid.live_cells)
+        timings = {phase: 0.0 for phase in PHASES}
+        gc.collect()
+        start = time.perf_counter()
+        _run_generations(evolution, generations, delta_time, timings)
+        elapsed = time.perf_counter() - start
+        phase_ms = {phase: timings[phase] / generations * 1000 for phase in PHASES}
+        runs.append((elapsed, phase_ms))
+        evolution.close()
+    seconds = [elapsed for elapsed, _ in runs]
+    rates = [generations / elapsed if elapsed > 0 else float('inf') for elapsed in seconds]
+    phase_runs = {phase: [phase_ms[phase] for _, phase_ms in runs] for phase in PHASES}
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        memory_evolution = _setup(case, seed)
+        _run_generations(memory_evolution, memory_generations, delta_time)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    memory_evolution.close()
+    del memory_evolution
+
+    return {
+        'case': case._asdict(),
+        'generations': generations,
+        'initial_population': initial_population,
+        'final_population': len(evolution.grid.live_cells),
+        'species': len(evolution.species_manager.get_species_list()),
+        'repeats': len(runs),
+        'seconds': statistics.median(seconds),
+        'generations_per_second': statistics.median(rates),
+        'generations_per_second_stdev': _stdev(rates),
+        'phase_ms': {phase: statistics.median(values) for phase, values in phase_runs.items()},
+        'phase_ms_stdev': {phase: _stdev(values) for phase, values in phase_runs.items()},
+        'peak_memory_bytes': peak_memory,
+    }
+
+def run_suite(cases: List[BenchmarkCase], generations: int = BENCHMARK_GENERATIONS,
+              seed: int = BENCHMARK_SEED, progress=None, repeats: int = BENCHMARK_REPEATS) -> Dict:
+    """依次运行全部用例，返回可直接保存为基线的结果"""
+    results = {}
+    for case in cases:
+        result = run_case(case, generations, seed, repeats=repeats)
+        results[case.key] = result
+        if progress is not None:
+            progress(case, result)
+    return {
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'seed': seed,
+        'generations': generations,
+        'repeats': repeats,
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'results': results,
+    }
+
+def kernel_variants() -> Dict[str, callable]:
+    """参与对比的单步内核：逐格循环、查表（纯Python），以及有numpy时的两种向量化实现"""
+    variants = {
+        'python-loop': PythonEngine,
+        'lookup-python': lambda: LookupTableEngine(vectorized=False),
+    }
+    if np is not None:
+        variants['numpy'] = NumpyEngine
+        variants['lookup-numpy'] = lambda: LookupTableEngine(vectorized=True)
+    return variants
+
+def compare_kernels(size: int, density: float, boundary_type: str,
+                    generations: int = BENCHMARK_GENERATIONS, seed: int = BENCHMARK_SEED) -> Dict[str, float]:
+    """在同一初始网格上逐代调用各内核的step，返回每个内核的每秒代数"""
+    results = {}
+    for name, factory in kernel_variants().items():
+        grid = Grid(width=size, height=size, boundary_type=boundary_type)
+        grid.randomize(density, seed=seed)
+        engine = factory()
+        # 预热：查表内核首次使用时生成查找表
+        engine.step(grid.copy())
+        start = time.perf_counter()
+        for _ in range(generations):
+            engine.step(grid)
+        elapsed = time.perf_counter() - start
+        results[name] = generations / elapsed if elapsed > 0 else float('inf')
+    return results
+
+def compare_workers(size: int, density: float, boundary_type: str, worker_counts: List[int],
+                    generations: int = BENCHMARK_GENERATIONS, seed: int = BENCHMARK_SEED,
+                    batch: int = 10) -> Dict[str, float]:
+    """对比NumPy单进程引擎与不同进程数的多进程引擎的每秒代数
+
+    按batch代一组调用step_n，与实际批量推进的用法一致；进程池的创建不计入时间
+    """
+    engines = {'numpy': NumpyEngine}
+    for workers in worker_counts:
+        engines[f'parallel-{workers}'] = lambda workers=workers: ParallelEngine(workers=workers)
+    results = {}
+    for name, factory in engines.items():
+        grid = Grid(width=size, height=size, boundary_type=boundary_type)
+        grid.randomize(density, seed=seed)
+        engine = factory()
+        # 预热：创建进程池与共享内存
+        engine.step_n(grid.copy(), 1)
+        start = time.perf_counter()
+        for _ in range(max(1, generations // batch)):
+            engine.step_n(grid, batch)
+        elapsed = time.perf_counter() - start
+        results[name] = max(1, generations // batch) * batch / elapsed if elapsed > 0 else float('inf')
+        engine.close()
+    close_pool()
+    return results
+
+def save_baseline(path: str, suite: Dict) -> None:
+    """把结果保存为JSON基线"""
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(suite, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+def load_baseline(path: str) -> Dict:
+    """读取JSON基线"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def compare(baseline: Dict, current: Dict,
+            tolerance: float = BENCHMARK_REGRESSION_TOLERANCE,
+            min_phase_delta_ms: float = BENCHMARK_MIN_PHASE_DELTA_MS,
+            noise_stdevs: float = BENCHMARK_NOISE_STDEVS) -> List[Dict]:
+    """对比两次运行中共有的用例，列出速度下降或峰值内存增长超过tolerance的项
+
+    相对变化之外还要求绝对变化超过下限：单阶段耗时至少变化min_phase_delta_ms毫秒，
+    有重复测量时还要超过两次运行中较大标准差的noise_stdevs倍，避免把微秒级阶段的抖动报成退化
+    """
+    regressions = []
+    for key, result in current['results'].items():
+        previous = baseline['results'].get(key)
+        if previous is None:
+            continue
+
+        def noise(field: str, phase: str = None) -> float:
+            """两次运行中较大的标准差乘以倍数；旧基线没有记录标准差时为0"""
+            stdevs = [run.get(field, {}).get(phase, 0.0) if phase else run.get(field, 0.0)
+                      for run in (previous, result)]
+            return noise_stdevs * max(stdevs)
+
+        checks = [
+            # (指标, 基线值, 当前值, 越大越好, 绝对变化下限)
+            ('generations_per_second', previous['generations_per_second'], result['generations_per_second'],
+             True, noise('generations_per_second_stdev')),
+            ('peak_memory_bytes', previous['peak_memory_bytes'], result['peak_memory_bytes'], False, 0.0),
+        ]
+        checks += [(f'phase_ms.{phase}', previous['phase_ms'][phase], result['phase_ms'][phase], False,
+                    max(min_phase_delta_ms, noise('phase_ms_stdev', phase)))
+                   for phase in PHASES if phase in previous['phase_ms']]
+        for metric, before, after, higher_is_better, floor in checks:
+            if before <= 0:
+                continue
+            change = (after - before) / before
+            if abs(after - before) <= floor:
+                continue
+            if (-change if higher_is_better else change) > tolerance:
+                regressions.append({'case': key, 'metric': metric, 'baseline': before,
+                                    'current': after, 'change': change})
+    return regressions
@@ -0,0 +1,220 @@
+# 位压缩网格模块
+from typing import List, Tuple, Set, Dict
+from src.grid import Grid
+from src.rules import Rule, CONWAY
+from src.config import DEFAULT_GRID_WIDTH, DEFAULT_GRID_HEIGHT, DEFAULT_BOUNDARY_TYPE, BOUNDARY_TYPES
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖
+    np = None
+
+WORD_BITS = 64
+
+
+def full_adder(a: 'np.ndarray', b: 'np.ndarray', c: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """按位全加器，返回(和, 进位)"""
+    partial = a ^ b
+    return partial ^ c, (a & b) | (partial & c)
+
+
+def half_adder(a: 'np.ndarray', b: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+    """按位半加器，返回(和, 进位)"""
+    return a ^ b, a & b
+
+
+class BitBoard:
+    def __init__(self, width: int = DEFAULT_GRID_WIDTH, height: int = DEFAULT_GRID_HEIGHT,
+                 boundary_type: str = DEFAULT_BOUNDARY_TYPE):
+        """初始化位压缩网格，每个细胞占1位，每行按uint64字存储"""
+        if np is None:
+            raise ImportError("BitBoard 需要安装 numpy")
+        self.width = width
+        self.height = height
+        self.boundary_type = boundary_type
+        self.word_count = (width + WORD_BITS - 1) // WORD_BITS
+        # 第w个字的第j位对应第 w*64+j 列
+        self.words = np.zeros((height, self.word_count), dtype='<u8')
+        # 最后一个字中超出网格宽度的位必须始终为0
+        self.tail_mask = self._mask(width - (self.word_count - 1) * WORD_BITS)
+
+    @staticmethod
+    def _mask(bits: int) -> 'np.uint64':
+        return np.uint64((1 << bits) - 1)
+
+    @classmethod
+    def from_array(cls, board: 'np.ndarray', boundary_type: str = DEFAULT_BOUNDARY_TYPE) -> 'BitBoard':
+        """由0/1数组创建位压缩网格"""
+        height, width = board.shape
+        bitboard = cls(width, height, boundary_type)
+        packed = np.packbits(board.astype(np.uint8), axis=1, bitorder='little')
+        padded = np.zeros((height, bitboard.word_count * 8), dtype=np.uint8)
+        padded[:, :packed.shape[1]] = packed
+        bitboard.words = padded.view('<u8').copy()
+        return bitboard
+
+    @classmethod
+    def from_grid(cls, grid: Grid) -> 'BitBoard':
+        """由网格创建位压缩网格"""
+        board = np.array(grid.grid, dtype=np.uint8).reshape(grid.height, grid.width)
+        return cls.from_array(board, grid.boundary_type)
+
+    def to_array(self) -> 'np.ndarray':
+        """转换为0/1的uint8数组"""
+        return self.unpack(self.words)
+
+    def to_grid(self) -> Grid:
+        """转换为普通网格"""
+        grid = Grid(self.width, self.height, self.boundary_type)
+        grid.grid = self.to_array().tolist()
+        grid.live_cells = self.cells_of(self.words)
+        grid.rehash()
+        return grid
+
+    def unpack(self, words: 'np.ndarray') -> 'np.ndarray':
+        """把字数组展开为0/1数组"""
+        as_bytes = np.ascontiguousarray(words, dtype='<u8').view(np.uint8)
+        return np.unpackbits(as_bytes, axis=1, bitorder='little')[:, :self.width]
+
+    def cells_of(self, words: 'np.ndarray') -> Set[Tuple[int, int]]:
+        """列出字数组中置位的细胞坐标"""
+        xs, ys = np.nonzero(self.unpack(words))
+        return set(zip(xs.tolist(), ys.tolist()))
+
+    def reset(self) -> None:
+        """重置网格"""
+        self.words[:] = 0
+
+    def set_cell(self, x: int, y: int, state: int) -> None:
+        """设置单个细胞状态"""
+        if 0 <= x < self.height and 0 <= y < self.width:
+            bit = np.uint64(1 << (y % WORD_BITS))
+            if state == 1:
+                self.words[x, y // WORD_BITS] |= bit
+            else:
+                self.words[x, y // WORD_BITS] &= ~bit
+
+    def get_cell(self, x: int, y: int) -> int:
+        """获取单个细胞状态，处理边界条件"""
+        if self.boundary_type == BOUNDARY_TYPES['periodic']:
+            x = x % self.height
+            y = y % self.width
+        elif not (0 <= x < self.height and 0 <= y < self.width):
+            return 0
+        return int(self.words[x, y // WORD_BITS] >> np.uint64(y % WORD_BITS)) & 1
+
+    def get_size(self) -> Tuple[int, int]:
+        """获取网格大小"""
+        return (self.height, self.width)
+
+    def get_live_cells(self) -> Set[Tuple[int, int]]:
+        """获取所有存活细胞"""
+        return self.cells_of(self.words)
+
+    def population(self) -> int:
+        """统计存活细胞数量"""
+        return int(np.unpackbits(self.words.view(np.uint8)).sum())
+
+    def load_pattern(self, pattern: List[Tuple[int, int]]) -> None:
+        """加载预设模式"""
+        self.reset()
+        for (x, y) in pattern:
+            self.set_cell(x, y, 1)
+
+    def copy(self) -> 'BitBoard':
+        """创建网格副本"""
+        new_board = BitBoard(self.width, self.height, self.boundary_type)
+        new_board.words = self.words.copy()
+        return new_board
+
+    @property
+    def nbytes(self) -> int:
+        """网格数据占用的字节数"""
+        return self.words.nbytes
+
+    def _shift_rows(self, words: 'np.ndarray', offset: int) -> 'np.ndarray':
+        """整行平移：offset=1时第x行得到第x-1行（北邻居）"""
+        if self.boundary_type == BOUNDARY_TYPES['periodic']:
+            return np.roll(words, offset, axis=0)
+        shifted = np.zeros_like(words)
+        if offset > 0:
+            shifted[offset:] = words[:-offset]
+        else:
+            shifted[:offset] = words[-offset:]
+        return shifted
+
+    def _west(self, words: 'np.ndarray') -> 'np.ndarray':
+        """第y列得到第y-1列（西邻居）"""
+        one = np.uint64(1)
+        shifted = words << one
+        shifted[:, 1:] |= words[:, :-1] >> np.uint64(WORD_BITS - 1)
+        if self.boundary_type == BOUNDARY_TYPES['periodic']:
+            # 第0列的西邻居是最后一列
+            last = self.width - 1
+            shifted[:, 0] |= (words[:, last // WORD_BITS] >> np.uint64(last % WORD_BITS)) & one
+        return shifted
+
+    def _east(self, words: 'np.ndarray') -> 'np.ndarray':
+        """第y列得到第y+1列（东邻居）"""
+        one = np.uint64(1)
+        shifted = words >> one
+        shifted[:, :-1] |= words[:, 1:] << np.uint64(WORD_BITS - 1)
+        if self.boundary_type == BOUNDARY_TYPES['periodic']:
+            # 最后一列的东邻居是第0列
+            last = self.width - 1
+            shifted[:, last // WORD_BITS] |= (words[:, 0] & one) << np.uint64(last % WORD_BITS)
+        return shifted
+
+    def next_words(self, rule: Rule = CONWAY) -> 'np.ndarray':
+        """用按位加法器计算下一代，每次运算处理64个细胞"""
+        words = self.words
+        north = self._shift_rows(words, 1)
+        south = self._shift_rows(words, -1)
+        neighbors = [
+            north, south,
+            self._west(words), self._east(words),
+            self._west(north), self._east(north),
+            self._west(south), self._east(south),
+        ]
+
+        # 把8个邻居位平面相加，得到邻居数的低3位（8个邻居时低3位为0，不影响规则）
+        sum_a, carry_a = full_adder(neighbors[0], neighbors[1], neighbors[2])
+        sum_b, carry_b = full_adder(neighbors[3], neighbors[4], neighbors[5])
+        sum_c, carry_c = half_adder(neighbors[6], neighbors[7])
+        bit0, carry_d = full_adder(sum_a, sum_b, sum_c)
+        twos, carry_e = full_adder(carry_a, carry_b, carry_c)
+        bit1, carry_f = half_adder(twos, carry_d)
+        bit2 = carry_e ^ carry_f
+
+        if rule.is_conway:
+            # 邻居数为3，或邻居数为2且自身存活
+            new_words = bit1 & ~bit2 & (bit0 | words)
+        else:
+            # 任意B/S规则：对B、S中的每个邻居数取“邻居数恰好为n”的位掩码再按位或
+            bit3 = carry_e & carry_f
+            bits = [bit0, bit1, bit2, bit3]
+
+            def equals(count: int) -> 'np.ndarray':
+                mask = ~np.zeros_like(words)
+                for index, bit in enumerate(bits):
+                    mask &= bit if (count >> index) & 1 else ~bit
+                return mask
+
+            born = np.zeros_like(words)
+            for count in rule.birth:
+                born |= equals(count)
+            survive = np.zeros_like(words)
+            for count in rule.survive:
+                survive |= equals(count)
+            new_words = (~words & born) | (words & survive)
+        new_words[:, -1] &= self.tail_mask
+        return new_words
+
+    def step(self, rule: Rule = CONWAY) -> None:
+        """推进一代"""
+        self.words = self.next_words(rule)
+
+    def step_n(self, generations: int, rule: Rule = CONWAY) -> None:
+        """推进多代"""
+        for _ in range(generations):
+            self.words = self.next_words(rule)
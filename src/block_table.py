@@ -0,0 +1,135 @@
+# 分块查表模块：用65536项的表把4x4邻域一次映射为中心2x2的下一代
+from typing import List, Tuple, Set, Dict, Optional
+from src.rules import Rule, CONWAY
+from src.config import BOUNDARY_TYPES
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖
+    np = None
+
+# 4x4块按行优先编码为16位：第r行第c列为第 r*4+c 位
+# 输出的2x2块编码为4位：中心(1,1)、(1,2)、(2,1)、(2,2)依次为第0~3位
+CENTER_BITS = [(1, 1), (1, 2), (2, 1), (2, 2)]
+
+# 按规则缓存的(下一代表, 当前中心表)及其数组形式
+_tables: Dict[Tuple[int, ...], Tuple[List[int], List[int]]] = {}
+_array_tables: Dict[Tuple[int, ...], 'np.ndarray'] = {}
+
+
+def _next_state(block: int, r: int, c: int, rule_table: Tuple[int, ...]) -> int:
+    """按规则计算4x4块中(r, c)的下一代"""
+    live_neighbors = 0
+    for dr in (-1, 0, 1):
+        for dc in (-1, 0, 1):
+            if dr or dc:
+                live_neighbors += (block >> ((r + dr) * 4 + c + dc)) & 1
+    alive = (block >> (r * 4 + c)) & 1
+    return rule_table[alive * 9 + live_neighbors]
+
+
+def block_tables(rule: Rule = CONWAY) -> Tuple[List[int], List[int]]:
+    """返回(下一代表, 当前中心表)：两张表都以4x4块编码为下标，值为中心2x2块的4位编码
+
+    每种规则首次使用时生成并缓存
+    """
+    tables = _tables.get(rule.table)
+    if tables is None:
+        next_table = []
+        center_table = []
+        for block in range(1 << 16):
+            next_code = 0
+            center_code = 0
+            for bit, (r, c) in enumerate(CENTER_BITS):
+                next_code |= _next_state(block, r, c, rule.table) << bit
+                center_code |= ((block >> (r * 4 + c)) & 1) << bit
+            next_table.append(next_code)
+            center_table.append(center_code)
+        tables = _tables[rule.table] = (next_table, center_table)
+    return tables
+
+
+def _padded_rows(rows: List[List[int]], height: int, width: int, periodic: bool) -> List[List[int]]:
+    """四周各补一格（周期性边界环绕，固定边界补0），并把行数、列数补成偶数"""
+    even_height = height + height % 2
+    even_width = width + width % 2
+    padded = []
+    for x in range(-1, even_height + 1):
+        if 0 <= x < height:
+            row = rows[x]
+        elif periodic and x in (-1, height):
+            row = rows[x % height]
+        else:
+            padded.append([0] * (even_width + 2))
+            continue
+        left = row[-1] if periodic else 0
+        right = row[0] if periodic else 0
+        padded.append([left] + row + [right] + [0] * (even_width - width))
+    return padded
+
+
+def step_rows(rows: List[List[int]], height: int, width: int, boundary_type: str,
+              rule: Rule = CONWAY) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+    """纯Python路径：每次查表计算2x2个细胞，返回(出生, 死亡)"""
+    next_table, center_table = block_tables(rule)
+    padded = _padded_rows(rows, height, width, boundary_type == BOUNDARY_TYPES['periodic'])
+    block_columns = (width + 1) // 2
+
+    # 每行先编码出各块的4位列码：第j块覆盖补齐后的第2j~2j+3列
+    codes = []
+    for row in padded:
+        codes.append([row[2 * j] | row[2 * j + 1] << 1 | row[2 * j + 2] << 2 | row[2 * j + 3] << 3
+                      for j in range(block_columns)])
+
+    born = set()
+    died = set()
+    for i in range((height + 1) // 2):
+        row0, row1, row2, row3 = codes[2 * i:2 * i + 4]
+        x = 2 * i
+        for j in range(block_columns):
+            block = row0[j] | row1[j] << 4 | row2[j] << 8 | row3[j] << 12
+            new = next_table[block]
+            changed = new ^ center_table[block]
+            if not changed:
+                continue
+            y = 2 * j
+            for bit in range(4):
+                if changed >> bit & 1:
+                    cell = (x + (bit >> 1), y + (bit & 1))
+                    if cell[0] < height and cell[1] < width:
+                        (born if new >> bit & 1 else died).add(cell)
+    return born, died
+
+
+def step_array(board: 'np.ndarray', boundary_type: str, rule: Rule = CONWAY) -> 'np.ndarray':
+    """NumPy路径：16个步长为2的切片拼出每个块的编码，一次查表得到整张网格的下一代"""
+    next_table = _array_table(rule)
+    height, width = board.shape
+    even_height = height + height % 2
+    even_width = width + width % 2
+    padded = np.zeros((even_height + 2, even_width + 2), dtype=np.uint16)
+    padded[1:height + 1, 1:width + 1] = board
+    if boundary_type == BOUNDARY_TYPES['periodic']:
+        padded[0, 1:width + 1] = board[-1]
+        padded[height + 1, 1:width + 1] = board[0]
+        padded[:, 0] = padded[:, width]
+        padded[:, width + 1] = padded[:, 1]
+
+    blocks = np.zeros((even_height // 2, even_width // 2), dtype=np.uint16)
+    for r in range(4):
+        for c in range(4):
+            blocks |= padded[r:r + even_height:2, c:c + even_width:2] << np.uint16(r * 4 + c)
+    codes = next_table[blocks]
+
+    new_board = np.empty((even_height, even_width), dtype=np.uint8)
+    for bit, (r, c) in enumerate(CENTER_BITS):
+        new_board[r - 1::2, c - 1::2] = (codes >> bit) & 1
+    return new_board[:height, :width]
+
+
+def _array_table(rule: Rule) -> 'np.ndarray':
+    """下一代表的uint8数组形式"""
+    table = _array_tables.get(rule.table)
+    if table is None:
+        table = _array_tables[rule.table] = np.array(block_tables(rule)[0], dtype=np.uint8)
+    return table
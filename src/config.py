@@ -1,4 +1,6 @@
 # 游戏配置
+import os
+import tempfile
 
 # 网格默认配置
 DEFAULT_GRID_WIDTH = 200
@@ -60,3 +62,96 @@ BOUNDARY_TYPES = {
 }
 
 DEFAULT_BOUNDARY_TYPE = BOUNDARY_TYPES['periodic']
+
+# 演化规则（B/S记法：B后为出生所需的存活邻居数，S后为存活所需的存活邻居数）
+LIFE_RULES = {
+    'conway': 'B3/S23',               # 康威生命游戏
+    'highlife': 'B36/S23',            # HighLife，存在自我复制结构
+    'day_and_night': 'B3678/S34678',  # Day & Night，存活与死亡对称
+    'seeds': 'B2/S',                  # Seeds，所有细胞只存活一代
+    'life_without_death': 'B3/S012345678',
+}
+
+DEFAULT_RULE = LIFE_RULES['conway']
+
+# 演化引擎类型
+STEP_ENGINES = {
+    'python': 'python',  # 纯Python参考实现
+    'sparse': 'sparse',  # 稀疏实现，只处理存活细胞及其邻居
+    'numpy': 'numpy',    # NumPy向量化实现（需要安装numpy）
+    'bitpacked': 'bitpacked',  # 位压缩实现，每次按位运算处理64个细胞（需要安装numpy）
+    'tiled': 'tiled',    # 分块网格实现，只重新计算脏分块（配合TiledGrid使用）
+    'parallel': 'parallel',  # 多进程条带分解实现，适合边长数千的大网格（需要安装numpy）
+    'lookup': 'lookup',  # 分块查表实现，每次查表计算2x2个细胞（有numpy时走向量化路径）
+}
+
+DEFAULT_STEP_ENGINE = STEP_ENGINES['sparse']
+
+# 分块网格配置
+TILE_SIZE = 64  # 分块边长（细胞数）
+
+# 群体检测器类型
+GROUP_DETECTORS = {
+    'dfs': 'dfs',                  # 每次全量深度优先搜索
+    'incremental': 'incremental',  # 只在出生/死亡细胞附近增量更新
+    'labeling': 'labeling',        # NumPy标签数组上的向量化连通域标记（需要安装numpy）
+    'parallel': 'parallel',        # 多进程按条带标记后沿接缝合并（需要安装numpy）
+}
+
+DEFAULT_GROUP_DETECTOR = GROUP_DETECTORS['incremental']
+GROUP_CHURN_THRESHOLD = 0.5  # 变化细胞数超过存活细胞数的此比例时退回全量检测
+
+# HashLife配置
+HASHLIFE_MAX_CACHE_NODES = 2000000  # 驻留节点超过此数量时清空缓存
+
+# 增量流配置
+STREAM_DELTA_HISTORY = 64      # 保留最近多少代的增量，客户端落后更多时改发关键帧
+STREAM_KEEPALIVE_INTERVAL = 15.0  # 秒，无变化时发送保活帧的间隔
+
+# 后台模拟配置
+SIMULATION_STEPS_PER_SECOND = 10.0  # 服务器端自动演化的目标速率（代/秒）
+SIMULATION_MAX_STEPS_PER_SECOND = 1000.0  # 允许设置的最大速率
+
+# 多会话配置
+SESSION_MAX_RESIDENT = 32                     # 内存中最多保留的活跃会话数
+SESSION_MAX_RESIDENT_BYTES = 512 * 1024 * 1024  # 活跃会话占用的内存上限（估算值）
+SESSION_MAX_TOTAL = 4096                      # 含已换出会话在内的会话总数上限，超出时丢弃最久未用的
+SESSION_COOKIE_NAME = 'session_id'
+
+# 批量演化配置
+EVOLVE_MAX_STEPS = 10000  # /api/evolve 单次请求允许推进的最大代数
+
+# 历史记录配置
+HISTORY_ENABLED = False            # Web应用是否为每个会话记录演化历史（会话销毁或换出时删除其历史文件）
+HISTORY_DIR = os.path.join(tempfile.gettempdir(), 'game_of_life_history')
+HISTORY_KEYFRAME_INTERVAL = 64     # 每隔多少代写一个关键帧，其余各代只写增量
+HISTORY_MAX_BYTES = 64 * 1024 * 1024  # 单个历史文件的大小上限，超出后从当前代重新开始记录
+
+# 周期检测配置
+ZOBRIST_SEED = 20240601        # 生成Zobrist键的固定种子，保证同样的网格在不同进程中哈希相同
+CYCLE_DETECTION_WINDOW = 64    # 环形缓冲区保留最近多少代的哈希，可检测的最大周期
+
+# 基准测试配置
+BENCHMARK_SEED = 12345                       # Grid.randomize使用的固定种子，保证各次运行的初始网格相同
+BENCHMARK_SIZES = [100, 250, MAX_GRID_SIZE, 2 * MAX_GRID_SIZE]  # 网格边长，最后一档超过Web界面允许的上限
+BENCHMARK_DENSITIES = [0.1, 0.3, 0.5]
+BENCHMARK_GENERATIONS = 20                   # 每个用例计时的代数
+BENCHMARK_REGRESSION_TOLERANCE = 0.2         # 速度下降或内存增长超过此比例视为退化
+BENCHMARK_REPEATS = 3                        # 每个用例重复计时的次数，结果取中位数
+BENCHMARK_MIN_PHASE_DELTA_MS = 1.0           # 单阶段耗时的变化小于此值（毫秒）时不视为退化
+BENCHMARK_NOISE_STDEVS = 3.0                 # 变化不超过重复测量标准差的这么多倍时视为噪声
+
+# 性能指标配置
+METRICS_ENABLED = False            # 是否为Web应用的会话采集分阶段耗时与计数（/api/metrics）
+METRICS_WINDOW = 1024              # 每个阶段保留最近多少次耗时用于计算分位数
+METRICS_QUANTILES = [0.5, 0.9, 0.99]
+METRICS_PREFIX = 'game_of_life'
+
+# 多进程条带分解配置
+PARALLEL_WORKERS = None            # 工作进程数，None表示使用全部CPU核
+PARALLEL_START_METHOD = 'spawn'    # 进程启动方式；Web应用是多线程的，fork可能继承被占用的锁
+
+# 批量实验配置
+EXPERIMENT_GENERATIONS = 100       # 每次实验演化的代数
+EXPERIMENT_WORKERS = None          # 并行实验的进程数，None表示使用全部CPU核
+EXPERIMENT_DELTA_TIME = 0.1        # 每代计入物种生存时间的时长，与Web界面一致
@@ -0,0 +1,100 @@
+# 周期检测模块：用Zobrist哈希识别静止与振荡状态
+from collections import deque
+from typing import List, Tuple, Set, Dict, Optional
+from src.config import CYCLE_DETECTION_WINDOW
+
+Delta = Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]
+
+class CycleDetector:
+    def __init__(self, window: int = CYCLE_DETECTION_WINDOW):
+        """初始化周期检测器，window为环形缓冲区长度，即可检测的最大周期"""
+        self.window = window
+        # 最近各代的(世代, 哈希, 存活数, 出生, 死亡)，出生/死亡为从上一代到该代的变化
+        self.ring = deque()
+        self.seen: Dict[int, int] = {}  # 哈希 -> 世代
+        # 检测到周期后：周期长度、周期起点世代，以及起点之后每一代的(出生, 死亡)
+        self.period: Optional[int] = None
+        self.cycle_start = 0
+        self.cycle_deltas: List[Delta] = []
+        # 批量推进中遇到重复哈希但缺少逐代增量时，待确认的周期上界
+        self.candidate: Optional[int] = None
+        # 上次观察后的网格版本，不一致说明网格在演化之外被修改过
+        self.version = None
+
+    def clear(self) -> None:
+        """清空记录，退出周期模式"""
+        self.ring.clear()
+        self.seen.clear()
+        self.period = None
+        self.cycle_deltas = []
+        self.candidate = None
+        self.version = None
+
+    def sync(self, grid) -> None:
+        """推进前调用：网格被外部修改过则丢弃之前的记录"""
+        if self.version is not None and grid.version != self.version:
+            self.clear()
+
+    def in_cycle(self, grid) -> bool:
+        """当前网格是否处于已确认的周期中"""
+        return self.period is not None and grid.version == self.version
+
+    def next_delta(self, generation: int) -> Delta:
+        """周期模式下从generation推进一代的(出生, 死亡)，直接从周期中取出"""
+        return self.cycle_deltas[(generation - self.cycle_start) % self.period]
+
+    def skip_delta(self, generation: int, generations: int, live_cells: Set[Tuple[int, int]]) -> Delta:
+        """周期模式下从generation推进多代的净(出生, 死亡)，只需合并不足一个周期的增量"""
+        flipped = set()
+        for offset in range(generations % self.period):
+            born, died = self.next_delta(generation + offset)
+            # 同一细胞翻转偶数次等于没变
+            flipped ^= born
+            flipped ^= died
+        return flipped - live_cells, flipped & live_cells
+
+    def enter_cycle(self, start: int, deltas: List[Delta]) -> int:
+        """按确认过的逐代增量进入周期模式，deltas[k]为从start+k推进一代的变化"""
+        self.period = len(deltas)
+        self.cycle_start = start
+        self.cycle_deltas = list(deltas)
+        self.candidate = None
+        return self.period
+
+    def observe(self, generation: int, grid, born: Optional[Set[Tuple[int, int]]] = None,
+                died: Optional[Set[Tuple[int, int]]] = None) -> Optional[int]:
+        """推进后调用，记录本代哈希；出生/死亡未知（批量推进、快进）时只记录哈希
+
+        发现重复的哈希且中间各代增量齐全时进入周期模式并返回周期长度；
+        增量不全时把两次出现的间隔记为candidate，由调用方模拟确认
+        """
+        board_hash = getattr(grid, 'board_hash', None)
+        if board_hash is None:
+            return None
+        self.version = grid.version
+        if self.period is not None:
+            return self.period
+        known = born is not None and died is not None
+
+        population = len(grid.live_cells)
+        start = self.seen.get(board_hash)
+        if start is not None:
+            entries = [entry for entry in self.ring if entry[0] >= start]
+            # 存活数也相同才视为同一状态，进一步排除哈希碰撞
+            if entries and entries[0][2] == population:
+                # 从起点起每代都有记录且增量已知，才能直接取出周期内的逐代增量
+                contiguous = known and len(entries) == generation - start and \
+                    all(entry[3] is not None for entry in entries[1:])
+                if contiguous:
+                    deltas = [(entry[3], entry[4]) for entry in entries[1:]]
+                    deltas.append((born, died))
+                    return self.enter_cycle(start, deltas)
+                self.candidate = generation - start
+
+        self.ring.append((generation, board_hash, population, born, died))
+        self.seen[board_hash] = generation
+        if len(self.ring) > self.window:
+            old_generation, old_hash = self.ring.popleft()[:2]
+            if self.seen.get(old_hash) == old_generation:
+                del self.seen[old_hash]
+        return None
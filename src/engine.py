@@ -0,0 +1,409 @@
+# 演化引擎模块
+from collections import Counter
+from typing import List, Tuple, Set, Dict, Optional
+from src.grid import Grid
+from src.bitboard import BitBoard
+from src.parallel import SharedBoard
+from src import block_table
+from src.rules import Rule, CONWAY
+from src.zobrist import hash_cells, hash_indices
+from src.config import BOUNDARY_TYPES, STEP_ENGINES, PARALLEL_WORKERS
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖，缺失时只能使用纯Python引擎
+    np = None
+
+
+def apply_changes(grid: Grid, born: Set[Tuple[int, int]], died: Set[Tuple[int, int]],
+                  hash_delta: Optional[int] = None) -> None:
+    """把出生/死亡的细胞写回网格，只触碰发生变化的单元格；hash_delta为调用方已算好的哈希变化"""
+    if not hasattr(grid, 'live_cells'):
+        # TiledGrid没有整块的二维列表和存活集合，逐个写入分块（set_cell会递增版本并标记脏分块）
+        for (x, y) in died:
+            grid.set_cell(x, y, 0)
+        for (x, y) in born:
+            grid.set_cell(x, y, 1)
+        return
+    cells = grid.grid
+    for (x, y) in died:
+        cells[x][y] = 0
+    for (x, y) in born:
+        cells[x][y] = 1
+    grid.live_cells.difference_update(died)
+    grid.live_cells.update(born)
+    update_hash(grid, born, died, hash_delta)
+
+
+def update_hash(grid: Grid, born: Set[Tuple[int, int]], died: Set[Tuple[int, int]],
+                hash_delta: Optional[int] = None) -> None:
+    """出生/死亡的细胞状态都翻转了一次，把它们的Zobrist键异或进哈希，并递增网格版本"""
+    grid.version += 1
+    if not hasattr(grid, 'board_hash'):
+        return
+    if hash_delta is None:
+        hash_delta = hash_cells(born, grid.width) ^ hash_cells(died, grid.width)
+    grid.board_hash ^= hash_delta
+
+
+class StepEngine:
+    """演化引擎基类：对网格执行一代类生命规则（默认康威规则）"""
+    name = ''
+    rule: Rule = CONWAY
+
+    def set_rule(self, rule: Rule) -> None:
+        """切换演化规则"""
+        self.rule = rule
+
+    def step(self, grid: Grid) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """原地推进一代，返回(出生细胞集合, 死亡细胞集合)"""
+        raise NotImplementedError
+
+    def cells_visited(self, grid: Grid, generations: int = 1) -> int:
+        """上一次step/step_n访问过的细胞总数（性能指标用）；逐格扫描的引擎每代访问整个网格"""
+        return grid.width * grid.height * generations
+
+    def step_n(self, grid: Grid, generations: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """原地推进多代，返回首尾两代之间的净(出生, 死亡)；子类可在引擎内部连续推进，只在最后写回一次"""
+        start = set(grid.live_cells)
+        for _ in range(generations):
+            self.step(grid)
+        end = grid.live_cells
+        return end - start, start - end
+
+    def close(self) -> None:
+        """释放引擎持有的外部资源（共享内存等），默认无需释放"""
+        pass
+
+
+class PythonEngine(StepEngine):
+    """纯Python参考引擎，逐格计算邻居数量"""
+    name = STEP_ENGINES['python']
+
+    def step(self, grid: Grid) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        born = set()
+        died = set()
+        table = self.rule.table
+
+        for x in range(grid.height):
+            for y in range(grid.width):
+                current_state = grid.grid[x][y]
+                live_neighbors = grid.count_live_neighbors(x, y)
+
+                # 按(自身状态, 邻居数)查规则表
+                new_state = table[current_state * 9 + live_neighbors]
+                if new_state != current_state:
+                    (born if new_state else died).add((x, y))
+
+        apply_changes(grid, born, died)
+        return born, died
+
+
+class SparseEngine(StepEngine):
+    """稀疏引擎，只访问存活细胞及其邻居，耗时与存活细胞数量成正比"""
+    name = STEP_ENGINES['sparse']
+
+    # 8个邻居的坐标偏移
+    OFFSETS = [(dx, dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1) if dx != 0 or dy != 0]
+
+    def __init__(self):
+        # 上一次推进统计过邻居数的位置数
+        self.last_visited = 0
+
+    def count_neighbors(self, grid: Grid, live_cells: Set[Tuple[int, int]] = None) -> Counter:
+        """统计所有存活细胞邻居位置上的存活邻居数量，live_cells默认为网格当前的存活细胞"""
+        height, width = grid.height, grid.width
+        periodic = grid.boundary_type == BOUNDARY_TYPES['periodic']
+        counts = Counter()
+
+        for (x, y) in (grid.live_cells if live_cells is None else live_cells):
+            for dx, dy in self.OFFSETS:
+                neighbor_x, neighbor_y = x + dx, y + dy
+                if periodic:
+                    neighbor_x %= height
+                    neighbor_y %= width
+                elif not (0 <= neighbor_x < height and 0 <= neighbor_y < width):
+                    continue
+                counts[(neighbor_x, neighbor_y)] += 1
+        return counts
+
+    def step(self, grid: Grid) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        live_cells = grid.live_cells
+        counts = self.count_neighbors(grid)
+        self.last_visited = len(counts)
+        table = self.rule.table
+
+        # 出生：死亡细胞的邻居数在B中；死亡：存活细胞的邻居数不在S中（查表代替逐条判断）
+        born = {cell for cell, count in counts.items() if table[count] and cell not in live_cells}
+        died = {cell for cell in live_cells if not table[9 + counts.get(cell, 0)]}
+
+        apply_changes(grid, born, died)
+        return born, died
+
+    def step_n(self, grid: Grid, generations: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        # 中间各代只在存活集合上推进，不写二维列表
+        start = grid.live_cells
+        live_cells = start
+        self.last_visited = 0
+        table = self.rule.table
+        for _ in range(generations):
+            counts = self.count_neighbors(grid, live_cells)
+            self.last_visited += len(counts)
+            survivors = live_cells
+            live_cells = {cell for cell, count in counts.items()
+                          if table[(cell in survivors) * 9 + count]}
+            if table[9]:
+                # S0：没有邻居的孤立细胞不会出现在计数中
+                live_cells.update(cell for cell in survivors if cell not in counts)
+
+        born, died = live_cells - start, start - live_cells
+        apply_changes(grid, born, died)
+        return born, died
+
+    def cells_visited(self, grid: Grid, generations: int = 1) -> int:
+        # 只访问存活细胞的邻居位置，step_n已累计各代
+        return self.last_visited
+
+
+class NumpyEngine(StepEngine):
+    """NumPy向量化引擎，用平移数组求和计算邻居数量"""
+    name = STEP_ENGINES['numpy']
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("NumpyEngine 需要安装 numpy")
+        # 上一次推进得到的数组，以及它对应的网格与版本；网格未被修改时直接复用
+        self._board = None
+        self._grid = None
+        self._version = None
+
+    def to_array(self, grid: Grid) -> 'np.ndarray':
+        """网格当前代的uint8数组：自上次推进以来网格未变时复用缓存，否则按存活细胞重建"""
+        if grid is self._grid and grid.version == self._version:
+            return self._board
+        board = np.zeros((grid.height, grid.width), dtype=np.uint8)
+        if grid.live_cells:
+            coordinates = np.array(list(grid.live_cells), dtype=np.int64)
+            board[coordinates[:, 0], coordinates[:, 1]] = 1
+        return board
+
+    def _write_back(self, grid: Grid, board: 'np.ndarray', new_board: 'np.ndarray') -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """只把变化的细胞写回网格，并缓存新数组供下一次推进使用"""
+        born_x, born_y = np.nonzero(new_board > board)
+        died_x, died_y = np.nonzero(new_board < board)
+        born = set(zip(born_x.tolist(), born_y.tolist()))
+        died = set(zip(died_x.tolist(), died_y.tolist()))
+        # 变化细胞的扁平下标已在数组里，直接向量化计算哈希变化
+        changed = np.flatnonzero(new_board != board)
+        apply_changes(grid, born, died, hash_indices(changed))
+        self._board = new_board
+        self._grid = grid
+        self._version = grid.version
+        return born, died
+
+    def count_neighbors(self, board: 'np.ndarray', boundary_type: str) -> 'np.ndarray':
+        """计算每个细胞的存活邻居数量"""
+        # 周期性边界用环绕填充，固定边界用0填充
+        mode = 'wrap' if boundary_type == BOUNDARY_TYPES['periodic'] else 'constant'
+        padded = np.pad(board, 1, mode=mode)
+        height, width = board.shape
+
+        neighbors = np.zeros_like(board)
+        for dx in (0, 1, 2):
+            for dy in (0, 1, 2):
+                if dx == 1 and dy == 1:
+                    continue
+                neighbors += padded[dx:dx + height, dy:dy + width]
+        return neighbors
+
+    def next_board(self, board: 'np.ndarray', boundary_type: str) -> 'np.ndarray':
+        """计算下一代数组：以 自身状态*9+邻居数 为下标一次查规则表"""
+        neighbors = self.count_neighbors(board, boundary_type)
+        return self.rule.array()[board * 9 + neighbors]
+
+    def step(self, grid: Grid) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        board = self.to_array(grid)
+        return self._write_back(grid, board, self.next_board(board, grid.boundary_type))
+
+    def step_n(self, grid: Grid, generations: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        # 中间各代一直保留在数组中，只在最后把净变化写回网格
+        board = self.to_array(grid)
+        new_board = board
+        for _ in range(generations):
+            new_board = self.next_board(new_board, grid.boundary_type)
+        return self._write_back(grid, board, new_board)
+
+
+class BitPackedEngine(StepEngine):
+    """位压缩引擎，把网格打包为uint64字后用按位加法器推进"""
+    name = STEP_ENGINES['bitpacked']
+
+    def __init__(self):
+        if np is None:
+            raise ImportError("BitPackedEngine 需要安装 numpy")
+
+    def step(self, grid: Grid) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        board = BitBoard.from_grid(grid)
+        old_words = board.words
+        board.step(self.rule)
+        born = board.cells_of(board.words & ~old_words)
+        died = board.cells_of(old_words & ~board.words)
+
+        apply_changes(grid, born, died)
+        return born, died
+
+    def step_n(self, grid: Grid, generations: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        # 只打包、解包一次
+        board = BitBoard.from_grid(grid)
+        old_words = board.words
+        board.step_n(generations, self.rule)
+        born = board.cells_of(board.words & ~old_words)
+        died = board.cells_of(old_words & ~board.words)
+
+        apply_changes(grid, born, died)
+        return born, died
+
+
+class ParallelEngine(StepEngine):
+    """多进程引擎，按行把网格切成条带，各进程在共享内存上推进自己的条带"""
+    name = STEP_ENGINES['parallel']
+
+    def __init__(self, workers: int = PARALLEL_WORKERS):
+        if np is None:
+            raise ImportError("ParallelEngine 需要安装 numpy")
+        self.workers = workers
+        self.board = None  # 共享内存网格，首次推进时分配，按网格大小复用
+        # 共享内存与哪个网格的哪个版本一致；一致时共享内存就是当前代，无需重新写入
+        self._grid = None
+        self._version = None
+
+    def _load(self, grid: Grid) -> None:
+        """网格在上次推进之后被修改过（或换了网格）时，按存活细胞重新写入共享内存"""
+        if self.board is None or self.board.get_size() != grid.get_size():
+            if self.board is not None:
+                self.board.close()
+            self.board = SharedBoard(grid.width, grid.height, self.workers)
+            self._grid = None
+        if grid is self._grid and grid.version == self._version:
+            return
+        board = np.zeros((grid.height, grid.width), dtype=np.uint8)
+        if grid.live_cells:
+            coordinates = np.array(list(grid.live_cells), dtype=np.int64)
+            board[coordinates[:, 0], coordinates[:, 1]] = 1
+        self.board.load(board)
+
+    def step(self, grid: Grid) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        return self.step_n(grid, 1)
+
+    def step_n(self, grid: Grid, generations: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        # 共享内存跨调用保存当前代，中间各代一直留在共享内存中，只把变化的细胞写回网格
+        self._load(grid)
+        board = self.board.array.copy()
+        self.board.step(grid.boundary_type == BOUNDARY_TYPES['periodic'], generations, self.rule)
+        new_board = self.board.array
+
+        born_x, born_y = np.nonzero(new_board > board)
+        died_x, died_y = np.nonzero(new_board < board)
+        born = set(zip(born_x.tolist(), born_y.tolist()))
+        died = set(zip(died_x.tolist(), died_y.tolist()))
+
+        apply_changes(grid, born, died)
+        self._grid = grid
+        self._version = grid.version
+        return born, died
+
+    def close(self) -> None:
+        """释放共享内存；之后再推进会重新分配"""
+        if self.board is not None:
+            self.board.close()
+            self.board = None
+            self._grid = None
+
+
+class LookupTableEngine(StepEngine):
+    """分块查表引擎，用65536项的表把4x4邻域一次映射为中心2x2的下一代，不逐格判断规则"""
+    name = STEP_ENGINES['lookup']
+
+    def __init__(self, vectorized: bool = None):
+        """vectorized为None时有numpy就走向量化路径，否则走纯Python路径"""
+        if vectorized and np is None:
+            raise ImportError("向量化查表需要安装 numpy")
+        self.vectorized = np is not None if vectorized is None else vectorized
+
+    def step(self, grid: Grid) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        if not self.vectorized:
+            born, died = block_table.step_rows(grid.grid, grid.height, grid.width, grid.boundary_type, self.rule)
+            apply_changes(grid, born, died)
+            return born, died
+        return self.step_n(grid, 1)
+
+    def step_n(self, grid: Grid, generations: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        if not self.vectorized:
+            return super().step_n(grid, generations)
+        # 中间各代一直保留在数组中，只在最后转换回网格
+        board = np.array(grid.grid, dtype=np.uint8).reshape(grid.height, grid.width)
+        new_board = board
+        for _ in range(generations):
+            new_board = block_table.step_array(new_board, grid.boundary_type, self.rule)
+
+        born_x, born_y = np.nonzero(new_board > board)
+        died_x, died_y = np.nonzero(new_board < board)
+        born = set(zip(born_x.tolist(), born_y.tolist()))
+        died = set(zip(died_x.tolist(), died_y.tolist()))
+
+        apply_changes(grid, born, died)
+        return born, died
+
+
+class TiledEngine(StepEngine):
+    """分块引擎，委托TiledGrid只重新计算脏分块"""
+    name = STEP_ENGINES['tiled']
+
+    def step(self, grid: 'TiledGrid') -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        return grid.step(self.rule)
+
+    def step_n(self, grid: 'TiledGrid', generations: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        # 分块网格没有存活集合，不枚举全部细胞：记录翻转过奇数次的细胞，最后按当前状态分出生/死亡
+        flipped = set()
+        for _ in range(generations):
+            born, died = grid.step(self.rule)
+            flipped ^= born
+            flipped ^= died
+        born = {(x, y) for (x, y) in flipped if grid.get_cell(x, y)}
+        return born, flipped - born
+
+    def cells_visited(self, grid: 'TiledGrid', generations: int = 1) -> int:
+        # 只重新计算非空分块
+        return len(grid.tiles) * grid.tile_size * grid.tile_size * generations
+
+
+ENGINES: Dict[str, type] = {
+    STEP_ENGINES['python']: PythonEngine,
+    STEP_ENGINES['sparse']: SparseEngine,
+    STEP_ENGINES['numpy']: NumpyEngine,
+    STEP_ENGINES['bitpacked']: BitPackedEngine,
+    STEP_ENGINES['tiled']: TiledEngine,
+    STEP_ENGINES['parallel']: ParallelEngine,
+    STEP_ENGINES['lookup']: LookupTableEngine,
+}
+
+
+def create_engine(name: str, rule: Rule = CONWAY) -> StepEngine:
+    """按名称创建演化引擎"""
+    if name not in ENGINES:
+        raise ValueError(f"未知的演化引擎: {name}")
+    engine = ENGINES[name]()
+    engine.set_rule(rule)
+    return engine
+
+
+def available_engines() -> List[str]:
+    """返回当前环境可用的引擎名称"""
+    names = []
+    for name, engine_class in ENGINES.items():
+        try:
+            engine_class()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
@@ -1,69 +1,266 @@
 # 细胞演化模块
-from typing import List, Tuple, Set, Dict
+import time
+from typing import List, Tuple, Set, Dict, Optional
 from src.grid import Grid
-from src.group_detection import GroupDetection
-from src.species_manager import SpeciesManager
+from src.group_detection import GroupDetection, create_group_detector
+from src.species_manager import SpeciesManager, Species
+from src.engine import StepEngine, create_engine, apply_changes
+from src.cycle_detection import CycleDetector
+from src.metrics import Metrics
+from src.hashlife import HashLife
+from src.history import HistoryRecorder
+from src.rules import Rule, compile_rule
+from src.config import DEFAULT_STEP_ENGINE, DEFAULT_GROUP_DETECTOR, DEFAULT_RULE, BOUNDARY_TYPES
 
 class Evolution:
-    def __init__(self, grid: Grid):
-        """初始化演化模块"""
+    def __init__(self, grid: Grid, engine: str = DEFAULT_STEP_ENGINE,
+                 detector: str = DEFAULT_GROUP_DETECTOR, rule: str = DEFAULT_RULE):
+        """初始化演化模块，rule为B/S记法或预设规则名称"""
         self.grid = grid
-        self.group_detector = GroupDetection(grid)
+        self.rule: Rule = compile_rule(rule)
+        self.engine: StepEngine = create_engine(engine, self.rule)
+        self.group_detector = create_group_detector(grid, detector)
         self.species_manager = SpeciesManager(grid)
+        self.hashlife = None  # 首次快进时创建，缓存跨调用复用
+        # 最近一次evolve中出生/死亡的细胞，快进后为None
+        self.last_born: Set[Tuple[int, int]] = set()
+        self.last_died: Set[Tuple[int, int]] = set()
+        # 已推进的代数，以及尚未计入物种生存时间的累计时间
+        self.generation = 0
+        self.pending_time = 0.0
+        # 上次群体/物种分析对应的(世代, 网格版本)，相同时直接复用结果
+        self._analysis_key = None
+        self._analyzed_generation = 0  # 上次结算时的世代，物种按经过的代数容许位移
+        # 可选的历史记录器，每次推进后记录一条
+        self.recorder = None
+        # 周期检测：进入静止或振荡状态后直接按周期回放，不再模拟
+        self.cycle_detector = CycleDetector()
+        # 可选的性能指标，为None时不计时也不计数
+        self.metrics: Optional[Metrics] = None
     
     def evolve(self, delta_time: float = 0.1) -> None:
-        """执行一次演化循环"""
-        # 1. 检测当前群体
-        groups = self.group_detector.detect_groups()
-        
-        # 2. 更新物种生存时间
-        self.species_manager.update(groups, delta_time)
-        
-        # 3. 处理物种演化
-        self.species_manager.process_evolution()
-        
-        # 4. 创建新网格用于存储下一状态
-        new_grid = [[0 for _ in range(self.grid.width)] for _ in range(self.grid.height)]
-        
-        # 5. 应用基础演化规则更新每个细胞
-        for x in range(self.grid.height):
-            for y in range(self.grid.width):
-                current_state = self.grid.grid[x][y]
-                live_neighbors = self.grid.count_live_neighbors(x, y)
-                
-                # 应用康威生命游戏规则
-                if current_state == 1:
-                    # 存活细胞
-                    if live_neighbors in [2, 3]:
-                        new_grid[x][y] = 1  # 继续存活
-                    else:
-                        new_grid[x][y] = 0  # 死亡
-                else:
-                    # 死亡细胞
-                    if live_neighbors == 3:
-                        new_grid[x][y] = 1  # 出生
-                    else:
-                        new_grid[x][y] = 0  # 保持死亡
+        """执行一次演化循环，只推进细胞；群体与物种在被查询时才结算"""
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        detector = self.cycle_detector
+        detector.sync(self.grid)
+        if detector.in_cycle(self.grid):
+            # 已确认周期：直接取出这一代的变化
+            self.last_born, self.last_died = detector.next_delta(self.generation)
+            apply_changes(self.grid, self.last_born, self.last_died)
+            phase = 'cycle_replay'
+        else:
+            # 由演化引擎应用基础演化规则，原地更新网格
+            self.last_born, self.last_died = self.engine.step(self.grid)
+            phase = 'step'
+        if metrics is not None:
+            metrics.observe(phase, time.perf_counter() - start)
+            metrics.count('generations')
+            if phase == 'step':
+                metrics.count('cells_visited', self.engine.cells_visited(self.grid))
+        self.generation += 1
+        detector.observe(self.generation, self.grid, self.last_born, self.last_died)
+        self.pending_time += delta_time
+        self._record()
+    
+    def evolve_n(self, generations: int, delta_time: float = 0.1) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """连续演化多代：中间各代只在引擎内推进，返回净(出生, 死亡)"""
+        if generations <= 0:
+            return set(), set()
+        if self._skip_cycle(generations, delta_time):
+            return self.last_born, self.last_died
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        self.last_born, self.last_died = self.engine.step_n(self.grid, generations)
+        if metrics is not None:
+            metrics.observe('step_n', time.perf_counter() - start)
+            metrics.count('generations', generations)
+            metrics.count('cells_visited', self.engine.cells_visited(self.grid, generations))
+        self.generation += generations
+        self._observe_batch()
+        self.pending_time += delta_time * generations
+        self._record()
+        return self.last_born, self.last_died
+    
+    def fast_forward(self, generations: int, delta_time: float = 0.1) -> None:
+        """快进指定代数"""
+        if self._skip_cycle(generations, delta_time):
+            return
+        metrics = self.metrics
+        if metrics is not None:
+            start = time.perf_counter()
+        if self.grid.boundary_type == BOUNDARY_TYPES['periodic']:
+            if self.hashlife is None:
+                self.hashlife = HashLife(rule=self.rule)
+            self.hashlife.fast_forward(self.grid, generations)
+        else:
+            # 固定边界无法用HashLife精确模拟，由引擎连续推进
+            self.engine.step_n(self.grid, generations)
+        if metrics is not None:
+            metrics.observe('fast_forward', time.perf_counter() - start)
+            metrics.count('generations', generations)
+        self.last_born = self.last_died = None
+        self.generation += generations
+        self.pending_time += delta_time * generations
+        self._observe_batch()
+        self._record()
+    
+    def _observe_batch(self) -> None:
+        """批量推进或快进后记录哈希；哈希重复时在网格副本上逐代模拟，确认周期并取得逐代增量"""
+        detector = self.cycle_detector
+        detector.observe(self.generation, self.grid)
+        if detector.candidate is None:
+            return
+        # 状态重复说明真实周期整除两次出现的间隔，只需模拟到第一次回到当前状态
+        limit = min(detector.candidate, detector.window)
+        detector.candidate = None
+        probe = self.grid.copy()
+        engine = create_engine('sparse', self.rule)
+        deltas = []
+        for _ in range(limit):
+            deltas.append(engine.step(probe))
+            if probe.board_hash == self.grid.board_hash and probe.live_cells == self.grid.live_cells:
+                detector.enter_cycle(self.generation, deltas)
+                return
+    
+    def _skip_cycle(self, generations: int, delta_time: float = 0.1) -> bool:
+        """已处于周期中时按周期取余直接跳到目标世代，返回是否已处理"""
+        detector = self.cycle_detector
+        detector.sync(self.grid)
+        if not detector.in_cycle(self.grid):
+            return False
+        self.last_born, self.last_died = detector.skip_delta(self.generation, generations, self.grid.live_cells)
+        apply_changes(self.grid, self.last_born, self.last_died)
+        self.generation += generations
+        self.pending_time += delta_time * generations
+        detector.observe(self.generation, self.grid)
+        self._record()
+        return True
+    
+    @property
+    def cycle_period(self) -> Optional[int]:
+        """网格进入静止（周期1）或振荡状态后的周期，尚未发现周期时为None"""
+        detector = self.cycle_detector
+        return detector.period if detector.in_cycle(self.grid) else None
+    
+    def set_recorder(self, recorder: Optional[HistoryRecorder]) -> None:
+        """挂接历史记录器，并立即记录当前网格作为起点"""
+        self.recorder = recorder
+        self._record(keyframe=True)
+    
+    def _record(self, keyframe: bool = False) -> None:
+        """把本次推进写入历史；快进或网格被整体修改时写关键帧"""
+        if self.recorder is not None:
+            if keyframe:
+                self.recorder.record(self.generation, self.grid)
+            else:
+                self.recorder.record(self.generation, self.grid, self.last_born, self.last_died)
+    
+    def analyze(self) -> None:
+        """按需结算群体与物种：结果按(世代, 网格版本)缓存，网格被修改后才重新计算"""
+        key = (self.generation, self.grid.version)
+        if key == self._analysis_key:
+            return
+        if self.metrics is not None:
+            self._analyze_timed(self.metrics)
+        else:
+            # 1. 检测当前群体
+            groups = self.group_detector.detect_groups()
+            
+            # 2. 更新物种生存时间（自上次结算以来累计的时间）
+            self.species_manager.update(groups, self.pending_time, self._elapsed_generations())
+            
+            # 3. 处理物种演化
+            self.species_manager.process_evolution()
         
-        # 6. 更新网格状态
-        self._update_grid_state(new_grid)
+        self.pending_time = 0.0
+        self._analysis_key = key
+        self._analyzed_generation = self.generation
     
-    def _update_grid_state(self, new_grid: List[List[int]]) -> None:
-        """更新网格状态"""
-        # 清空现有状态
-        self.grid.live_cells.clear()
+    def _elapsed_generations(self) -> int:
+        """距上次结算经过的代数（至少为1）"""
+        return max(1, self.generation - self._analyzed_generation)
+    
+    def _analyze_timed(self, metrics: Metrics) -> None:
+        """与analyze相同的三个阶段，分别计时并统计群体数与物种演化/退化数"""
+        clock = time.perf_counter
+        start = clock()
+        groups = self.group_detector.detect_groups()
+        after_groups = clock()
+        self.species_manager.update(groups, self.pending_time, self._elapsed_generations())
+        after_update = clock()
+        evolved, devolved = self.species_manager.process_evolution()
+        end = clock()
         
-        # 更新网格和存活细胞集合
-        for x in range(self.grid.height):
-            for y in range(self.grid.width):
-                self.grid.grid[x][y] = new_grid[x][y]
-                if new_grid[x][y] == 1:
-                    self.grid.live_cells.add((x, y))
+        metrics.observe('detect_groups', after_groups - start)
+        metrics.observe('species_update', after_update - after_groups)
+        metrics.observe('process_evolution', end - after_update)
+        metrics.count('analyses')
+        metrics.count('groups_found', len(groups))
+        metrics.count('species_evolved', evolved)
+        metrics.count('species_devolved', devolved)
+    
+    def enable_metrics(self, metrics: Optional[Metrics] = None) -> Metrics:
+        """开始采集性能指标，可传入多个演化实例共用的指标对象"""
+        self.metrics = metrics if metrics is not None else Metrics()
+        return self.metrics
+    
+    def disable_metrics(self) -> None:
+        """停止采集性能指标"""
+        self.metrics = None
+    
+    def reset_species(self) -> None:
+        """清空物种（网格被整体替换时调用）"""
+        self.species_manager.reset()
+        self.pending_time = 0.0
+        self._analysis_key = None
+    
+    def grid_changed(self) -> None:
+        """网格在演化之外被修改（编辑、随机、载入）后调用，历史中写入关键帧"""
+        self._record(keyframe=True)
+    
+    def restore_species(self, species_list: List[Species]) -> None:
+        """载入已结算的物种列表，视为当前网格的分析结果"""
+        self.species_manager.load_species(species_list)
+        self.pending_time = 0.0
+        self._analysis_key = (self.generation, self.grid.version)
+        self._analyzed_generation = self.generation
+    
+    def set_engine(self, engine: str) -> None:
+        """切换演化引擎，释放原引擎的资源"""
+        previous = self.engine
+        self.engine = create_engine(engine, self.rule)
+        previous.close()
+    
+    def close(self) -> None:
+        """释放引擎与群体检测器持有的共享内存（会话关闭或被替换时调用）"""
+        self.engine.close()
+        self.group_detector.close()
+    
+    def set_rule(self, rule: str) -> Rule:
+        """切换演化规则；规则只编译一次，之后各引擎直接查表"""
+        self.rule = compile_rule(rule)
+        self.engine.set_rule(self.rule)
+        # 快进缓存和已发现的周期都只对原规则有效
+        self.hashlife = None
+        self.cycle_detector.clear()
+        return self.rule
     
     def get_species_manager(self) -> SpeciesManager:
-        """获取物种管理器"""
+        """获取物种管理器（先结算到当前代）"""
+        self.analyze()
         return self.species_manager
     
+    def get_species_list(self) -> List[Species]:
+        """获取当前代的物种列表"""
+        return self.get_species_manager().get_species_list()
+    
     def get_group_detector(self) -> GroupDetection:
         """获取群体检测器"""
         return self.group_detector
+    
+    def get_engine(self) -> StepEngine:
+        """获取演化引擎"""
+        return self.engine
@@ -0,0 +1,169 @@
+# 批量实验模块：在进程池中并行运行大量(种子, 密度, 大小, 边界)组合，逐代统计并流式写出
+import csv
+import json
+import multiprocessing
+import os
+from typing import List, Tuple, Set, Dict, NamedTuple, Iterator, Optional
+from src.grid import Grid
+from src.evolution import Evolution
+from src.parallel import worker_count
+from src.config import (
+    SPECIES_STAGES, DEFAULT_STEP_ENGINE, PARALLEL_START_METHOD,
+    EXPERIMENT_GENERATIONS, EXPERIMENT_WORKERS, EXPERIMENT_DELTA_TIME
+)
+
+# 输出列：实验参数、世代、细胞与物种统计、各阶段物种数
+COLUMNS = (['run', 'seed', 'density', 'size', 'boundary_type', 'generation',
+            'population', 'born', 'died', 'species', 'period'] +
+           [f'stage_{stage}' for stage in sorted(SPECIES_STAGES)])
+
+class ExperimentRun(NamedTuple):
+    """一次实验的参数"""
+    seed: int
+    density: float
+    size: int
+    boundary_type: str
+
+    @property
+    def key(self) -> str:
+        """实验在输出和检查点中的唯一标识"""
+        return f"{self.seed}/{self.density}/{self.size}/{self.boundary_type}"
+
+def build_runs(seeds: List[int], densities: List[float], sizes: List[int],
+               boundary_types: List[str]) -> List[ExperimentRun]:
+    """生成全部参数组合"""
+    return [ExperimentRun(seed, density, size, boundary_type)
+            for size in sizes for boundary_type in boundary_types
+            for density in densities for seed in seeds]
+
+def run_experiment(run: ExperimentRun, generations: int = EXPERIMENT_GENERATIONS,
+                   engine: str = DEFAULT_STEP_ENGINE) -> List[Dict]:
+    """运行一次实验，返回第0代到第generations代每代的统计行"""
+    grid = Grid(width=run.size, height=run.size, boundary_type=run.boundary_type)
+    grid.randomize(run.density, seed=run.seed)
+    evolution = Evolution(grid, engine=engine)
+    base = {'run': run.key, 'seed': run.seed, 'density': run.density,
+            'size': run.size, 'boundary_type': run.boundary_type}
+
+    rows = []
+    born = died = 0
+    for generation in range(generations + 1):
+        if generation > 0:
+            evolution.evolve(delta_time=EXPERIMENT_DELTA_TIME)
+            born, died = len(evolution.last_born), len(evolution.last_died)
+        species_list = evolution.get_species_list()
+        row = dict(base, generation=generation, population=len(grid.live_cells),
+                   born=born, died=died, species=len(species_list),
+                   period=evolution.cycle_period or 0)
+        for stage in SPECIES_STAGES:
+            row[f'stage_{stage}'] = 0
+        for species in species_list:
+            row[f'stage_{species.stage}'] += 1
+        rows.append(row)
+    return rows
+
+def _run_task(task: Tuple[ExperimentRun, int, str]) -> Tuple[str, List[Dict]]:
+    """工作进程入口"""
+    run, generations, engine = task
+    return run.key, run_experiment(run, generations, engine)
+
+class ResultWriter:
+    def __init__(self, path: str, resume: bool = True):
+        """打开输出文件（按扩展名选择CSV或NDJSON）和检查点文件
+
+        检查点记录已完整写出的实验；续跑时先丢弃输出中不属于这些实验的残留行
+        """
+        self.path = path
+        self.checkpoint_path = path + '.done'
+        self.ndjson = os.path.splitext(path)[1].lower() in ('.ndjson', '.jsonl')
+        self.completed: Set[str] = set()
+        if resume and os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, 'r', encoding='utf-8') as f:
+                self.completed = {line.strip() for line in f if line.strip()}
+        if resume and os.path.exists(path):
+            self._drop_partial_rows()
+        else:
+            self._create()
+        self._file = open(path, 'a', encoding='utf-8', newline='')
+        self._checkpoint = open(self.checkpoint_path, 'a', encoding='utf-8')
+        self._csv = None if self.ndjson else csv.DictWriter(self._file, COLUMNS)
+
+    def _create(self) -> None:
+        """新建空的输出文件和检查点"""
+        with open(self.path, 'w', encoding='utf-8', newline='') as f:
+            if not self.ndjson:
+                csv.DictWriter(f, COLUMNS).writeheader()
+        open(self.checkpoint_path, 'w').close()
+        self.completed = set()
+
+    def _read_rows(self) -> Iterator[Tuple[str, str]]:
+        """逐行读出已有输出，返回(实验标识, 原始行)"""
+        with open(self.path, 'r', encoding='utf-8', newline='') as f:
+            if self.ndjson:
+                for line in f:
+                    try:
+                        yield json.loads(line)['run'], line
+                    except (ValueError, KeyError):
+                        continue  # 中断时写了一半的行
+            else:
+                f.readline()
+                for line in f:
+                    yield line.split(',', 1)[0], line
+
+    def _drop_partial_rows(self) -> None:
+        """只保留检查点中已完成实验的行，重写输出文件"""
+        temporary = self.path + '.tmp'
+        with open(temporary, 'w', encoding='utf-8', newline='') as out:
+            if not self.ndjson:
+                csv.DictWriter(out, COLUMNS).writeheader()
+            for key, line in self._read_rows():
+                if key in self.completed and line.endswith('\n'):
+                    out.write(line)
+        os.replace(temporary, self.path)
+
+    def write(self, key: str, rows: List[Dict]) -> None:
+        """写出一次实验的全部行，落盘后再记入检查点"""
+        if self.ndjson:
+            self._file.write(''.join(json.dumps(row, ensure_ascii=False) + '\n' for row in rows))
+        else:
+            self._csv.writerows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._checkpoint.write(key + '\n')
+        self._checkpoint.flush()
+        self.completed.add(key)
+
+    def close(self) -> None:
+        """关闭文件"""
+        self._file.close()
+        self._checkpoint.close()
+
+def run_sweep(runs: List[ExperimentRun], path: str, generations: int = EXPERIMENT_GENERATIONS,
+              workers: Optional[int] = EXPERIMENT_WORKERS, engine: str = DEFAULT_STEP_ENGINE,
+              resume: bool = True, progress=None) -> int:
+    """并行运行尚未完成的实验，每完成一个就写出并更新检查点，返回本次运行的实验数"""
+    writer = ResultWriter(path, resume)
+    try:
+        pending = [run for run in runs if run.key not in writer.completed]
+        if not pending:
+            return 0
+        tasks = [(run, generations, engine) for run in pending]
+        workers = min(worker_count(workers), len(tasks))
+        if workers == 1:
+            results = map(_run_task, tasks)
+            pool = None
+        else:
+            pool = multiprocessing.get_context(PARALLEL_START_METHOD).Pool(workers)
+            results = pool.imap_unordered(_run_task, tasks)
+        try:
+            for done, (key, rows) in enumerate(results, 1):
+                writer.write(key, rows)
+                if progress is not None:
+                    progress(done, len(tasks), key)
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+        return len(tasks)
+    finally:
+        writer.close()
@@ -0,0 +1,205 @@
+# 游戏会话状态模块
+import sys
+import threading
+import zlib
+from collections import deque
+from typing import List, Tuple, Set, Dict, NamedTuple, FrozenSet, Optional
+from src.grid import Grid
+from src.evolution import Evolution
+from src.simulation import SimulationLoop
+from src.history import HistoryRecorder
+from src import persistence
+from src.config import DEFAULT_GRID_WIDTH, DEFAULT_GRID_HEIGHT, DEFAULT_BOUNDARY_TYPE, STREAM_DELTA_HISTORY
+
+class SpeciesRecord(NamedTuple):
+    """物种在某一代的只读副本"""
+    species_id: int
+    group: FrozenSet[Tuple[int, int]]
+    stage: int
+    survival_time: float
+    evolution_progress: float
+
+class Snapshot(NamedTuple):
+    """某一代的只读快照：写线程每代发布一个新快照，读请求无需加锁"""
+    generation: int
+    epoch: int
+    rows: Tuple[Tuple[int, ...], ...]
+    live_cells: FrozenSet[Tuple[int, int]]
+    species: Optional[Tuple[SpeciesRecord, ...]]  # 首次被查询时才计算
+    period: Optional[int] = None  # 进入静止/振荡状态后的周期
+
+class GameState:
+    def __init__(self, width: int = DEFAULT_GRID_WIDTH, height: int = DEFAULT_GRID_HEIGHT,
+                 boundary_type: str = DEFAULT_BOUNDARY_TYPE):
+        """初始化一局游戏"""
+        self.grid = Grid(width=width, height=height, boundary_type=boundary_type)
+        self.evolution = Evolution(self.grid)
+        self.is_running = False
+        # 可选的演化历史记录器
+        self.history = None
+        # 写操作（演化、重置、编辑）互斥，后台模拟线程与请求处理共用
+        self.lock = threading.RLock()
+        # 服务器端后台模拟，演化速率与客户端轮询无关
+        self.loop = SimulationLoop(self.step, on_error=self._loop_failed)
+        # 最近若干次演化的(起始世代, 结束世代, 出生, 死亡)，供增量流推送
+        self.deltas = deque(maxlen=STREAM_DELTA_HISTORY)
+        # 网格被整体修改（重置、随机、手动编辑）时递增，增量流据此改发关键帧
+        self.epoch = 0
+        self.changed = threading.Condition()
+        # 当前连接的增量流数量，有连接的会话不会被换出
+        self.streams = 0
+        # 正在使用本会话的请求数（由注册表在其锁内增减），有租约的会话不会被换出
+        self.leases = 0
+        self.snapshot = None
+        self.publish()
+    
+    def step(self, delta_time: float = 0.1) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """执行一次演化并记录增量，返回(出生, 死亡)"""
+        with self.lock:
+            self.evolution.evolve(delta_time=delta_time)
+            born, died = self.evolution.last_born, self.evolution.last_died
+            self.deltas.append((self.generation - 1, self.generation, born, died))
+            self.publish(born, died)
+        self.notify()
+        return born, died
+    
+    def step_n(self, generations: int, delta_time: float = 0.1) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """连续演化多代，只记录首尾之间的净增量，返回(出生, 死亡)"""
+        with self.lock:
+            start = self.generation
+            born, died = self.evolution.evolve_n(generations, delta_time=delta_time)
+            self.deltas.append((start, self.generation, born, died))
+            self.publish(born, died)
+        self.notify()
+        return born, died
+    
+    @property
+    def generation(self) -> int:
+        """当前世代（由演化模块计数）"""
+        return self.evolution.generation
+    
+    @generation.setter
+    def generation(self, value: int) -> None:
+        self.evolution.generation = value
+    
+    def enable_history(self, path: str) -> HistoryRecorder:
+        """开始把每一代记录到历史文件"""
+        with self.lock:
+            if self.history is None:
+                self.history = HistoryRecorder(path)
+                self.evolution.set_recorder(self.history)
+            return self.history
+    
+    def touch(self) -> None:
+        """网格被整体修改后调用（需持有写锁）"""
+        self.evolution.grid_changed()
+        self.epoch += 1
+        self.deltas.clear()
+        self.publish()
+        self.notify()
+    
+    def publish(self, born: Set[Tuple[int, int]] = None, died: Set[Tuple[int, int]] = None) -> None:
+        """发布新快照（需持有写锁）；已知出生/死亡细胞时只复制发生变化的行，其余行与上一快照共享"""
+        grid = self.grid
+        previous = self.snapshot
+        if previous is not None and born is not None and died is not None:
+            rows = list(previous.rows)
+            for x in {x for (x, _) in born} | {x for (x, _) in died}:
+                rows[x] = tuple(grid.grid[x])
+            rows = tuple(rows)
+        else:
+            rows = tuple(tuple(row) for row in grid.grid)
+        
+        # 整体替换引用是原子操作，读者要么看到旧快照，要么看到新快照
+        self.snapshot = Snapshot(self.generation, self.epoch, rows, frozenset(grid.live_cells), None,
+                                 self.evolution.cycle_period)
+    
+    def species_snapshot(self) -> Tuple[SpeciesRecord, ...]:
+        """当前快照的物种记录；每代第一次查询时结算群体与物种并补入快照"""
+        snapshot = self.snapshot
+        if snapshot.species is None:
+            with self.lock:
+                snapshot = self.snapshot
+                if snapshot.species is None:
+                    species = tuple(
+                        SpeciesRecord(s.species_id, frozenset(s.group), s.stage,
+                                      s.survival_time, s.evolution_progress)
+                        for s in self.evolution.get_species_list()
+                    )
+                    snapshot = snapshot._replace(species=species)
+                    self.snapshot = snapshot
+        return snapshot.species
+    
+    def notify(self) -> None:
+        """唤醒等待网格变化的增量流"""
+        with self.changed:
+            self.changed.notify_all()
+    
+    def start(self) -> None:
+        """开始后台自动演化"""
+        self.is_running = True
+        self.loop.start()
+    
+    def stop(self) -> None:
+        """暂停后台自动演化"""
+        self.is_running = False
+        self.loop.stop()
+    
+    def _loop_failed(self, error: Exception) -> None:
+        """后台演化出错时循环已自行暂停，同步运行状态"""
+        self.is_running = False
+    
+    def close(self) -> None:
+        """结束后台线程，释放共享内存并删除历史文件（会话被换出或销毁时调用）"""
+        self.is_running = False
+        self.loop.close()
+        self.evolution.close()
+        if self.history is not None:
+            self.history.delete()
+            self.history = None
+    
+    def is_idle(self) -> bool:
+        """既未运行，也没有增量流连接或未归还的租约"""
+        return not self.is_running and self.streams == 0 and self.leases == 0
+    
+    def memory_usage(self) -> int:
+        """估算会话占用的内存字节数（网格、存活集合、快照与物种索引）"""
+        grid = self.grid
+        row_bytes = sys.getsizeof(grid.grid) + sum(sys.getsizeof(row) for row in grid.grid)
+        cell_bytes = sys.getsizeof((0, 0)) + 2 * sys.getsizeof(grid.width)
+        live_bytes = sys.getsizeof(grid.live_cells) + len(grid.live_cells) * cell_bytes
+        # 快照另存了一份行元组和存活集合；物种索引与物种快照各为每个存活细胞一项
+        species_bytes = 2 * self.evolution.species_manager.index_memory_usage()
+        return 2 * (row_bytes + live_bytes) + species_bytes
+    
+    def to_bytes(self, compress: bool = True) -> bytes:
+        """序列化为存档格式（位压缩网格加物种表），默认再整体zlib压缩"""
+        with self.lock:
+            species_manager = self.evolution.get_species_manager()
+            data = persistence.dumps(self.grid, species_manager.get_species_list(),
+                                     self.generation, species_manager.next_species_id,
+                                     self.evolution.rule.notation)
+        return zlib.compress(data) if compress else data
+    
+    @classmethod
+    def from_bytes(cls, data: bytes, compressed: bool = True) -> 'GameState':
+        """由to_bytes的结果恢复会话"""
+        saved = persistence.loads(zlib.decompress(data) if compressed else data)
+        game = cls(saved.grid.width, saved.grid.height, saved.grid.boundary_type)
+        game.load_saved(saved)
+        return game
+    
+    def load_saved(self, saved: persistence.SavedState) -> None:
+        """用读出的存档替换当前网格、物种与世代"""
+        with self.lock:
+            # 先完整构建新的演化对象，失败时会话保持原状
+            evolution = Evolution(saved.grid, rule=saved.rule)
+            evolution.recorder = self.history
+            evolution.metrics = self.evolution.metrics
+            evolution.generation = saved.generation
+            evolution.species_manager.next_species_id = saved.next_species_id
+            evolution.restore_species(saved.species)
+            self.evolution.close()
+            self.grid = saved.grid
+            self.evolution = evolution
+            self.touch()
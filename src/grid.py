@@ -1,6 +1,7 @@
 # 网格管理模块
-from typing import List, Tuple, Set, Dict
+from typing import List, Tuple, Set, Dict, Optional
 import random
+from src.zobrist import zobrist_key, hash_cells
 from src.config import (
     DEFAULT_GRID_WIDTH, DEFAULT_GRID_HEIGHT,
     DEFAULT_BOUNDARY_TYPE, BOUNDARY_TYPES
@@ -17,28 +18,38 @@ class Grid:
         self.grid = [[0 for _ in range(width)] for _ in range(height)]
         # 使用集合存储存活细胞的坐标，提高查询效率
         self.live_cells = set()
+        # 每次修改网格时递增，供缓存判断网格是否变化
+        self.version = 0
+        # Zobrist哈希：存活细胞键的异或，每次细胞状态翻转时增量更新
+        self.board_hash = 0
     
     def reset(self) -> None:
         """重置网格"""
         self.grid = [[0 for _ in range(self.width)] for _ in range(self.height)]
         self.live_cells.clear()
+        self.version += 1
+        self.board_hash = 0
     
-    def randomize(self, density: float = 0.3) -> None:
-        """随机初始化网格"""
+    def randomize(self, density: float = 0.3, seed: Optional[int] = None) -> None:
+        """随机初始化网格，指定seed时结果可复现"""
         self.reset()
+        rng = random.Random(seed) if seed is not None else random
         for i in range(self.height):
             for j in range(self.width):
-                if random.random() < density:
+                if rng.random() < density:
                     self.set_cell(i, j, 1)
     
     def set_cell(self, x: int, y: int, state: int) -> None:
         """设置单个细胞状态"""
         if 0 <= x < self.height and 0 <= y < self.width:
+            if self.grid[x][y] != state:
+                self.board_hash ^= zobrist_key(x * self.width + y)
             self.grid[x][y] = state
             if state == 1:
                 self.live_cells.add((x, y))
             else:
                 self.live_cells.discard((x, y))
+            self.version += 1
     
     def get_cell(self, x: int, y: int) -> int:
         """获取单个细胞状态，处理边界条件"""
@@ -92,4 +103,9 @@ class Grid:
         new_grid = Grid(self.width, self.height, self.boundary_type)
         new_grid.grid = [row.copy() for row in self.grid]
         new_grid.live_cells = self.live_cells.copy()
+        new_grid.board_hash = self.board_hash
         return new_grid
+    
+    def rehash(self) -> None:
+        """按存活细胞重新计算哈希（直接替换了grid/live_cells之后调用）"""
+        self.board_hash = hash_cells(self.live_cells, self.width)
@@ -1,12 +1,23 @@
 # 群体检测模块
+from collections import deque
 from typing import List, Tuple, Set, Dict
 from src.grid import Grid
+from src.parallel import SharedBoard
+from src.config import BOUNDARY_TYPES, GROUP_DETECTORS, GROUP_CHURN_THRESHOLD, PARALLEL_WORKERS
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖
+    np = None
 
 class GroupDetection:
     def __init__(self, grid: Grid):
         """初始化群体检测模块"""
         self.grid = grid
         self.height, self.width = grid.get_size()
+        # 细胞 -> 群体下标的索引，首次查询某个群体列表时建立
+        self._indexed_groups = None
+        self._group_index: Dict[Tuple[int, int], int] = {}
     
     def detect_groups(self) -> List[Set[Tuple[int, int]]]:
         """检测所有相连的细胞群体"""
@@ -39,6 +50,10 @@ class GroupDetection:
                         continue
                     
                     neighbor_x, neighbor_y = current_x + dx, current_y + dy
+                    if self.grid.boundary_type == BOUNDARY_TYPES['periodic']:
+                        # 周期性边界：坐标环绕，避免在环面上无限扩展
+                        neighbor_x %= self.height
+                        neighbor_y %= self.width
                     neighbor_state = self.grid.get_cell(neighbor_x, neighbor_y)
                     
                     if neighbor_state == 1 and (neighbor_x, neighbor_y) not in visited:
@@ -49,10 +64,19 @@ class GroupDetection:
     
     def get_group_id(self, x: int, y: int, groups: List[Set[Tuple[int, int]]]) -> int:
         """获取细胞所属的群体ID"""
-        for i, group in enumerate(groups):
-            if (x, y) in group:
-                return i
-        return -1  # 不属于任何群体
+        return self._index_groups(groups).get((x, y), -1)  # -1表示不属于任何群体
+    
+    def get_group_ids(self, cells: List[Tuple[int, int]], groups: List[Set[Tuple[int, int]]]) -> List[int]:
+        """批量获取多个细胞所属的群体ID"""
+        index = self._index_groups(groups)
+        return [index.get(cell, -1) for cell in cells]
+    
+    def _index_groups(self, groups: List[Set[Tuple[int, int]]]) -> Dict[Tuple[int, int], int]:
+        """为群体列表建立细胞索引，同一列表重复查询时复用"""
+        if groups is not self._indexed_groups:
+            self._group_index = {cell: i for i, group in enumerate(groups) for cell in group}
+            self._indexed_groups = groups
+        return self._group_index
     
     def calculate_group_center(self, group: Set[Tuple[int, int]]) -> Tuple[float, float]:
         """计算群体的中心坐标"""
@@ -64,3 +88,308 @@ class GroupDetection:
         count = len(group)
         
         return (total_x / count, total_y / count)
+    
+    def close(self) -> None:
+        """释放检测器持有的外部资源（共享内存等），默认无需释放"""
+        pass
+
+class IncrementalGroupDetection(GroupDetection):
+    def __init__(self, grid: Grid, churn_threshold: float = GROUP_CHURN_THRESHOLD):
+        """初始化增量群体检测：只在出生/死亡细胞附近更新群体"""
+        super().__init__(grid)
+        self.churn_threshold = churn_threshold
+        self.known_cells: Set[Tuple[int, int]] = None  # 上次检测时的存活细胞
+        self.labels: Dict[Tuple[int, int], int] = {}   # 细胞 -> 群体编号
+        self.components: Dict[int, Set[Tuple[int, int]]] = {}
+        self.next_label = 0
+    
+    def detect_groups(self) -> List[Set[Tuple[int, int]]]:
+        """检测所有相连的细胞群体，与上次检测结果做增量更新"""
+        live_cells = self.grid.get_live_cells()
+        if self.known_cells is None:
+            self._relabel()
+        else:
+            born = live_cells - self.known_cells
+            died = self.known_cells - live_cells
+            # 变化过多时增量更新不划算，退回全量重新标记
+            if len(born) + len(died) > self.churn_threshold * max(len(live_cells), 1):
+                self._relabel()
+            else:
+                self._update(born, died)
+        self.known_cells = live_cells
+        
+        # 返回副本，避免后续合并时修改调用方持有的集合
+        return [set(group) for group in self.components.values()]
+    
+    def _neighbors(self, x: int, y: int) -> List[Tuple[int, int]]:
+        """返回8个邻居坐标，周期性边界下坐标环绕"""
+        neighbors = []
+        periodic = self.grid.boundary_type == BOUNDARY_TYPES['periodic']
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                neighbor_x, neighbor_y = x + dx, y + dy
+                if periodic:
+                    neighbor_x %= self.height
+                    neighbor_y %= self.width
+                neighbors.append((neighbor_x, neighbor_y))
+        return neighbors
+    
+    def _relabel(self) -> None:
+        """全量重新标记所有群体"""
+        self.labels.clear()
+        self.components.clear()
+        for group in super().detect_groups():
+            self._add_component(group)
+    
+    def _add_component(self, group: Set[Tuple[int, int]]) -> int:
+        """登记一个新群体，返回其编号"""
+        label = self.next_label
+        self.next_label += 1
+        self.components[label] = group
+        for cell in group:
+            self.labels[cell] = label
+        return label
+    
+    def _merge(self, label_a: int, label_b: int) -> int:
+        """合并两个群体（小群体并入大群体），返回合并后的编号"""
+        if len(self.components[label_a]) < len(self.components[label_b]):
+            label_a, label_b = label_b, label_a
+        smaller = self.components.pop(label_b)
+        self.components[label_a].update(smaller)
+        for cell in smaller:
+            self.labels[cell] = label_a
+        return label_a
+    
+    def _update(self, born: Set[Tuple[int, int]], died: Set[Tuple[int, int]]) -> None:
+        """根据出生/死亡细胞增量更新群体"""
+        # 1. 移除死亡细胞，记录每个受影响群体中与死亡细胞相邻的存活细胞
+        seeds: Dict[int, Set[Tuple[int, int]]] = {}
+        for cell in died:
+            label = self.labels.pop(cell)
+            self.components[label].discard(cell)
+            seeds.setdefault(label, set())
+        for cell in died:
+            for neighbor in self._neighbors(*cell):
+                label = self.labels.get(neighbor)
+                if label in seeds:
+                    seeds[label].add(neighbor)
+        
+        # 2. 受影响的群体可能分裂
+        for label, label_seeds in seeds.items():
+            if not self.components[label]:
+                del self.components[label]
+            else:
+                self._split(label, label_seeds)
+        
+        # 3. 出生细胞与相邻的存活细胞所在群体合并
+        for cell in born:
+            label = self._add_component({cell})
+            for neighbor in self._neighbors(*cell):
+                other = self.labels.get(neighbor)
+                if other is not None and other != label:
+                    label = self._merge(label, other)
+    
+    def _split(self, label: int, seeds: Set[Tuple[int, int]]) -> None:
+        """检查移除细胞后的群体是否分裂，把分离出的部分登记为新群体
+        
+        群体中任意细胞沿原路径走向死亡细胞时，必先经过某个与死亡细胞相邻的存活细胞，
+        因此只要这些细胞彼此连通，整个群体就仍然连通，搜索可以提前结束。
+        """
+        component = self.components[label]
+        remaining = set(seeds)
+        while remaining:
+            start = remaining.pop()
+            visited = {start}
+            queue = deque([start])
+            # 广度优先搜索，找到全部剩余种子后提前结束
+            while queue and remaining:
+                current_x, current_y = queue.popleft()
+                for neighbor in self._neighbors(current_x, current_y):
+                    if neighbor in component and neighbor not in visited:
+                        visited.add(neighbor)
+                        queue.append(neighbor)
+                        remaining.discard(neighbor)
+            if not remaining:
+                break
+            # 搜索耗尽仍有种子未到达：visited是一个完整的分裂部分
+            component.difference_update(visited)
+            self._add_component(visited)
+
+class LabelingGroupDetection(GroupDetection):
+    # 8连通只需检查一半方向的邻居：右、下、右下、左下
+    EDGE_OFFSETS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+    
+    def __init__(self, grid: Grid):
+        """初始化向量化连通域标记：在NumPy标签数组上做并查集"""
+        if np is None:
+            raise ImportError("LabelingGroupDetection 需要安装 numpy")
+        super().__init__(grid)
+        self.label_map = None   # 每个细胞的群体编号，0表示死亡细胞，群体i对应编号i+1
+        self.sizes = None       # 每个群体的细胞数量
+        self.centroids = None   # 每个群体的中心坐标，形状为(群体数, 2)
+    
+    def _board(self) -> 'np.ndarray':
+        """由存活细胞集合构造布尔数组"""
+        board = np.zeros((self.height, self.width), dtype=bool)
+        live_cells = self.grid.get_live_cells()
+        if live_cells:
+            coordinates = np.array(list(live_cells), dtype=np.int64)
+            board[coordinates[:, 0], coordinates[:, 1]] = True
+        return board
+    
+    def _edges(self, board: 'np.ndarray') -> Tuple['np.ndarray', 'np.ndarray']:
+        """列出所有相邻存活细胞对（扁平下标），周期性边界包含跨越边缘的邻居"""
+        index = np.arange(self.height * self.width, dtype=np.int64).reshape(self.height, self.width)
+        periodic = self.grid.boundary_type == BOUNDARY_TYPES['periodic']
+        sources = []
+        targets = []
+        for dx, dy in self.EDGE_OFFSETS:
+            if periodic:
+                neighbor_index = np.roll(index, (-dx, -dy), axis=(0, 1))
+                neighbor_board = np.roll(board, (-dx, -dy), axis=(0, 1))
+                mask = board & neighbor_board
+                sources.append(index[mask])
+                targets.append(neighbor_index[mask])
+            else:
+                # 固定边界只取两端都在网格内的区域
+                rows = slice(0, self.height - dx)
+                cols = slice(max(0, -dy), self.width - max(0, dy))
+                neighbor_rows = slice(dx, self.height)
+                neighbor_cols = slice(max(0, dy), self.width - max(0, -dy))
+                mask = board[rows, cols] & board[neighbor_rows, neighbor_cols]
+                sources.append(index[rows, cols][mask])
+                targets.append(index[neighbor_rows, neighbor_cols][mask])
+        return np.concatenate(sources), np.concatenate(targets)
+    
+    def label(self) -> Tuple['np.ndarray', 'np.ndarray', 'np.ndarray']:
+        """标记连通域，返回(标签数组, 群体大小, 群体中心)"""
+        board = self._board()
+        sources, targets = self._edges(board)
+        
+        # 第一遍：向量化并查集，把较大的根挂到较小的根上，再做指针跳跃压缩路径
+        parent = np.arange(self.height * self.width, dtype=np.int64)
+        while True:
+            source_roots = parent[sources]
+            target_roots = parent[targets]
+            unequal = source_roots != target_roots
+            if not unequal.any():
+                break
+            low = np.minimum(source_roots[unequal], target_roots[unequal])
+            high = np.maximum(source_roots[unequal], target_roots[unequal])
+            np.minimum.at(parent, high, low)
+            while True:
+                grandparent = parent[parent]
+                if np.array_equal(grandparent, parent):
+                    break
+                parent = grandparent
+        
+        # 第二遍：把根压缩为连续编号
+        live_index = np.flatnonzero(board)
+        roots, inverse = np.unique(parent[live_index], return_inverse=True)
+        label_map = np.zeros(self.height * self.width, dtype=np.int32)
+        label_map[live_index] = inverse + 1
+        
+        sizes = np.bincount(inverse, minlength=len(roots))
+        xs, ys = np.divmod(live_index, self.width)
+        centroids = np.zeros((len(roots), 2))
+        if len(roots):
+            centroids[:, 0] = np.bincount(inverse, weights=xs) / sizes
+            centroids[:, 1] = np.bincount(inverse, weights=ys) / sizes
+        
+        self.label_map = label_map.reshape(self.height, self.width)
+        self.sizes = sizes
+        self.centroids = centroids
+        return self.label_map, self.sizes, self.centroids
+    
+    def detect_groups(self) -> List[Set[Tuple[int, int]]]:
+        """检测所有相连的细胞群体，群体下标与标签数组中的编号一一对应"""
+        label_map, sizes, _ = self.label()
+        labels = label_map.ravel()
+        live_index = np.flatnonzero(labels)
+        order = np.argsort(labels[live_index], kind='stable')
+        xs, ys = np.divmod(live_index[order], self.width)
+        
+        groups = []
+        start = 0
+        for size in sizes.tolist():
+            end = start + size
+            groups.append(set(zip(xs[start:end].tolist(), ys[start:end].tolist())))
+            start = end
+        return groups
+    
+    def get_group_id(self, x: int, y: int, groups: List[Set[Tuple[int, int]]] = None) -> int:
+        """获取细胞所属的群体ID，直接查标签数组"""
+        if self.label_map is None:
+            return super().get_group_id(x, y, groups)
+        if not (0 <= x < self.height and 0 <= y < self.width):
+            return -1
+        return int(self.label_map[x, y]) - 1
+    
+    def get_group_ids(self, cells: List[Tuple[int, int]], groups: List[Set[Tuple[int, int]]] = None) -> List[int]:
+        """批量获取多个细胞所属的群体ID，一次向量化查表"""
+        if self.label_map is None or not cells:
+            return super().get_group_ids(cells, groups)
+        coordinates = np.array(cells, dtype=np.int64).reshape(-1, 2)
+        xs, ys = coordinates[:, 0], coordinates[:, 1]
+        inside = (xs >= 0) & (xs < self.height) & (ys >= 0) & (ys < self.width)
+        ids = np.full(len(cells), -1, dtype=np.int64)
+        ids[inside] = self.label_map[xs[inside], ys[inside]].astype(np.int64) - 1
+        return ids.tolist()
+    
+    def calculate_group_center(self, group: Set[Tuple[int, int]]) -> Tuple[float, float]:
+        """计算群体的中心坐标，已标记的群体直接返回预先算好的中心"""
+        if group and self.label_map is not None:
+            x, y = next(iter(group))
+            group_id = self.get_group_id(x, y)
+            if group_id >= 0 and self.sizes[group_id] == len(group):
+                return tuple(self.centroids[group_id].tolist())
+        return super().calculate_group_center(group)
+
+class ParallelGroupDetection(GroupDetection):
+    def __init__(self, grid: Grid, workers: int = PARALLEL_WORKERS):
+        """初始化多进程群体检测：各进程标记自己条带内的分量，再沿条带接缝合并"""
+        if np is None:
+            raise ImportError("ParallelGroupDetection 需要安装 numpy")
+        super().__init__(grid)
+        self.workers = workers
+        self.board = None  # 共享内存网格，首次检测时分配
+    
+    def _load(self) -> None:
+        if self.board is None:
+            self.board = SharedBoard(self.width, self.height, self.workers)
+        board = np.zeros((self.height, self.width), dtype=np.uint8)
+        live_cells = self.grid.get_live_cells()
+        if live_cells:
+            coordinates = np.array(list(live_cells), dtype=np.int64)
+            board[coordinates[:, 0], coordinates[:, 1]] = 1
+        self.board.load(board)
+    
+    def detect_groups(self) -> List[Set[Tuple[int, int]]]:
+        """检测所有相连的细胞群体"""
+        self._load()
+        return self.board.label(self.grid.boundary_type == BOUNDARY_TYPES['periodic'])
+    
+    def detect_group_labels(self) -> Tuple['np.ndarray', 'np.ndarray']:
+        """以数组形式返回(存活细胞的扁平下标, 群体编号)，供不需要坐标集合的调用方使用"""
+        self._load()
+        return self.board.label_arrays(self.grid.boundary_type == BOUNDARY_TYPES['periodic'])
+    
+    def close(self) -> None:
+        """释放共享内存"""
+        if self.board is not None:
+            self.board.close()
+            self.board = None
+
+def create_group_detector(grid: Grid, detector: str) -> GroupDetection:
+    """按名称创建群体检测器"""
+    if detector == GROUP_DETECTORS['dfs']:
+        return GroupDetection(grid)
+    if detector == GROUP_DETECTORS['incremental']:
+        return IncrementalGroupDetection(grid)
+    if detector == GROUP_DETECTORS['labeling']:
+        return LabelingGroupDetection(grid)
+    if detector == GROUP_DETECTORS['parallel']:
+        return ParallelGroupDetection(grid)
+    raise ValueError(f"未知的群体检测器: {detector}")
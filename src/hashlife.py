@@ -0,0 +1,185 @@
+# HashLife模块
+from typing import List, Tuple, Set, Dict, Optional
+from src.grid import Grid
+from src.config import BOUNDARY_TYPES, HASHLIFE_MAX_CACHE_NODES
+from src.engine import apply_changes
+from src.rules import Rule, CONWAY
+
+class Node:
+    """四叉树宏细胞，边长为2^level；同样内容的节点只存在一个实例"""
+    __slots__ = ('level', 'nw', 'ne', 'sw', 'se', 'population')
+
+    def __init__(self, level: int, nw: Optional['Node'], ne: Optional['Node'],
+                 sw: Optional['Node'], se: Optional['Node'], population: int):
+        self.level = level
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.population = population
+
+class HashLife:
+    def __init__(self, max_cache_nodes: int = HASHLIFE_MAX_CACHE_NODES, rule: Rule = CONWAY):
+        """初始化HashLife引擎；演化结果缓存只对同一规则有效"""
+        self.max_cache_nodes = max_cache_nodes
+        self.rule = rule
+        self.dead = Node(0, None, None, None, None, 0)
+        self.alive = Node(0, None, None, None, None, 1)
+        self.clear_cache()
+
+    def clear_cache(self) -> None:
+        """清空节点驻留表和演化结果缓存"""
+        self._nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._results: Dict[Tuple[Node, int], Node] = {}
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """由四个子节点组合出上一层节点（驻留，保证唯一）"""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            population = nw.population + ne.population + sw.population + se.population
+            node = Node(nw.level + 1, nw, ne, sw, se, population)
+            self._nodes[key] = node
+        return node
+
+    def _center(self, node: Node) -> Node:
+        """取节点中心的下一层节点"""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _step_leaf(self, node: Node) -> Node:
+        """4x4节点推进一代，返回中心2x2节点"""
+        rows = [
+            [node.nw.nw, node.nw.ne, node.ne.nw, node.ne.ne],
+            [node.nw.sw, node.nw.se, node.ne.sw, node.ne.se],
+            [node.sw.nw, node.sw.ne, node.se.nw, node.se.ne],
+            [node.sw.sw, node.sw.se, node.se.sw, node.se.se],
+        ]
+        cells = [[cell.population for cell in row] for row in rows]
+
+        result = []
+        table = self.rule.table
+        for x in (1, 2):
+            for y in (1, 2):
+                live_neighbors = sum(cells[x + dx][y + dy]
+                                     for dx in (-1, 0, 1) for dy in (-1, 0, 1)) - cells[x][y]
+                result.append(self.alive if table[cells[x][y] * 9 + live_neighbors] else self.dead)
+        return self.join(*result)
+
+    def step(self, node: Node, j: int) -> Node:
+        """把level为k的节点推进2^j代（j <= k-2），返回中心level为k-1的节点"""
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.population == 0:
+            result = node.nw
+        elif node.level == 2:
+            result = self._step_leaf(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # 9个相互重叠的子节点
+            subs = [
+                nw, self.join(nw.ne, ne.nw, nw.se, ne.sw), ne,
+                self.join(nw.sw, nw.se, sw.nw, sw.ne), self._center(node),
+                self.join(ne.sw, ne.se, se.nw, se.ne),
+                sw, self.join(sw.ne, se.nw, sw.se, se.sw), se,
+            ]
+            if j == node.level - 2:
+                # 全速：两个阶段各推进2^(k-3)代
+                parts = [self.step(sub, j - 1) for sub in subs]
+                j = j - 1
+            else:
+                # 慢速：第一阶段不推进，只取中心
+                parts = [self._center(sub) for sub in subs]
+
+            quadrants = [
+                self.join(parts[0], parts[1], parts[3], parts[4]),
+                self.join(parts[1], parts[2], parts[4], parts[5]),
+                self.join(parts[3], parts[4], parts[6], parts[7]),
+                self.join(parts[4], parts[5], parts[7], parts[8]),
+            ]
+            result = self.join(*[self.step(quadrant, j) for quadrant in quadrants])
+
+        self._results[key] = result
+        return result
+
+    def build_torus(self, live_cells: Set[Tuple[int, int]], height: int, width: int,
+                    level: int, origin: Tuple[int, int]) -> Node:
+        """把环面网格周期平铺成边长为2^level的节点，origin为节点左上角对应的网格坐标"""
+        tiles: Dict[Tuple[int, int, int], Node] = {}
+
+        def tile(level: int, x: int, y: int) -> Node:
+            x %= height
+            y %= width
+            key = (level, x, y)
+            node = tiles.get(key)
+            if node is None:
+                if level == 0:
+                    node = self.alive if (x, y) in live_cells else self.dead
+                else:
+                    half = 1 << (level - 1)
+                    node = self.join(tile(level - 1, x, y), tile(level - 1, x, y + half),
+                                     tile(level - 1, x + half, y), tile(level - 1, x + half, y + half))
+                tiles[key] = node
+            return node
+
+        return tile(level, origin[0], origin[1])
+
+    def collect_cells(self, node: Node, height: int, width: int) -> Set[Tuple[int, int]]:
+        """收集节点左上角height x width窗口内的存活细胞"""
+        cells = set()
+        stack = [(node, 0, 0)]
+        while stack:
+            current, x, y = stack.pop()
+            if current.population == 0 or x >= height or y >= width:
+                continue
+            if current.level == 0:
+                cells.add((x, y))
+                continue
+            half = 1 << (current.level - 1)
+            stack.append((current.nw, x, y))
+            stack.append((current.ne, x, y + half))
+            stack.append((current.sw, x + half, y))
+            stack.append((current.se, x + half, y + half))
+        return cells
+
+    def advance_torus(self, live_cells: Set[Tuple[int, int]], height: int, width: int,
+                      j: int) -> Set[Tuple[int, int]]:
+        """在环面上一次推进2^j代，返回新的存活细胞集合"""
+        if len(self._nodes) > self.max_cache_nodes:
+            self.clear_cache()
+
+        # 结果窗口需要放进节点中心（边长2^(level-1)），且2^j <= 2^(level-2)
+        level = max(j + 2, max(height, width).bit_length() + 1, 2)
+        offset = 1 << (level - 2)
+        root = self.build_torus(live_cells, height, width, level, (-offset, -offset))
+        return self.collect_cells(self.step(root, j), height, width)
+
+    def advance_pow2(self, grid: Grid, j: int) -> None:
+        """把网格一次推进2^j代"""
+        self._check_grid(grid)
+        new_cells = self.advance_torus(grid.get_live_cells(), grid.height, grid.width, j)
+        self._export(grid, new_cells)
+
+    def fast_forward(self, grid: Grid, generations: int) -> None:
+        """把网格推进任意代数，按二进制位拆分为若干次2^j代跳跃"""
+        self._check_grid(grid)
+        cells = grid.get_live_cells()
+        j = 0
+        while generations:
+            if generations & 1:
+                cells = self.advance_torus(cells, grid.height, grid.width, j)
+            generations >>= 1
+            j += 1
+        self._export(grid, cells)
+
+    def _check_grid(self, grid: Grid) -> None:
+        """HashLife只能精确模拟周期性边界（环面可以无限平铺）"""
+        if grid.boundary_type != BOUNDARY_TYPES['periodic']:
+            raise ValueError("HashLife 只支持周期性边界")
+
+    def _export(self, grid: Grid, new_cells: Set[Tuple[int, int]]) -> None:
+        """把存活细胞集合写回网格"""
+        old_cells = grid.get_live_cells()
+        apply_changes(grid, new_cells - old_cells, old_cells - new_cells)
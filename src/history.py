@@ -0,0 +1,179 @@
+# 演化历史记录模块：只追加的历史文件，关键帧加逐代增量，支持按世代回放
+import bisect
+import mmap
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import List, Tuple, Set, Dict, Optional
+from src.grid import Grid
+from src.stream_codec import (
+    FRAME_HEADER, FRAME_KEYFRAME, FRAME_DELTA,
+    keyframe_payload, delta_payload, decode_keyframe, decode_delta
+)
+from src.config import HISTORY_KEYFRAME_INTERVAL, HISTORY_MAX_BYTES
+
+# 索引文件每项：关键帧世代、关键帧在历史文件中的偏移（小端uint64）
+INDEX_ENTRY = struct.Struct('<QQ')
+
+def remove_history(path: str) -> None:
+    """删除历史文件及其索引文件（不存在时忽略）"""
+    for file_path in (path, path + '.idx'):
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            pass
+
+def clear_history_dir(directory: str) -> None:
+    """删除目录中的全部历史文件；会话只存在于内存中，启动时目录里的文件都不属于任何会话"""
+    if not os.path.isdir(directory):
+        return
+    for name in os.listdir(directory):
+        if name.endswith('.hist') or name.endswith('.hist.idx'):
+            remove_history(os.path.join(directory, name[:-4] if name.endswith('.idx') else name))
+
+class HistoryRecorder:
+    def __init__(self, path: str, keyframe_interval: int = HISTORY_KEYFRAME_INTERVAL,
+                 max_bytes: int = HISTORY_MAX_BYTES):
+        """打开（或创建）历史文件；记录格式与增量流相同（帧头 + 负载），负载经zlib压缩"""
+        self.path = path
+        self.index_path = path + '.idx'
+        self.keyframe_interval = keyframe_interval
+        self.max_bytes = max_bytes
+        # 关键帧的世代与偏移，按写入顺序（即世代顺序）排列
+        self.keyframe_generations: List[int] = []
+        self.keyframe_offsets: List[int] = []
+        self.width = None
+        self.last_generation = None
+        self.last_keyframe = None
+        # 累计记录耗时，用于衡量记录开销
+        self.records = 0
+        self.record_seconds = 0.0
+        self._lock = threading.Lock()
+
+        self._file = open(path, 'ab')
+        self._index = open(self.index_path, 'ab')
+        self._load_index()
+        if self.keyframe_generations:
+            self.last_generation = self.keyframe_generations[-1]
+
+    def _load_index(self) -> None:
+        """读取已有的关键帧索引；历史文件在最后一个关键帧之后可能还有增量，重新打开后从关键帧开始"""
+        with open(self.index_path, 'rb') as f:
+            data = f.read()
+        size = self._file.tell()
+        for offset in range(0, len(data) - len(data) % INDEX_ENTRY.size, INDEX_ENTRY.size):
+            generation, position = INDEX_ENTRY.unpack_from(data, offset)
+            if position < size:
+                self.keyframe_generations.append(generation)
+                self.keyframe_offsets.append(position)
+
+    def record(self, generation: int, grid: Grid, born: Optional[Set[Tuple[int, int]]] = None,
+               died: Optional[Set[Tuple[int, int]]] = None) -> None:
+        """记录一代；没有增量、间隔到期、或网格被整体修改（born为None）时写关键帧"""
+        start = time.perf_counter()
+        with self._lock:
+            if self.last_generation is not None and generation < self.last_generation:
+                # 世代回退说明开始了新的一局，从头记录
+                self._truncate()
+            if self._file.tell() > self.max_bytes:
+                self._truncate()
+
+            keyframe = (born is None or died is None or self.width != grid.width
+                        or self.last_keyframe is None
+                        or generation - self.last_keyframe >= self.keyframe_interval)
+            if keyframe:
+                offset = self._file.tell()
+                self._write(FRAME_KEYFRAME, generation, keyframe_payload(grid.live_cells, grid.width, grid.height))
+                self.keyframe_generations.append(generation)
+                self.keyframe_offsets.append(offset)
+                self._index.write(INDEX_ENTRY.pack(generation, offset))
+                self.width = grid.width
+                self.last_keyframe = generation
+            else:
+                self._write(FRAME_DELTA, generation, delta_payload(born, died, grid.width))
+            self.last_generation = generation
+        self.records += 1
+        self.record_seconds += time.perf_counter() - start
+
+    def _write(self, frame_type: int, generation: int, payload: bytes) -> None:
+        compressed = zlib.compress(payload, 1)
+        self._file.write(FRAME_HEADER.pack(frame_type, generation, len(compressed)) + compressed)
+
+    def _truncate(self) -> None:
+        """清空历史文件和索引"""
+        self._file.truncate(0)
+        self._file.seek(0)
+        self._index.truncate(0)
+        self._index.seek(0)
+        self.keyframe_generations.clear()
+        self.keyframe_offsets.clear()
+        self.width = None
+        self.last_generation = None
+        self.last_keyframe = None
+
+    def seek(self, generation: int) -> Optional[Tuple[int, int, int, Set[Tuple[int, int]]]]:
+        """恢复到不晚于generation的最近一条记录：取最近的关键帧再依次回放增量
+
+        返回(实际世代, 宽, 高, 存活细胞)，没有记录时返回None
+        """
+        with self._lock:
+            index = bisect.bisect_right(self.keyframe_generations, generation) - 1
+            if index < 0:
+                return None
+            offset = self.keyframe_offsets[index]
+            self._file.flush()
+            size = self._file.tell()
+
+        with open(self.path, 'rb') as f:
+            with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mapped:
+                return self._replay(mapped, offset, size, generation)
+
+    def _replay(self, mapped: mmap.mmap, offset: int, size: int,
+                generation: int) -> Tuple[int, int, int, Set[Tuple[int, int]]]:
+        current = None
+        width = height = 0
+        cells: Set[Tuple[int, int]] = set()
+        while offset + FRAME_HEADER.size <= size:
+            frame_type, frame_generation, length = FRAME_HEADER.unpack_from(mapped, offset)
+            if current is not None and frame_generation > generation:
+                break
+            payload = zlib.decompress(mapped[offset + FRAME_HEADER.size:offset + FRAME_HEADER.size + length])
+            if frame_type == FRAME_KEYFRAME:
+                width, height, cells = decode_keyframe(payload)
+            else:
+                born, died = decode_delta(payload, width)
+                cells.difference_update(died)
+                cells.update(born)
+            current = frame_generation
+            offset += FRAME_HEADER.size + length
+        return current, width, height, cells
+
+    def generations(self) -> Tuple[Optional[int], Optional[int]]:
+        """返回可回放的(最早世代, 最新世代)"""
+        if not self.keyframe_generations:
+            return None, None
+        return self.keyframe_generations[0], self.last_generation
+
+    def size(self) -> int:
+        """历史文件当前大小（字节）"""
+        with self._lock:
+            return self._file.tell()
+
+    def close(self) -> None:
+        """关闭历史文件"""
+        with self._lock:
+            self._file.close()
+            self._index.close()
+
+    def delete(self) -> None:
+        """关闭并删除历史文件"""
+        self.close()
+        remove_history(self.path)
+
+    def flush(self) -> None:
+        """把缓冲的记录写入磁盘"""
+        with self._lock:
+            self._file.flush()
+            self._index.flush()
@@ -0,0 +1,96 @@
+# 演化指标模块：分阶段计时、计数与滚动分位数
+import threading
+from collections import deque
+from typing import List, Tuple, Set, Dict, Optional
+from src.config import METRICS_WINDOW, METRICS_QUANTILES, METRICS_PREFIX
+
+# 计数器说明，导出Prometheus文本时作为HELP
+COUNTER_HELP = {
+    'generations': '已推进的代数',
+    'cells_visited': '演化引擎访问过的细胞数',
+    'groups_found': '群体检测找到的群体数',
+    'species_evolved': '演化到下一阶段的物种数',
+    'species_devolved': '退化到上一阶段的物种数',
+    'analyses': '群体与物种结算次数',
+}
+
+class Metrics:
+    def __init__(self, window: int = METRICS_WINDOW):
+        """初始化指标，每个阶段保留最近window次耗时用于计算分位数"""
+        self.window = window
+        self.phase_totals: Dict[str, float] = {}
+        self.phase_counts: Dict[str, int] = {}
+        self.phase_samples: Dict[str, deque] = {}
+        self.counters: Dict[str, int] = {name: 0 for name in COUNTER_HELP}
+        # 多个会话线程可能共用同一份指标
+        self._lock = threading.Lock()
+
+    def observe(self, phase: str, seconds: float) -> None:
+        """记录某个阶段的一次耗时"""
+        with self._lock:
+            samples = self.phase_samples.get(phase)
+            if samples is None:
+                samples = self.phase_samples[phase] = deque(maxlen=self.window)
+                self.phase_totals[phase] = 0.0
+                self.phase_counts[phase] = 0
+            samples.append(seconds)
+            self.phase_totals[phase] += seconds
+            self.phase_counts[phase] += 1
+
+    def count(self, name: str, value: int = 1) -> None:
+        """累加计数器"""
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def percentiles(self, phase: str, quantiles: List[float] = METRICS_QUANTILES) -> Dict[float, float]:
+        """某个阶段最近若干次耗时的分位数（秒）"""
+        with self._lock:
+            samples = sorted(self.phase_samples.get(phase, ()))
+        if not samples:
+            return {q: 0.0 for q in quantiles}
+        return {q: samples[min(len(samples) - 1, int(q * len(samples)))] for q in quantiles}
+
+    def summary(self) -> Dict:
+        """所有阶段与计数器的汇总"""
+        with self._lock:
+            phases = list(self.phase_samples)
+            counters = dict(self.counters)
+            totals = dict(self.phase_totals)
+            counts = dict(self.phase_counts)
+        return {
+            'phases': {
+                phase: {
+                    'count': counts[phase],
+                    'total_seconds': totals[phase],
+                    'percentiles': self.percentiles(phase),
+                }
+                for phase in phases
+            },
+            'counters': counters,
+        }
+
+    def reset(self) -> None:
+        """清空全部指标"""
+        with self._lock:
+            self.phase_totals.clear()
+            self.phase_counts.clear()
+            self.phase_samples.clear()
+            self.counters = {name: 0 for name in COUNTER_HELP}
+
+    def to_prometheus(self, prefix: str = METRICS_PREFIX) -> str:
+        """导出为Prometheus文本格式：阶段耗时为summary，计数器为counter"""
+        summary = self.summary()
+        lines = [
+            f'# HELP {prefix}_phase_seconds 演化各阶段耗时（秒），分位数基于最近的样本',
+            f'# TYPE {prefix}_phase_seconds summary',
+        ]
+        for phase, stats in sorted(summary['phases'].items()):
+            for q, value in stats['percentiles'].items():
+                lines.append(f'{prefix}_phase_seconds{{phase="{phase}",quantile="{q}"}} {value:.9f}')
+            lines.append(f'{prefix}_phase_seconds_sum{{phase="{phase}"}} {stats["total_seconds"]:.9f}')
+            lines.append(f'{prefix}_phase_seconds_count{{phase="{phase}"}} {stats["count"]}')
+        for name, value in sorted(summary['counters'].items()):
+            lines.append(f'# HELP {prefix}_{name}_total {COUNTER_HELP.get(name, name)}')
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,276 @@
+# 多进程条带分解模块：把网格按行切成条带，由进程池并行推进和标记群体
+import atexit
+import multiprocessing
+import os
+import sys
+import weakref
+from multiprocessing import shared_memory
+from typing import List, Tuple, Set, Dict, Optional
+from src.rules import Rule, CONWAY
+from src.config import PARALLEL_WORKERS, PARALLEL_START_METHOD
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖
+    np = None
+
+# 所有共享网格共用一个进程池
+_pool = None
+_pool_workers = 0
+
+# 工作进程中已附加的共享内存（按名称缓存，每个进程只附加一次）
+_attached: Dict[str, shared_memory.SharedMemory] = {}
+_MAX_ATTACHED = 8  # 超出时关闭最早附加的，已被释放的网格不会一直占用映射
+
+
+def worker_count(workers: Optional[int] = PARALLEL_WORKERS) -> int:
+    """实际使用的工作进程数，未配置时为CPU核数"""
+    return max(1, workers or os.cpu_count() or 1)
+
+
+def get_pool(workers: Optional[int] = PARALLEL_WORKERS) -> 'multiprocessing.pool.Pool':
+    """获取共用的进程池，首次调用时创建；需要更多进程时重建"""
+    global _pool, _pool_workers
+    workers = worker_count(workers)
+    if _pool is None or _pool_workers < workers:
+        close_pool()
+        context = multiprocessing.get_context(PARALLEL_START_METHOD)
+        _pool = context.Pool(workers)
+        _pool_workers = workers
+    return _pool
+
+
+def close_pool() -> None:
+    """结束进程池"""
+    global _pool, _pool_workers
+    if _pool is not None:
+        _pool.terminate()
+        _pool.join()
+        _pool = None
+        _pool_workers = 0
+
+
+atexit.register(close_pool)
+
+
+def split_strips(height: int, count: int) -> List[Tuple[int, int]]:
+    """把height行尽量均匀地切成count个条带，返回各条带的[起始行, 结束行)"""
+    count = max(1, min(count, height))
+    base, extra = divmod(height, count)
+    strips = []
+    start = 0
+    for index in range(count):
+        end = start + base + (1 if index < extra else 0)
+        strips.append((start, end))
+        start = end
+    return strips
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """在工作进程中附加共享内存；只有创建者负责释放（unlink）
+
+    3.13起附加时直接不登记；更早的版本无法关闭登记，但工作进程与创建者共用同一个
+    resource_tracker，其登记表是集合，重复登记不会产生第二条记录，所以这里也不注销"""
+    block = _attached.get(name)
+    if block is None:
+        if sys.version_info >= (3, 13):
+            block = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            block = shared_memory.SharedMemory(name=name)
+        if len(_attached) >= _MAX_ATTACHED:
+            _attached.pop(next(iter(_attached))).close()
+        _attached[name] = block
+    return block
+
+
+def _view(name: str, height: int, width: int) -> 'np.ndarray':
+    return np.ndarray((height, width), dtype=np.uint8, buffer=_attach(name).buf)
+
+
+def _step_strip(current_name: str, next_name: str, height: int, width: int,
+                start: int, end: int, periodic: bool, rule_table: Tuple[int, ...]) -> int:
+    """工作进程：读取条带及上下各一行光环，把条带的下一代写入另一块共享内存，返回存活细胞数"""
+    current = _view(current_name, height, width)
+    rows = end - start
+    padded = np.zeros((rows + 2, width + 2), dtype=np.uint8)
+    padded[1:-1, 1:-1] = current[start:end]
+    # 光环行：相邻条带的边界行，周期性边界在首尾条带之间环绕
+    if periodic:
+        padded[0, 1:-1] = current[(start - 1) % height]
+        padded[-1, 1:-1] = current[end % height]
+        padded[:, 0] = padded[:, -2]
+        padded[:, -1] = padded[:, 1]
+    else:
+        if start > 0:
+            padded[0, 1:-1] = current[start - 1]
+        if end < height:
+            padded[-1, 1:-1] = current[end]
+
+    neighbors = np.zeros((rows, width), dtype=np.uint8)
+    for dx in (0, 1, 2):
+        for dy in (0, 1, 2):
+            if dx == 1 and dy == 1:
+                continue
+            neighbors += padded[dx:dx + rows, dy:dy + width]
+    # 以 自身状态*9+邻居数 为下标查规则表
+    board = padded[1:-1, 1:-1]
+    new_strip = np.array(rule_table, dtype=np.uint8)[board * 9 + neighbors]
+    _view(next_name, height, width)[start:end] = new_strip
+    return int(new_strip.sum())
+
+
+def _label_strip(name: str, height: int, width: int, start: int, end: int,
+                 periodic: bool) -> Tuple['np.ndarray', 'np.ndarray']:
+    """工作进程：标记条带内的8连通分量（列方向按边界类型环绕，行方向不越过条带）
+
+    返回(存活细胞的全局扁平下标, 对应的条带内分量编号)
+    """
+    strip = _view(name, height, width)[start:end]
+    live = np.flatnonzero(strip)
+    labels = np.full(len(live), -1, dtype=np.int64)
+    position = {int(index): order for order, index in enumerate(live.tolist())}
+    rows = end - start
+    component = 0
+    for order in range(len(live)):
+        if labels[order] >= 0:
+            continue
+        labels[order] = component
+        stack = [int(live[order])]
+        while stack:
+            x, y = divmod(stack.pop(), width)
+            for dx in (-1, 0, 1):
+                neighbor_x = x + dx
+                if not 0 <= neighbor_x < rows:
+                    continue
+                for dy in (-1, 0, 1):
+                    neighbor_y = y + dy
+                    if periodic:
+                        neighbor_y %= width
+                    elif not 0 <= neighbor_y < width:
+                        continue
+                    neighbor = position.get(neighbor_x * width + neighbor_y)
+                    if neighbor is not None and labels[neighbor] < 0:
+                        labels[neighbor] = component
+                        stack.append(neighbor_x * width + neighbor_y)
+        component += 1
+    return live + start * width, labels
+
+
+class SharedBoard:
+    def __init__(self, width: int, height: int, workers: Optional[int] = PARALLEL_WORKERS):
+        """在共享内存中分配当前代与下一代两块uint8网格，工作进程按条带读写"""
+        if np is None:
+            raise ImportError("SharedBoard 需要安装 numpy")
+        self.width = width
+        self.height = height
+        self.workers = worker_count(workers)
+        self.strips = split_strips(height, self.workers)
+        self._blocks = [shared_memory.SharedMemory(create=True, size=max(1, width * height))
+                        for _ in range(2)]
+        self._current = 0
+        # 对象被回收或进程退出时释放共享内存
+        self._finalizer = weakref.finalize(self, SharedBoard._release, self._blocks)
+
+    def get_size(self) -> Tuple[int, int]:
+        """获取网格大小"""
+        return (self.height, self.width)
+
+    @staticmethod
+    def _release(blocks: List[shared_memory.SharedMemory]) -> None:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    def close(self) -> None:
+        """释放共享内存"""
+        self._finalizer()
+
+    @property
+    def array(self) -> 'np.ndarray':
+        """当前代网格（共享内存上的视图）"""
+        block = self._blocks[self._current]
+        return np.ndarray((self.height, self.width), dtype=np.uint8, buffer=block.buf)
+
+    def load(self, board: 'np.ndarray') -> None:
+        """写入当前代网格"""
+        self.array[:] = board
+
+    def step(self, periodic: bool, generations: int = 1, rule: Rule = CONWAY) -> None:
+        """推进若干代：每代各条带并行计算，全部完成后交换两块缓冲区"""
+        pool = get_pool(self.workers)
+        for _ in range(generations):
+            current = self._blocks[self._current].name
+            following = self._blocks[1 - self._current].name
+            pool.starmap(_step_strip, [(current, following, self.height, self.width, start, end,
+                                        periodic, rule.table)
+                                       for (start, end) in self.strips])
+            self._current = 1 - self._current
+
+    def label_arrays(self, periodic: bool) -> Tuple['np.ndarray', 'np.ndarray']:
+        """并行标记各条带内的连通分量，再沿条带接缝合并跨条带的群体
+
+        返回(存活细胞的扁平下标, 对应的群体编号0..k-1)两个数组，不在主进程中逐格构造集合
+        """
+        pool = get_pool(self.workers)
+        name = self._blocks[self._current].name
+        results = pool.starmap(_label_strip, [(name, self.height, self.width, start, end, periodic)
+                                              for (start, end) in self.strips])
+
+        # 各条带的分量编号加上偏移，变成全局编号
+        offsets = []
+        total = 0
+        for _, labels in results:
+            offsets.append(total)
+            total += int(labels.max()) + 1 if len(labels) else 0
+        parent = list(range(total))
+
+        def find(label: int) -> int:
+            while parent[label] != label:
+                parent[label] = parent[parent[label]]
+                label = parent[label]
+            return label
+
+        label_rows = np.full((self.height, self.width), -1, dtype=np.int64)
+        for (cells, labels), offset in zip(results, offsets):
+            label_rows.ravel()[cells] = labels + offset
+
+        # 接缝：每个条带的末行与下一条带的首行；周期性边界还有最后一行与第0行
+        seams = [end - 1 for (_, end) in self.strips[:-1]]
+        if periodic and self.height > 1:
+            seams.append(self.height - 1)
+        for row in seams:
+            upper = label_rows[row]
+            lower = label_rows[(row + 1) % self.height]
+            for dy in (-1, 0, 1):
+                if periodic:
+                    shifted = np.roll(lower, -dy)
+                    columns = np.arange(self.width)
+                else:
+                    columns = np.arange(max(0, -dy), self.width - max(0, dy))
+                    shifted = lower[columns + dy]
+                top = upper[columns]
+                mask = (top >= 0) & (shifted >= 0)
+                for a, b in zip(top[mask].tolist(), shifted[mask].tolist()):
+                    root_a, root_b = find(a), find(b)
+                    if root_a != root_b:
+                        parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        if total == 0:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        # 只对分量编号（而非细胞）求根，再用数组下标把每个细胞映射到所属群体
+        roots = np.array([find(label) for label in range(total)], dtype=np.int64)
+        cells = np.concatenate([cells for cells, _ in results])
+        labels = np.concatenate([labels + offset for (_, labels), offset in zip(results, offsets)])
+        _, group_ids = np.unique(roots[labels], return_inverse=True)
+        return cells, group_ids.reshape(-1)
+
+    def label(self, periodic: bool) -> List[Set[Tuple[int, int]]]:
+        """与label_arrays相同，结果转换为细胞坐标集合的列表"""
+        cells, group_ids = self.label_arrays(periodic)
+        if len(cells) == 0:
+            return []
+        order = np.argsort(group_ids, kind='stable')
+        xs, ys = np.divmod(cells[order], self.width)
+        bounds = np.flatnonzero(np.diff(group_ids[order])) + 1
+        return [set(zip(x.tolist(), y.tolist()))
+                for x, y in zip(np.split(xs, bounds), np.split(ys, bounds))]
@@ -0,0 +1,148 @@
+# 图案文件模块：读写标准的RLE与.cells（plaintext）格式
+import os
+import re
+from typing import List, Tuple, Set, Dict, Iterable, Optional
+from src.config import DEFAULT_RULE
+
+# 坐标约定与Grid一致：(x, y) = (行, 列)；RLE/.cells文件中的x为列、y为行
+RLE_LINE_LENGTH = 70
+
+RLE_TOKEN = re.compile(r'(\d*)([a-zA-Z.$!])')
+
+def _normalize(cells: Iterable[Tuple[int, int]]) -> Tuple[List[Tuple[int, int]], int, int]:
+    """把图案平移到左上角为原点，返回(细胞, 行数, 列数)"""
+    cells = list(cells)
+    if not cells:
+        return [], 0, 0
+    min_x = min(x for x, _ in cells)
+    min_y = min(y for _, y in cells)
+    cells = [(x - min_x, y - min_y) for (x, y) in cells]
+    return cells, max(x for x, _ in cells) + 1, max(y for _, y in cells) + 1
+
+def parse_rle(text: str, max_rows: Optional[int] = None, max_cols: Optional[int] = None) -> List[Tuple[int, int]]:
+    """解析RLE格式，返回存活细胞坐标列表
+
+    给出max_rows/max_cols时丢弃范围之外的细胞：游程按范围截断后再展开，
+    很短的文本（如'999999999o!'）也不会生成超出目标网格的巨大列表
+    """
+    cells = []
+    row = col = 0
+    body = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        if line.startswith('x') and '=' in line and not body:
+            continue  # 头部行 x = m, y = n, rule = ...
+        body.append(line)
+
+    for count, tag in RLE_TOKEN.findall(''.join(body)):
+        count = int(count) if count else 1
+        if tag == '!':
+            break
+        if tag == '$':
+            row += count
+            col = 0
+            if max_rows is not None and row >= max_rows:
+                break
+        elif tag == 'b' or tag == '.':
+            col += count
+        else:
+            # 'o'以及多状态格式中的其他字母都视为存活
+            end = col + count if max_cols is None else min(col + count, max_cols)
+            if max_rows is None or row < max_rows:
+                cells.extend((row, y) for y in range(col, end))
+            col += count
+    return cells
+
+def format_rle(cells: Iterable[Tuple[int, int]], rule: str = DEFAULT_RULE) -> str:
+    """把存活细胞编码为RLE格式"""
+    cells, height, width = _normalize(cells)
+    rows: Dict[int, List[int]] = {}
+    for (x, y) in cells:
+        rows.setdefault(x, []).append(y)
+
+    tokens = []
+    pending_newlines = 0
+    for x in range(height):
+        columns = sorted(set(rows.get(x, [])))
+        if not columns:
+            pending_newlines += 1
+            continue
+        if tokens:
+            tokens.append(_run(pending_newlines + 1, '$'))
+        pending_newlines = 0
+        col = 0
+        index = 0
+        while index < len(columns):
+            start = columns[index]
+            end = start
+            while index + 1 < len(columns) and columns[index + 1] == end + 1:
+                index += 1
+                end += 1
+            if start > col:
+                tokens.append(_run(start - col, 'b'))
+            tokens.append(_run(end - start + 1, 'o'))
+            col = end + 1
+            index += 1
+    tokens.append('!')
+
+    lines = [f'x = {width}, y = {height}, rule = {rule}']
+    line = ''
+    for token in tokens:
+        if len(line) + len(token) > RLE_LINE_LENGTH:
+            lines.append(line)
+            line = ''
+        line += token
+    lines.append(line)
+    return '\n'.join(lines) + '\n'
+
+def _run(count: int, tag: str) -> str:
+    return f'{count}{tag}' if count > 1 else tag
+
+def parse_cells(text: str, max_rows: Optional[int] = None, max_cols: Optional[int] = None) -> List[Tuple[int, int]]:
+    """解析.cells（plaintext）格式，'O'或'*'为存活，'.'为死亡，'!'开头为注释；范围参数同parse_rle"""
+    cells = []
+    row = 0
+    for line in text.splitlines():
+        if line.startswith('!'):
+            continue
+        if max_rows is not None and row >= max_rows:
+            break
+        cells.extend((row, col) for col, char in enumerate(line.rstrip()[:max_cols]) if char in 'O*')
+        row += 1
+    return cells
+
+def format_cells(cells: Iterable[Tuple[int, int]], name: Optional[str] = None) -> str:
+    """把存活细胞编码为.cells格式"""
+    cells, height, width = _normalize(cells)
+    live = set(cells)
+    lines = [f'!Name: {name}'] if name else []
+    for x in range(height):
+        lines.append(''.join('O' if (x, y) in live else '.' for y in range(width)).rstrip('.'))
+    return '\n'.join(lines) + '\n'
+
+PATTERN_PARSERS = {'.rle': parse_rle, '.cells': parse_cells}
+
+def read_pattern(path: str, origin: Tuple[int, int] = (0, 0)) -> List[Tuple[int, int]]:
+    """按扩展名读取图案文件，平移到origin后可直接传给Grid.load_pattern"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in PATTERN_PARSERS:
+        raise ValueError(f"不支持的图案格式: {extension}")
+    with open(path, encoding='utf-8') as f:
+        cells = PATTERN_PARSERS[extension](f.read())
+    return [(x + origin[0], y + origin[1]) for (x, y) in cells]
+
+def write_pattern(path: str, cells: Iterable[Tuple[int, int]], name: Optional[str] = None) -> None:
+    """按扩展名写出图案文件"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.rle':
+        text = format_rle(cells)
+        if name:
+            text = f'#N {name}\n' + text
+    elif extension == '.cells':
+        text = format_cells(cells, name)
+    else:
+        raise ValueError(f"不支持的图案格式: {extension}")
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
@@ -0,0 +1,173 @@
+# 存档模块：带版本号的二进制存档，读取时使用内存映射
+import mmap
+import os
+import struct
+import sys
+import zlib
+from array import array
+from typing import List, Tuple, Set, Dict, NamedTuple, Iterable, Union
+from src.grid import Grid
+from src.species_manager import Species
+from src.rules import compile_rule
+from src.stream_codec import INDEX_TYPECODE
+from src.config import BOUNDARY_TYPES, DEFAULT_RULE
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖，缺失时逐个细胞编解码
+    np = None
+
+MAGIC = b'GOLS'
+FORMAT_VERSION = 2
+READABLE_VERSIONS = (1, 2)  # 版本1没有规则段，读取时按默认规则处理
+
+# 文件头：魔数、版本、边界类型、宽、高、世代、下一个物种编号、物种数、正文CRC32（小端）
+HEADER = struct.Struct('<4sHBxIIQIII')
+# 物种表项：编号、阶段、生存时间、演化进度、细胞数，后接细胞的uint32扁平下标
+SPECIES_HEADER = struct.Struct('<IBddI')
+# 规则段（版本2起，位于物种表之后）：B/S记法的字节长度，后接ASCII文本
+RULE_HEADER = struct.Struct('<H')
+
+BOUNDARY_CODES = {BOUNDARY_TYPES['fixed']: 0, BOUNDARY_TYPES['periodic']: 1}
+BOUNDARY_NAMES = {code: name for name, code in BOUNDARY_CODES.items()}
+
+Buffer = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+class SavedState(NamedTuple):
+    """读出的存档内容"""
+    grid: Grid
+    species: List[Species]
+    generation: int
+    next_species_id: int
+    rule: str = DEFAULT_RULE
+
+def pack_board(grid: Grid) -> bytes:
+    """把网格按行优先顺序压成位图，每个细胞1位（字节内低位在前）"""
+    if np is not None:
+        board = np.asarray(grid.grid, dtype=np.uint8).reshape(-1)
+        return np.packbits(board, bitorder='little').tobytes()
+    width = grid.width
+    bits = bytearray((grid.width * grid.height + 7) // 8)
+    for (x, y) in grid.live_cells:
+        index = x * width + y
+        bits[index >> 3] |= 1 << (index & 7)
+    return bytes(bits)
+
+def unpack_board(grid: Grid, buffer: Buffer, offset: int) -> None:
+    """从位图恢复网格，numpy可用时直接在缓冲区上解包，不复制位图"""
+    width, height = grid.width, grid.height
+    size = (width * height + 7) // 8
+    if np is not None:
+        bits = np.frombuffer(buffer, dtype=np.uint8, count=size, offset=offset)
+        board = np.unpackbits(bits, count=width * height, bitorder='little').reshape(height, width)
+        grid.grid = board.tolist()
+        xs, ys = np.nonzero(board)
+        grid.live_cells = set(zip(xs.tolist(), ys.tolist()))
+        grid.version += 1
+        grid.rehash()
+        return
+    view = memoryview(buffer)[offset:offset + size]
+    for byte_index, byte in enumerate(view):
+        while byte:
+            low_bit = byte & -byte
+            grid.set_cell(*divmod(byte_index * 8 + low_bit.bit_length() - 1, width), 1)
+            byte ^= low_bit
+
+def _pack_indices(cells: Iterable[Tuple[int, int]], width: int) -> bytes:
+    indices = array(INDEX_TYPECODE, sorted(x * width + y for (x, y) in cells))
+    if sys.byteorder == 'big':
+        indices.byteswap()
+    return indices.tobytes()
+
+def _unpack_indices(buffer: Buffer, offset: int, count: int, width: int, height: int) -> Set[Tuple[int, int]]:
+    indices = array(INDEX_TYPECODE)
+    indices.frombytes(buffer[offset:offset + 4 * count])
+    if sys.byteorder == 'big':
+        indices.byteswap()
+    if indices and max(indices) >= width * height:
+        raise ValueError("存档中的物种细胞超出网格范围")
+    return {divmod(index, width) for index in indices}
+
+def _require(buffer: Buffer, offset: int, size: int) -> None:
+    """确认从offset起还有size字节，否则视为存档不完整"""
+    if offset + size > len(buffer):
+        raise ValueError("存档文件不完整")
+
+def dumps(grid: Grid, species_list: List[Species] = (), generation: int = 0,
+          next_species_id: int = 0, rule: str = DEFAULT_RULE) -> bytes:
+    """把网格、物种表和演化规则编码为存档字节串"""
+    parts = [pack_board(grid)]
+    for species in species_list:
+        parts.append(SPECIES_HEADER.pack(species.species_id, species.stage, species.survival_time,
+                                         species.evolution_progress, len(species.group)))
+        parts.append(_pack_indices(species.group, grid.width))
+    rule_bytes = rule.encode('ascii')
+    parts.append(RULE_HEADER.pack(len(rule_bytes)))
+    parts.append(rule_bytes)
+    body = b''.join(parts)
+
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, BOUNDARY_CODES[grid.boundary_type],
+                         grid.width, grid.height, generation, next_species_id,
+                         len(species_list), zlib.crc32(body))
+    return header + body
+
+def loads(buffer: Buffer) -> SavedState:
+    """解析存档字节串（可以是内存映射）；任何格式错误都抛出ValueError
+
+    校验和只覆盖正文，所以头部字段以及正文中的每个长度、偏移和下标都要单独检查"""
+    if len(buffer) < HEADER.size:
+        raise ValueError("存档文件不完整")
+    (magic, version, boundary, width, height, generation, next_species_id,
+     species_count, checksum) = HEADER.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError("不是有效的存档文件")
+    if version not in READABLE_VERSIONS:
+        raise ValueError(f"不支持的存档版本: {version}")
+    if zlib.crc32(memoryview(buffer)[HEADER.size:]) != checksum:
+        raise ValueError("存档校验失败，文件可能已损坏")
+    if boundary not in BOUNDARY_NAMES:
+        raise ValueError(f"未知的边界类型: {boundary}")
+    # 先确认位图完整再创建网格，损坏的宽高不会导致分配巨大的网格
+    _require(buffer, HEADER.size, (width * height + 7) // 8)
+
+    grid = Grid(width=width, height=height, boundary_type=BOUNDARY_NAMES[boundary])
+    offset = HEADER.size
+    unpack_board(grid, buffer, offset)
+    offset += (width * height + 7) // 8
+
+    species_list = []
+    for _ in range(species_count):
+        _require(buffer, offset, SPECIES_HEADER.size)
+        species_id, stage, survival_time, evolution_progress, count = SPECIES_HEADER.unpack_from(buffer, offset)
+        offset += SPECIES_HEADER.size
+        _require(buffer, offset, 4 * count)
+        species = Species(_unpack_indices(buffer, offset, count, width, height), stage, species_id)
+        species.survival_time = survival_time
+        species.evolution_progress = evolution_progress
+        species_list.append(species)
+        offset += 4 * count
+
+    rule = DEFAULT_RULE
+    if version >= 2:
+        _require(buffer, offset, RULE_HEADER.size)
+        (length,) = RULE_HEADER.unpack_from(buffer, offset)
+        offset += RULE_HEADER.size
+        _require(buffer, offset, length)
+        rule = bytes(buffer[offset:offset + length]).decode('ascii')
+        compile_rule(rule)  # 无法解析或B0规则时抛出ValueError
+    return SavedState(grid, species_list, generation, next_species_id, rule)
+
+def save(path: str, grid: Grid, species_list: List[Species] = (), generation: int = 0,
+         next_species_id: int = 0, rule: str = DEFAULT_RULE) -> None:
+    """写入存档文件；先写临时文件再替换，中途失败不会破坏旧存档"""
+    data = dumps(grid, species_list, generation, next_species_id, rule)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+def load(path: str) -> SavedState:
+    """读取存档文件：内存映射后直接解析，不先把整个文件读入内存"""
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return loads(mapped)
@@ -0,0 +1,66 @@
+# 规则模块：解析B/S记法的类生命规则，并编译为按(自身状态, 邻居数)查表的数组
+import re
+from functools import lru_cache
+from typing import List, Tuple, Set, Dict, FrozenSet, NamedTuple
+from src.config import LIFE_RULES, DEFAULT_RULE
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖
+    np = None
+
+RULE_PATTERN = re.compile(r'B([0-8]*)/S([0-8]*)', re.IGNORECASE)
+SB_PATTERN = re.compile(r'([0-8]*)/([0-8]*)')  # 传统的“存活/出生”记法，例如 23/3
+
+class Rule(NamedTuple):
+    """编译后的规则：table[自身状态 * 9 + 存活邻居数]为下一代状态"""
+    birth: FrozenSet[int]
+    survive: FrozenSet[int]
+    table: Tuple[int, ...]
+
+    @property
+    def notation(self) -> str:
+        """规范的B/S记法"""
+        return 'B' + ''.join(map(str, sorted(self.birth))) + '/S' + ''.join(map(str, sorted(self.survive)))
+
+    @property
+    def is_conway(self) -> bool:
+        """是否为标准康威规则"""
+        return self.birth == {3} and self.survive == {2, 3}
+
+    def array(self) -> 'np.ndarray':
+        """查找表的uint8数组形式，向量化引擎用 array[board * 9 + neighbors] 一次得到整张网格"""
+        return _rule_array(self.table)
+
+    def next_state(self, state: int, live_neighbors: int) -> int:
+        """单个细胞的下一代状态"""
+        return self.table[state * 9 + live_neighbors]
+
+@lru_cache(maxsize=None)
+def _rule_array(table: Tuple[int, ...]) -> 'np.ndarray':
+    array = np.array(table, dtype=np.uint8)
+    array.setflags(write=False)
+    return array
+
+@lru_cache(maxsize=64)
+def compile_rule(text: str = DEFAULT_RULE) -> Rule:
+    """把预设名称（如 highlife）或B/S记法（如 B36/S23、23/3）编译为规则"""
+    text = LIFE_RULES.get(text.strip().lower(), text).strip()
+    match = RULE_PATTERN.fullmatch(text)
+    if match:
+        birth_digits, survive_digits = match.groups()
+    else:
+        match = SB_PATTERN.fullmatch(text)
+        if not match:
+            raise ValueError(f"无法解析的规则: {text}")
+        survive_digits, birth_digits = match.groups()
+
+    birth = frozenset(int(digit) for digit in birth_digits)
+    survive = frozenset(int(digit) for digit in survive_digits)
+    if 0 in birth:
+        # B0会让无限的空白背景每代翻转，稀疏引擎和固定边界都无法表示
+        raise ValueError("不支持包含B0的规则")
+    table = tuple(int(count in birth) for count in range(9)) + tuple(int(count in survive) for count in range(9))
+    return Rule(birth, survive, table)
+
+CONWAY = compile_rule(DEFAULT_RULE)
@@ -0,0 +1,117 @@
+# 多会话注册表模块
+import threading
+from collections import OrderedDict
+from typing import List, Tuple, Set, Dict, Callable, Optional
+from src.game_state import GameState
+from src.config import SESSION_MAX_RESIDENT, SESSION_MAX_RESIDENT_BYTES, SESSION_MAX_TOTAL
+
+class SessionRegistry:
+    def __init__(self, factory: Callable[[], GameState] = GameState,
+                 max_resident: int = SESSION_MAX_RESIDENT,
+                 max_resident_bytes: int = SESSION_MAX_RESIDENT_BYTES,
+                 max_total: int = SESSION_MAX_TOTAL):
+        """初始化会话注册表：活跃会话常驻内存，空闲会话按LRU换出为压缩字节串"""
+        self.factory = factory
+        self.max_resident = max_resident
+        self.max_resident_bytes = max_resident_bytes
+        self.max_total = max_total
+        # 两个字典都按最近使用时间排序，最久未用的在前
+        self.resident: 'OrderedDict[str, GameState]' = OrderedDict()
+        self.evicted: 'OrderedDict[str, bytes]' = OrderedDict()
+        self.evictions = 0
+        self.rehydrations = 0
+        self._lock = threading.Lock()
+    
+    def get(self, session_id: str) -> GameState:
+        """获取会话，不存在时创建，已换出时透明恢复"""
+        with self._lock:
+            return self._get(session_id)
+    
+    def acquire(self, session_id: str) -> GameState:
+        """获取会话并登记租约；归还（release）之前该会话不会被换出"""
+        with self._lock:
+            game = self._get(session_id)
+            game.leases += 1
+            return game
+    
+    def release(self, game: GameState) -> None:
+        """归还acquire得到的租约"""
+        with self._lock:
+            game.leases -= 1
+    
+    def _get(self, session_id: str) -> GameState:
+        game = self.resident.get(session_id)
+        if game is not None:
+            self.resident.move_to_end(session_id)
+            return game
+        
+        data = self.evicted.pop(session_id, None)
+        if data is not None:
+            game = GameState.from_bytes(data)
+            self.rehydrations += 1
+        else:
+            game = self.factory()
+        self.resident[session_id] = game
+        self._enforce_limits(session_id)
+        return game
+    
+    def remove(self, session_id: str) -> None:
+        """销毁会话"""
+        with self._lock:
+            game = self.resident.pop(session_id, None)
+            if game is not None:
+                game.close()
+            self.evicted.pop(session_id, None)
+    
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self.resident or session_id in self.evicted
+    
+    def __len__(self) -> int:
+        return len(self.resident) + len(self.evicted)
+    
+    def _enforce_limits(self, keep: str) -> None:
+        """按数量和内存上限换出最久未用的空闲会话；运行中、有连接或有租约的会话不换出"""
+        usage = {session_id: game.memory_usage() for session_id, game in self.resident.items()}
+        total_bytes = sum(usage.values())
+        
+        for session_id in list(self.resident):
+            if len(self.resident) <= self.max_resident and total_bytes <= self.max_resident_bytes:
+                break
+            game = self.resident[session_id]
+            if session_id == keep or not game.is_idle():
+                continue
+            # 持有写锁序列化，保证没有写操作正在进行；拿不到锁说明会话正忙，跳过
+            if not game.lock.acquire(blocking=False):
+                continue
+            try:
+                self.evicted[session_id] = game.to_bytes()
+                del self.resident[session_id]
+            finally:
+                game.lock.release()
+            game.close()
+            total_bytes -= usage[session_id]
+            self.evictions += 1
+        
+        # 会话总数超限时直接丢弃最久未用的已换出会话
+        while len(self) > self.max_total and self.evicted:
+            self.evicted.popitem(last=False)
+    
+    def metrics(self) -> Dict:
+        """统计常驻会话数量及每个会话占用的字节数"""
+        with self._lock:
+            sessions = [
+                {'id': session_id, 'bytes': game.memory_usage(),
+                 'generation': game.generation, 'is_running': game.is_running}
+                for session_id, game in self.resident.items()
+            ]
+            return {
+                'resident_sessions': len(sessions),
+                'resident_bytes': sum(session['bytes'] for session in sessions),
+                'evicted_sessions': len(self.evicted),
+                'evicted_bytes': sum(len(data) for data in self.evicted.values()),
+                'evictions': self.evictions,
+                'rehydrations': self.rehydrations,
+                'max_resident': self.max_resident,
+                'max_resident_bytes': self.max_resident_bytes,
+                'sessions': sessions,
+            }
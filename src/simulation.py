@@ -0,0 +1,89 @@
+# 后台模拟循环模块
+import logging
+import threading
+import time
+from typing import Callable, Optional
+from src.config import SIMULATION_STEPS_PER_SECOND, SIMULATION_MAX_STEPS_PER_SECOND
+
+logger = logging.getLogger(__name__)
+
+class SimulationLoop:
+    def __init__(self, step: Callable[[], None], steps_per_second: float = SIMULATION_STEPS_PER_SECOND,
+                 on_error: Optional[Callable[[Exception], None]] = None):
+        """初始化后台模拟循环，运行时以目标速率反复调用step；step抛出异常时暂停并调用on_error"""
+        self.step = step
+        self.steps_per_second = steps_per_second
+        self.on_error = on_error
+        self.last_error: Optional[Exception] = None
+        self.steps = 0
+        self._running = threading.Event()
+        # 暂停、关闭或调整速率时打断节拍等待
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """开始（或继续）自动演化"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closed = False
+                self._thread = threading.Thread(target=self._run, name='simulation-loop', daemon=True)
+                self._thread.start()
+            self._running.set()
+
+    def stop(self) -> None:
+        """暂停自动演化，正在执行的一步会先完成"""
+        self._running.clear()
+        self._wakeup.set()
+
+    def close(self) -> None:
+        """结束后台线程"""
+        self._closed = True
+        self._running.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._running.clear()
+
+    def is_running(self) -> bool:
+        """是否正在自动演化"""
+        return self._running.is_set() and not self._closed
+
+    def set_rate(self, steps_per_second: float) -> None:
+        """设置目标速率（代/秒）"""
+        self.steps_per_second = max(0.1, min(float(steps_per_second), SIMULATION_MAX_STEPS_PER_SECOND))
+        self._wakeup.set()
+
+    def _run(self) -> None:
+        """按固定节拍推进；某一步耗时超过节拍时不补步，直接从当前时刻重新计时"""
+        next_time = time.monotonic()
+        while True:
+            if not self._running.is_set():
+                self._running.wait()
+                next_time = time.monotonic()
+            if self._closed:
+                return
+
+            try:
+                self.step()
+            except Exception as error:
+                # 出错后暂停而不是让线程静默退出，is_running如实反映状态，之后仍可重新start
+                logger.exception("后台模拟步骤出错，已暂停")
+                self.last_error = error
+                self._running.clear()
+                if self.on_error is not None:
+                    self.on_error(error)
+                continue
+            self.steps += 1
+
+            self._wakeup.clear()
+            next_time += 1.0 / self.steps_per_second
+            delay = next_time - time.monotonic()
+            if delay > 0:
+                if self._wakeup.wait(delay):
+                    # 被打断（暂停/关闭/调速）时从当前时刻重新计时
+                    next_time = time.monotonic()
+            else:
+                next_time = time.monotonic()
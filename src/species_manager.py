@@ -1,16 +1,26 @@
 # 物种管理模块
-from typing import List, Tuple, Set, Dict
+import sys
+from collections import Counter
+from typing import List, Tuple, Set, Dict, Optional
 from src.grid import Grid
-from src.config import SPECIES_STAGES
+from src.config import SPECIES_STAGES, BOUNDARY_TYPES
 
 class Species:
-    def __init__(self, group: Set[Tuple[int, int]], stage: int = 1):
+    def __init__(self, group: Set[Tuple[int, int]], stage: int = 1, species_id: int = 0):
         """初始化物种"""
+        self.species_id = species_id
         self.group = group
         self.stage = stage
         self.survival_time = 0.0  # 分钟
         self.evolution_progress = 0.0  # 0.0 到 1.0
     
+    def split(self, group: Set[Tuple[int, int]], species_id: int) -> 'Species':
+        """分裂出新物种，新物种继承阶段和生存时间"""
+        child = Species(group, self.stage, species_id)
+        child.survival_time = self.survival_time
+        child.evolution_progress = self.evolution_progress
+        return child
+    
     def update_survival_time(self, delta_time: float) -> None:
         """更新生存时间"""
         self.survival_time += delta_time
@@ -71,19 +81,139 @@ class SpeciesManager:
         """初始化物种管理器"""
         self.grid = grid
         self.species_list: List[Species] = []
+        # 细胞 -> 所属物种，随物种更新重建；既用于位置查询，也用于下一轮按重叠匹配物种身份
+        self._cell_index: Dict[Tuple[int, int], Species] = {}
+        self.next_species_id = 0
     
-    def update(self, groups: List[Set[Tuple[int, int]]], delta_time: float) -> None:
-        """更新所有物种状态"""
-        # 简单实现：重新检测物种
-        self.species_list.clear()
-        
+    def update(self, groups: List[Set[Tuple[int, int]]], delta_time: float, generations: int = 1) -> None:
+        """更新所有物种状态：按细胞重叠把本轮群体匹配到上一轮的物种
+
+        generations为距上次更新经过的代数；没有重叠的群体再按位移匹配，
+        细胞每代最多移动一格，所以群体中心的位移不会超过经过的代数
+        """
+        # 1. 通过细胞索引统计每个群体与上一轮各物种的重叠细胞数，取重叠最多的作为亲代
+        matches = []
         for group in groups:
-            # 基于群体大小和生存时间确定初始阶段
-            stage = self._determine_initial_stage(len(group))
-            species = Species(group, stage)
-            self.species_list.append(species)
-            # 更新生存时间
+            overlaps = Counter()
+            for cell in group:
+                species = self._cell_index.get(cell)
+                if species is not None:
+                    overlaps[species] += 1
+            if overlaps:
+                parent, overlap = max(overlaps.items(),
+                                      key=lambda item: (item[1], item[0].survival_time))
+            else:
+                parent, overlap = None, 0
+            matches.append((group, parent, overlap))
+        
+        # 2. 每个亲代物种由重叠最多的子群体延续身份；合并时以重叠最多的亲代为准
+        heirs: Dict[Species, int] = {}
+        for index, (group, parent, overlap) in enumerate(matches):
+            if parent is not None and (parent not in heirs or overlap > matches[heirs[parent]][2]):
+                heirs[parent] = index
+        self._match_displaced(matches, heirs, generations)
+        
+        species_list = []
+        for index, (group, parent, overlap) in enumerate(matches):
+            if parent is None:
+                # 新出现的群体，基于群体大小确定初始阶段
+                species = Species(group, self._determine_initial_stage(len(group)), self._new_species_id())
+            elif heirs[parent] == index:
+                species = parent
+                species.group = group
+            else:
+                # 分裂出的群体继承亲代的生存时间（在亲代本轮计时之前复制）
+                species = parent.split(group, self._new_species_id())
+            species_list.append(species)
+        
+        # 3. 更新生存时间并重建细胞索引
+        for species in species_list:
             species.update_survival_time(delta_time)
+        self.species_list = species_list
+        self._cell_index = {cell: species for species in species_list for cell in species.group}
+    
+    def _match_displaced(self, matches: List[Tuple[Set[Tuple[int, int]], Optional[Species], int]],
+                         heirs: Dict[Species, int], generations: int) -> None:
+        """把没有重叠的群体匹配到尚无继承者、且中心位移不超过generations的上一轮物种
+
+        优先匹配大小相同、位移最小的物种；按边长为generations+1的桶索引物种中心，只查相邻的桶。
+        桶从所有中心的包围盒左上角起算，无限网格（宽高为None、坐标可为负）同样适用；
+        只有周期性边界才需要环绕
+        """
+        unmatched = [index for index, (_, parent, _) in enumerate(matches) if parent is None]
+        orphans = [species for species in self.species_list if species not in heirs]
+        if not unmatched or not orphans:
+            return
+        
+        height, width = self.grid.height, self.grid.width
+        periodic = self.grid.boundary_type == BOUNDARY_TYPES['periodic']
+        size = max(1, generations) + 1
+        
+        def center(cells: Set[Tuple[int, int]]) -> Tuple[float, float]:
+            xs = [x for (x, _) in cells]
+            ys = [y for (_, y) in cells]
+            return (min(xs) + max(xs)) / 2, (min(ys) + max(ys)) / 2
+        
+        def distance(a: float, b: float, extent: int) -> float:
+            d = abs(a - b)
+            return min(d, extent - d) if periodic else d
+        
+        old_positions = [(species, center(species.group)) for species in orphans if species.group]
+        new_positions = [(index, center(matches[index][0])) for index in unmatched]
+        if periodic:
+            origin = (0.0, 0.0)
+            bucket_rows = -(-height // size)
+            bucket_columns = -(-width // size)
+        else:
+            positions = [position for _, position in old_positions + new_positions]
+            origin = (min(x for x, _ in positions), min(y for _, y in positions))
+        
+        def bucket(position: Tuple[float, float]) -> Tuple[int, int]:
+            return int((position[0] - origin[0]) // size), int((position[1] - origin[1]) // size)
+        
+        buckets: Dict[Tuple[int, int], List[Tuple[Species, Tuple[float, float]]]] = {}
+        for species, position in old_positions:
+            buckets.setdefault(bucket(position), []).append((species, position))
+        
+        candidates = []
+        for index, position in new_positions:
+            group = matches[index][0]
+            row, column = bucket(position)
+            for dr in (-1, 0, 1):
+                for dc in (-1, 0, 1):
+                    key = (row + dr, column + dc)
+                    if periodic:
+                        key = (key[0] % bucket_rows, key[1] % bucket_columns)
+                    for species, old_position in buckets.get(key, ()):
+                        shift = max(distance(position[0], old_position[0], height),
+                                    distance(position[1], old_position[1], width))
+                        if shift <= generations:
+                            candidates.append((abs(len(group) - len(species.group)), shift,
+                                               index, species.species_id, species))
+        
+        # 贪心匹配：每个群体、每个物种最多匹配一次
+        candidates.sort(key=lambda item: item[:4])
+        for _, _, index, _, species in candidates:
+            if matches[index][1] is None and species not in heirs:
+                matches[index] = (matches[index][0], species, 0)
+                heirs[species] = index
+    
+    def reset(self) -> None:
+        """清空所有物种（网格被整体替换时调用）"""
+        self.species_list = []
+        self._cell_index = {}
+    
+    def load_species(self, species_list: List[Species]) -> None:
+        """载入已有的物种列表（从序列化数据恢复时调用）"""
+        self.species_list = list(species_list)
+        self._cell_index = {cell: species for species in self.species_list for cell in species.group}
+        self.next_species_id = max([self.next_species_id] +
+                                   [species.species_id for species in self.species_list])
+    
+    def _new_species_id(self) -> int:
+        """分配新的物种编号"""
+        self.next_species_id += 1
+        return self.next_species_id
     
     def _determine_initial_stage(self, group_size: int) -> int:
         """基于群体大小确定初始阶段"""
@@ -92,18 +222,20 @@ class SpeciesManager:
                 return stage
         return 1
     
-    def process_evolution(self) -> None:
-        """处理所有物种的演化"""
+    def process_evolution(self) -> Tuple[int, int]:
+        """处理所有物种的演化，返回(演化的物种数, 退化的物种数)"""
+        evolved = devolved = 0
         for species in self.species_list:
             # 检查是否可以演化
             if species.can_evolve():
                 # 检查是否有足够的空间演化
                 if self._has_enough_space(species):
-                    species.evolve()
+                    evolved += species.evolve()
             
             # 检查是否需要退化
             if len(species.group) < species.get_size_requirement():
-                species.devolve()
+                devolved += species.devolve()
+        return evolved, devolved
     
     def _has_enough_space(self, species: Species) -> bool:
         """检查物种是否有足够的空间演化到下一阶段"""
@@ -116,12 +248,39 @@ class SpeciesManager:
         return len(species.group) >= next_size
     
     def get_species_at(self, x: int, y: int) -> Species:
-        """获取指定位置的物种"""
-        for species in self.species_list:
-            if (x, y) in species.group:
-                return species
-        return None
+        """获取指定位置的物种（通过细胞索引O(1)查询）"""
+        return self._cell_index.get((x, y))
+    
+    def get_species_at_many(self, cells: List[Tuple[int, int]]) -> List[Species]:
+        """批量查询多个位置的物种，不存在时对应位置为None"""
+        index = self._cell_index
+        return [index.get(cell) for cell in cells]
+    
+    def get_species_in_area(self, x1: int, y1: int, x2: int, y2: int) -> List[Species]:
+        """获取矩形区域（含边界）内出现的所有物种，按物种编号排序"""
+        x_min, x_max = min(x1, x2), max(x1, x2)
+        y_min, y_max = min(y1, y2), max(y1, y2)
+        area = (x_max - x_min + 1) * (y_max - y_min + 1)
+        
+        found = set()
+        if area <= len(self._cell_index):
+            # 区域较小：逐格查索引
+            for x in range(x_min, x_max + 1):
+                for y in range(y_min, y_max + 1):
+                    species = self._cell_index.get((x, y))
+                    if species is not None:
+                        found.add(species)
+        else:
+            # 区域较大：遍历存活细胞
+            for (x, y), species in self._cell_index.items():
+                if x_min <= x <= x_max and y_min <= y <= y_max:
+                    found.add(species)
+        return sorted(found, key=lambda species: species.species_id)
     
     def get_species_list(self) -> List[Species]:
         """获取所有物种列表"""
         return self.species_list.copy()
+    
+    def index_memory_usage(self) -> int:
+        """细胞索引（每个物种细胞一项）占用的字节数，不含其引用的坐标与物种对象"""
+        return sys.getsizeof(self._cell_index)
@@ -0,0 +1,95 @@
+# 网格增量流编码模块
+import struct
+import sys
+from array import array
+from typing import List, Tuple, Set, Dict, Iterator
+
+# 帧类型
+FRAME_KEYFRAME = 0   # 关键帧：位压缩的完整网格
+FRAME_DELTA = 1      # 增量帧：本代出生/死亡细胞的扁平下标
+FRAME_KEEPALIVE = 2  # 保活帧：无负载
+
+# 帧头：类型(uint8) + 世代(uint32) + 负载长度(uint32)，小端
+FRAME_HEADER = struct.Struct('<BII')
+KEYFRAME_HEADER = struct.Struct('<HH')  # 宽、高
+DELTA_HEADER = struct.Struct('<II')     # 出生数、死亡数
+
+# 4字节无符号整数的array类型码
+INDEX_TYPECODE = 'I' if array('I').itemsize == 4 else 'L'
+
+
+def _frame(frame_type: int, generation: int, payload: bytes = b'') -> bytes:
+    return FRAME_HEADER.pack(frame_type, generation, len(payload)) + payload
+
+
+def _indices(cells: Set[Tuple[int, int]], width: int) -> bytes:
+    """把坐标集合编码为小端uint32扁平下标"""
+    indices = array(INDEX_TYPECODE, sorted(x * width + y for (x, y) in cells))
+    if sys.byteorder == 'big':
+        indices.byteswap()
+    return indices.tobytes()
+
+
+def keyframe_payload(live_cells: Set[Tuple[int, int]], width: int, height: int) -> bytes:
+    """关键帧负载：宽、高加按行优先顺序每个细胞1位的位图（字节内低位在前）"""
+    bits = bytearray((width * height + 7) // 8)
+    for (x, y) in live_cells:
+        index = x * width + y
+        bits[index >> 3] |= 1 << (index & 7)
+    return KEYFRAME_HEADER.pack(width, height) + bytes(bits)
+
+
+def delta_payload(born: Set[Tuple[int, int]], died: Set[Tuple[int, int]], width: int) -> bytes:
+    """增量帧负载：出生数、死亡数加两组扁平下标"""
+    return DELTA_HEADER.pack(len(born), len(died)) + _indices(born, width) + _indices(died, width)
+
+
+def encode_keyframe(live_cells: Set[Tuple[int, int]], width: int, height: int, generation: int) -> bytes:
+    """编码关键帧"""
+    return _frame(FRAME_KEYFRAME, generation, keyframe_payload(live_cells, width, height))
+
+
+def encode_delta(born: Set[Tuple[int, int]], died: Set[Tuple[int, int]], width: int, generation: int) -> bytes:
+    """编码增量帧"""
+    return _frame(FRAME_DELTA, generation, delta_payload(born, died, width))
+
+
+def encode_keepalive(generation: int) -> bytes:
+    """编码保活帧"""
+    return _frame(FRAME_KEEPALIVE, generation)
+
+
+def decode_frames(data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    """把字节流拆分为(类型, 世代, 负载)"""
+    offset = 0
+    while offset + FRAME_HEADER.size <= len(data):
+        frame_type, generation, length = FRAME_HEADER.unpack_from(data, offset)
+        offset += FRAME_HEADER.size
+        yield frame_type, generation, data[offset:offset + length]
+        offset += length
+
+
+def decode_keyframe(payload: bytes) -> Tuple[int, int, Set[Tuple[int, int]]]:
+    """解码关键帧负载，返回(宽, 高, 存活细胞)"""
+    width, height = KEYFRAME_HEADER.unpack_from(payload)
+    bits = payload[KEYFRAME_HEADER.size:]
+    live_cells = set()
+    for byte_index, byte in enumerate(bits):
+        while byte:
+            low_bit = byte & -byte
+            index = byte_index * 8 + low_bit.bit_length() - 1
+            live_cells.add(divmod(index, width))
+            byte ^= low_bit
+    return width, height, live_cells
+
+
+def decode_delta(payload: bytes, width: int) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+    """解码增量帧负载，返回(出生, 死亡)"""
+    born_count, died_count = DELTA_HEADER.unpack_from(payload)
+    indices = array(INDEX_TYPECODE)
+    indices.frombytes(payload[DELTA_HEADER.size:])
+    if sys.byteorder == 'big':
+        indices.byteswap()
+    born = {divmod(index, width) for index in indices[:born_count]}
+    died = {divmod(index, width) for index in indices[born_count:born_count + died_count]}
+    return born, died
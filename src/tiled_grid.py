@@ -0,0 +1,227 @@
+# 分块网格模块
+from collections import Counter
+from typing import List, Tuple, Set, Dict, Optional
+import random
+from src.rules import Rule, CONWAY
+from src.config import DEFAULT_BOUNDARY_TYPE, BOUNDARY_TYPES, TILE_SIZE
+
+class TiledGrid:
+    def __init__(self, width: Optional[int] = None, height: Optional[int] = None,
+                 boundary_type: str = DEFAULT_BOUNDARY_TYPE, tile_size: int = TILE_SIZE):
+        """初始化分块网格，宽高为None时网格在该方向上无限延伸"""
+        if (width is None or height is None) and boundary_type == BOUNDARY_TYPES['periodic']:
+            raise ValueError("周期性边界需要有限的网格大小")
+        self.width = width
+        self.height = height
+        self.boundary_type = boundary_type
+        self.tile_size = tile_size
+        # 只为含有存活细胞的分块分配存储，每个细胞占1字节
+        self.tiles: Dict[Tuple[int, int], bytearray] = {}
+        self.populations: Dict[Tuple[int, int], int] = {}
+        # 自上一代以来发生过变化的分块
+        self.dirty: Set[Tuple[int, int]] = set()
+        # 每次修改网格时递增，供缓存判断网格是否变化
+        self.version = 0
+
+    def reset(self) -> None:
+        """重置网格"""
+        self.tiles.clear()
+        self.populations.clear()
+        self.dirty.clear()
+        self.version += 1
+
+    def randomize(self, density: float = 0.3) -> None:
+        """随机初始化网格（仅限有限网格）"""
+        if self.width is None or self.height is None:
+            raise ValueError("无限网格无法随机初始化")
+        self.reset()
+        for i in range(self.height):
+            for j in range(self.width):
+                if random.random() < density:
+                    self.set_cell(i, j, 1)
+
+    def _in_bounds(self, x: int, y: int) -> bool:
+        """判断坐标是否在网格范围内"""
+        return ((self.height is None or 0 <= x < self.height) and
+                (self.width is None or 0 <= y < self.width))
+
+    def _wrap(self, x: int, y: int) -> Tuple[int, int]:
+        """按边界类型规范化坐标"""
+        if self.boundary_type == BOUNDARY_TYPES['periodic']:
+            return x % self.height, y % self.width
+        return x, y
+
+    def _locate(self, x: int, y: int) -> Tuple[Tuple[int, int], int]:
+        """返回细胞所在分块坐标及分块内下标"""
+        size = self.tile_size
+        tile_x, local_x = divmod(x, size)
+        tile_y, local_y = divmod(y, size)
+        return (tile_x, tile_y), local_x * size + local_y
+
+    def set_cell(self, x: int, y: int, state: int) -> None:
+        """设置单个细胞状态"""
+        if not self._in_bounds(x, y):
+            return
+        key, index = self._locate(x, y)
+        tile = self.tiles.get(key)
+        if tile is None:
+            if state != 1:
+                return
+            tile = self.tiles[key] = bytearray(self.tile_size * self.tile_size)
+            self.populations[key] = 0
+        if tile[index] == state:
+            return
+
+        tile[index] = state
+        self.version += 1
+        self.populations[key] += 1 if state == 1 else -1
+        self.dirty.add(key)
+        if self.populations[key] == 0:
+            # 分块变空后立即释放
+            del self.tiles[key]
+            del self.populations[key]
+
+    def get_cell(self, x: int, y: int) -> int:
+        """获取单个细胞状态，处理边界条件"""
+        x, y = self._wrap(x, y)
+        if not self._in_bounds(x, y):
+            return 0
+        key, index = self._locate(x, y)
+        tile = self.tiles.get(key)
+        return tile[index] if tile is not None else 0
+
+    def count_live_neighbors(self, x: int, y: int) -> int:
+        """计算单个细胞的存活邻居数量"""
+        count = 0
+        for dx in [-1, 0, 1]:
+            for dy in [-1, 0, 1]:
+                if dx == 0 and dy == 0:
+                    continue
+                count += self.get_cell(x + dx, y + dy)
+        return count
+
+    def get_size(self) -> Tuple[Optional[int], Optional[int]]:
+        """获取网格大小"""
+        return (self.height, self.width)
+
+    def get_live_cells(self) -> Set[Tuple[int, int]]:
+        """获取所有存活细胞"""
+        live_cells = set()
+        for key in self.tiles:
+            live_cells.update(self._tile_live_cells(key))
+        return live_cells
+
+    def load_pattern(self, pattern: List[Tuple[int, int]]) -> None:
+        """加载预设模式"""
+        self.reset()
+        for (x, y) in pattern:
+            self.set_cell(x, y, 1)
+
+    def clear_area(self, x1: int, y1: int, x2: int, y2: int) -> None:
+        """清空指定区域"""
+        for x in range(min(x1, x2), max(x1, x2) + 1):
+            for y in range(min(y1, y2), max(y1, y2) + 1):
+                self.set_cell(x, y, 0)
+
+    def copy(self) -> 'TiledGrid':
+        """创建网格副本"""
+        new_grid = TiledGrid(self.width, self.height, self.boundary_type, self.tile_size)
+        new_grid.tiles = {key: tile[:] for key, tile in self.tiles.items()}
+        new_grid.populations = self.populations.copy()
+        new_grid.dirty = self.dirty.copy()
+        return new_grid
+
+    def memory_usage(self) -> int:
+        """估算分块存储占用的字节数"""
+        return len(self.tiles) * self.tile_size * self.tile_size
+
+    def _tile_live_cells(self, key: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """列出分块内的存活细胞（全局坐标）"""
+        tile = self.tiles.get(key)
+        if tile is None:
+            return []
+        size = self.tile_size
+        x0, y0 = key[0] * size, key[1] * size
+        return [(x0 + index // size, y0 + index % size)
+                for index, state in enumerate(tile) if state]
+
+    def _tile_neighbors(self, key: Tuple[int, int]) -> Set[Tuple[int, int]]:
+        """返回分块自身及与其相距1格以内的分块"""
+        x0, y0, x1, y1 = self._tile_bounds(key)
+        # 分块上一行/首行/下一行、左一列/首列/右一列所在的分块
+        rows = [x0 - 1, x0, x1]
+        cols = [y0 - 1, y0, y1]
+
+        neighbors = set()
+        for x in rows:
+            for y in cols:
+                x, y = self._wrap(x, y)
+                if self._in_bounds(x, y):
+                    neighbors.add(self._locate(x, y)[0])
+        return neighbors
+
+    def _tile_bounds(self, key: Tuple[int, int]) -> Tuple[int, int, int, int]:
+        """返回分块覆盖的坐标范围[x0, x1) x [y0, y1)，最后一行/列分块可能不满"""
+        size = self.tile_size
+        x0, y0 = key[0] * size, key[1] * size
+        x1, y1 = x0 + size, y0 + size
+        if self.height is not None:
+            x1 = min(x1, self.height)
+        if self.width is not None:
+            y1 = min(y1, self.width)
+        return x0, y0, x1, y1
+
+    def _tile_border_cells(self, key: Tuple[int, int]) -> List[Tuple[int, int]]:
+        """列出分块外围一圈中的存活细胞（未规范化坐标，便于在分块内计数）"""
+        x0, y0, x1, y1 = self._tile_bounds(key)
+        ring = [(x0 - 1, y) for y in range(y0 - 1, y1 + 1)]
+        ring += [(x1, y) for y in range(y0 - 1, y1 + 1)]
+        ring += [(x, y0 - 1) for x in range(x0, x1)]
+        ring += [(x, y1) for x in range(x0, x1)]
+        return [(x, y) for (x, y) in ring if self.get_cell(x, y)]
+
+    def _step_tile(self, key: Tuple[int, int], rule: Rule = CONWAY) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+        """计算单个分块的下一代，返回(出生, 死亡)"""
+        x0, y0, x1, y1 = self._tile_bounds(key)
+
+        inside = self._tile_live_cells(key)
+        counts = Counter()
+        for (x, y) in inside + self._tile_border_cells(key):
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    if dx == 0 and dy == 0:
+                        continue
+                    neighbor_x, neighbor_y = x + dx, y + dy
+                    if x0 <= neighbor_x < x1 and y0 <= neighbor_y < y1:
+                        counts[(neighbor_x, neighbor_y)] += 1
+
+        live = set(inside)
+        table = rule.table
+        born = [cell for cell, count in counts.items() if table[count] and cell not in live]
+        died = [cell for cell in inside if not table[9 + counts.get(cell, 0)]]
+        return born, died
+
+    def step(self, rule: Rule = CONWAY) -> Tuple[Set[Tuple[int, int]], Set[Tuple[int, int]]]:
+        """推进一代，只重新计算脏分块及其相邻分块，返回(出生, 死亡)"""
+        candidates = set()
+        for key in self.dirty:
+            candidates.update(self._tile_neighbors(key))
+
+        born = set()
+        died = set()
+        for key in candidates:
+            # 空分块且相邻分块都为空时不可能出生细胞
+            if key not in self.tiles and not any(
+                    neighbor in self.tiles for neighbor in self._tile_neighbors(key)):
+                continue
+            tile_born, tile_died = self._step_tile(key, rule)
+            born.update(tile_born)
+            died.update(tile_died)
+
+        # 同步更新：所有分块算完后再写回，本代发生变化的分块成为下一代的脏分块
+        self.dirty = set()
+        for (x, y) in died:
+            self.set_cell(x, y, 0)
+        for (x, y) in born:
+            self.set_cell(x, y, 1)
+        return born, died
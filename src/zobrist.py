@@ -0,0 +1,49 @@
+# Zobrist哈希模块
+from typing import List, Tuple, Set, Dict, Collection
+from src.config import ZOBRIST_SEED
+
+try:
+    import numpy as np
+except ImportError:  # numpy为可选依赖，缺失时逐个细胞计算
+    np = None
+
+MASK64 = (1 << 64) - 1
+GOLDEN = 0x9E3779B97F4A7C15
+MIX1 = 0xBF58476D1CE4E5B9
+MIX2 = 0x94D049BB133111EB
+
+def zobrist_key(index: int, seed: int = ZOBRIST_SEED) -> int:
+    """细胞（行优先扁平下标）的64位键：对 seed ^ index 做splitmix64混合
+
+    键由下标直接算出，不需要为每种网格大小生成并常驻一张键表
+    """
+    z = ((seed ^ index) + GOLDEN) & MASK64
+    z = ((z ^ (z >> 30)) * MIX1) & MASK64
+    z = ((z ^ (z >> 27)) * MIX2) & MASK64
+    return z ^ (z >> 31)
+
+def _array_keys(indices: 'np.ndarray', seed: int = ZOBRIST_SEED) -> 'np.ndarray':
+    """zobrist_key的向量化版本，uint64乘法自然按2^64取模"""
+    z = (indices.astype(np.uint64) ^ np.uint64(seed)) + np.uint64(GOLDEN)
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(MIX1)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(MIX2)
+    return z ^ (z >> np.uint64(31))
+
+# 细胞数达到该值时走numpy路径，更少时逐个计算更快
+VECTORIZE_THRESHOLD = 64
+
+def hash_cells(cells: Collection[Tuple[int, int]], width: int) -> int:
+    """计算细胞集合的哈希：所有细胞键的异或（也用于按出生/死亡细胞增量更新）"""
+    if np is not None and len(cells) >= VECTORIZE_THRESHOLD:
+        return hash_indices(np.fromiter((x * width + y for (x, y) in cells), dtype=np.uint64, count=len(cells)))
+    value = 0
+    for (x, y) in cells:
+        value ^= zobrist_key(x * width + y)
+    return value
+
+def hash_indices(indices: 'np.ndarray') -> int:
+    """按扁平下标数组计算哈希，供已经持有numpy下标的引擎直接使用"""
+    if len(indices) == 0:
+        return 0
+    with np.errstate(over='ignore'):
+        return int(np.bitwise_xor.reduce(_array_keys(indices)))
@@ -1,9 +1,149 @@
 // 康威生命游戏前端逻辑
 
+// 画布渲染器：网格线缓存在离屏画布中，细胞直接写入ImageData，每帧只重绘变化的细胞
+class GridRenderer {
+    constructor(canvas) {
+        this.canvas = canvas;
+        this.ctx = canvas.getContext('2d');
+        this.background = document.createElement('canvas'); // 离屏画布：底色加网格线
+        // Uint32视图中像素的字节顺序取决于平台字节序
+        this.littleEndian = new Uint8Array(new Uint32Array([1]).buffer)[0] === 1;
+        this.dirty = new Set(); // 自上一帧以来变化的细胞（扁平下标）
+        this.needsFullRedraw = true;
+    }
+    
+    resize(gridWidth, gridHeight, cellSize) {
+        // 重新设置画布大小，重绘网格线缓存，并清空已绘制的细胞
+        this.gridWidth = gridWidth;
+        this.gridHeight = gridHeight;
+        this.cellSize = cellSize;
+        const width = gridWidth * cellSize;
+        const height = gridHeight * cellSize;
+        this.canvas.width = width;
+        this.canvas.height = height;
+        this.background.width = width;
+        this.background.height = height;
+        
+        // 所有网格线合并为一条路径，只描边一次
+        const ctx = this.background.getContext('2d');
+        ctx.fillStyle = '#fafafa';
+        ctx.fillRect(0, 0, width, height);
+        ctx.strokeStyle = '#e0e0e0';
+        ctx.lineWidth = 0.5;
+        ctx.beginPath();
+        for (let x = 0; x <= gridWidth; x++) {
+            ctx.moveTo(x * cellSize, 0);
+            ctx.lineTo(x * cellSize, height);
+        }
+        for (let y = 0; y <= gridHeight; y++) {
+            ctx.moveTo(0, y * cellSize);
+            ctx.lineTo(width, y * cellSize);
+        }
+        ctx.stroke();
+        
+        // 空细胞从网格线缓存中恢复像素
+        this.backgroundPixels = new Uint32Array(ctx.getImageData(0, 0, width, height).data.buffer);
+        this.image = this.ctx.createImageData(width, height);
+        this.pixels = new Uint32Array(this.image.data.buffer);
+        this.pixels.set(this.backgroundPixels);
+        
+        // 每个细胞当前已绘制的填充色与边框色，0表示空细胞
+        this.paintedFill = new Uint32Array(gridWidth * gridHeight);
+        this.paintedBorder = new Uint32Array(gridWidth * gridHeight);
+        this.invalidate();
+    }
+    
+    packColor(hex) {
+        // 把#rrggbb转换为Uint32像素值（不透明）
+        const r = parseInt(hex.slice(1, 3), 16);
+        const g = parseInt(hex.slice(3, 5), 16);
+        const b = parseInt(hex.slice(5, 7), 16);
+        if (this.littleEndian) {
+            return ((255 << 24) | (b << 16) | (g << 8) | r) >>> 0;
+        }
+        return ((r << 24) | (g << 16) | (b << 8) | 255) >>> 0;
+    }
+    
+    markDirty(index) {
+        this.dirty.add(index);
+    }
+    
+    invalidate() {
+        // 下一帧检查所有细胞（关键帧、网格尺寸变化时）
+        this.needsFullRedraw = true;
+        this.dirty.clear();
+    }
+    
+    draw(fillOf, borderOf) {
+        // 按回调给出的颜色重绘脏细胞，颜色未变的细胞跳过，最后只提交变化的矩形区域
+        const width = this.gridWidth;
+        let top = this.gridHeight, bottom = -1, left = width, right = -1;
+        const paint = (index) => {
+            const fill = fillOf(index);
+            const border = fill ? borderOf(index) : 0;
+            if (this.paintedFill[index] === fill && this.paintedBorder[index] === border) {
+                return;
+            }
+            this.paintedFill[index] = fill;
+            this.paintedBorder[index] = border;
+            const row = Math.floor(index / width);
+            const column = index - row * width;
+            this.paintCell(row, column, fill, border);
+            if (row < top) top = row;
+            if (row > bottom) bottom = row;
+            if (column < left) left = column;
+            if (column > right) right = column;
+        };
+        
+        if (this.needsFullRedraw) {
+            const count = width * this.gridHeight;
+            for (let index = 0; index < count; index++) {
+                paint(index);
+            }
+            this.needsFullRedraw = false;
+            // 尺寸变化后画布已被清空，需要提交整幅图像
+            top = 0;
+            bottom = this.gridHeight - 1;
+            left = 0;
+            right = width - 1;
+        } else {
+            this.dirty.forEach(paint);
+        }
+        this.dirty.clear();
+        
+        if (bottom >= 0) {
+            const cellSize = this.cellSize;
+            this.ctx.putImageData(this.image, 0, 0, left * cellSize, top * cellSize,
+                (right - left + 1) * cellSize, (bottom - top + 1) * cellSize);
+        }
+    }
+    
+    paintCell(row, column, fill, border) {
+        // 在像素缓冲区中绘制一个细胞（留出1像素间隙显示网格线），高级物种的外圈为边框色
+        const stride = this.gridWidth * this.cellSize;
+        const size = Math.max(1, this.cellSize - 1);
+        const pixels = this.pixels;
+        let offset = row * this.cellSize * stride + column * this.cellSize;
+        for (let dy = 0; dy < size; dy++, offset += stride) {
+            if (!fill) {
+                pixels.set(this.backgroundPixels.subarray(offset, offset + size), offset);
+            } else if (border && (dy === 0 || dy === size - 1)) {
+                pixels.fill(border, offset, offset + size);
+            } else {
+                pixels.fill(fill, offset, offset + size);
+                if (border) {
+                    pixels[offset] = border;
+                    pixels[offset + size - 1] = border;
+                }
+            }
+        }
+    }
+}
+
 class GameOfLife {
     constructor() {
         this.canvas = document.getElementById('game-canvas');
-        this.ctx = this.canvas.getContext('2d');
+        this.renderer = new GridRenderer(this.canvas);
         
         this.cellSize = 4; // 每个细胞的像素大小
         this.isRunning = false;
@@ -11,6 +151,7 @@ class GameOfLife {
         this.evolutionSpeed = 1000; // ms per evolution (1秒)
         this.autoRefreshId = null; // 自动刷新的定时器ID
         this.refreshInterval = 2500; // 刷新间隔，2.5秒
+        this.streaming = false; // 是否已连接二进制增量流
         
         // 物种阶段基础颜色（浅色）
         this.baseStageColors = [
@@ -36,20 +177,33 @@ class GameOfLife {
             '#800080'   // 阶段8: 深紫色
         ];
         
+        // 默认细胞颜色，物种会覆盖这个颜色
+        this.liveColor = this.renderer.packColor('#f0f0f0');
+        // 物种细胞的填充色与边框色（扁平下标 -> 像素值），物种数据或世代变化时重新计算
+        this.speciesFill = new Map();
+        this.speciesBorder = new Map();
+        this.styledSpecies = null;
+        this.styledProgress = null;
+        
+        // 渲染帧率统计：最近一秒内每帧的结束时间与耗时
+        this.frameTimes = [];
+        this.frameDurations = [];
+        this.frameStatsUpdatedAt = 0;
+        
         this.init();
         // 绑定所有事件
         this.bindEvents();
         this.bindCellSizeEvent();
         this.bindSpeedEvent();
         this.update();
+        this.connectStream();
     }
     
     init() {
         // 设置画布大小
         this.gridWidth = 200;
         this.gridHeight = 200;
-        this.canvas.width = this.gridWidth * this.cellSize;
-        this.canvas.height = this.gridHeight * this.cellSize;
+        this.renderer.resize(this.gridWidth, this.gridHeight, this.cellSize);
         
         // 初始化游戏状态
         this.grid = [];
@@ -138,6 +292,16 @@ class GameOfLife {
             const newSpeed = parseInt(e.target.value);
             this.evolutionSpeed = newSpeed;
             speedValue.textContent = `${(newSpeed / 1000).toFixed(1)}秒`;
+            if (this.streaming) {
+                // 服务器端自动演化时同步调整速率
+                fetch('/api/speed', {
+                    method: 'POST',
+                    headers: {
+                        'Content-Type': 'application/json'
+                    },
+                    body: JSON.stringify({ steps_per_second: 1000 / this.evolutionSpeed })
+                });
+            }
         });
     }
     
@@ -145,14 +309,20 @@ class GameOfLife {
         // 更新细胞大小
         this.cellSize = newSize;
         
-        // 重新计算画布大小
-        this.canvas.width = this.gridWidth * this.cellSize;
-        this.canvas.height = this.gridHeight * this.cellSize;
+        // 重新计算画布大小并重建网格线缓存
+        this.renderer.resize(this.gridWidth, this.gridHeight, this.cellSize);
         
         // 重新渲染画布
         this.render();
     }
     
+    resizeGrid(width, height) {
+        // 服务器网格尺寸与当前不同时，按新尺寸重建画布
+        this.gridWidth = width;
+        this.gridHeight = height;
+        this.renderer.resize(width, height, this.cellSize);
+    }
+    
     startAutoRefresh() {
         // 开始自动刷新画板，每隔2.5秒刷新一次
         if (!this.autoRefreshId) {
@@ -184,15 +354,37 @@ class GameOfLife {
             if (this.liveCells === 0) {
                 await this.generateCenterCells(this.cellCount);
             }
-            await this.evolveLoop();
             // 开始实时刷新画板
             this.startAutoRefresh();
+            if (this.streaming) {
+                // 由服务器端后台线程演化，网格通过增量流推送
+                await this.setServerRunning(true);
+            } else {
+                await this.evolveLoop();
+            }
         } else {
+            if (this.streaming) {
+                await this.setServerRunning(false);
+            }
             // 停止实时刷新画板
             this.stopAutoRefresh();
         }
     }
     
+    async setServerRunning(running) {
+        // 开始/暂停服务器端自动演化
+        await fetch('/api/toggle_run', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json'
+            },
+            body: JSON.stringify({
+                running: running,
+                steps_per_second: 1000 / this.evolutionSpeed
+            })
+        });
+    }
+    
     async generateCenterCells(count) {
         // 重置网格
         await this.reset();
@@ -277,18 +469,38 @@ class GameOfLife {
     }
     
     async evolve() {
+        // 请求出生/死亡细胞，只更新变化的细胞，无需重新获取整个网格
         const response = await fetch('/api/evolve', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
-            }
+            },
+            body: JSON.stringify({ delta: true })
         });
         
         const data = await response.json();
         if (data.success) {
             this.evolutionTime += 1; // 每次演化增加1秒
-            this.update();
+            this.applyChanges(data.born, data.died);
+            this.generation = data.generation;
+            this.liveCells = data.live_cells;
+            this.update(false);
+        }
+    }
+    
+    applyChanges(born, died) {
+        // 应用服务器返回的出生/死亡细胞（[行, 列]），并标记为需要重绘
+        if (this.grid.length !== this.gridHeight) {
+            return;
         }
+        born.forEach(([x, y]) => {
+            this.grid[x][y] = 1;
+            this.renderer.markDirty(x * this.gridWidth + y);
+        });
+        died.forEach(([x, y]) => {
+            this.grid[x][y] = 0;
+            this.renderer.markDirty(x * this.gridWidth + y);
+        });
     }
     
     async toggleCell(event) {
@@ -313,9 +525,11 @@ class GameOfLife {
         }
     }
     
-    async update() {
-        // 更新网格数据
-        await this.updateGrid();
+    async update(fetchGrid = true) {
+        // 更新网格数据（已连接增量流时网格由流推送）
+        if (fetchGrid && !this.streaming) {
+            await this.updateGrid();
+        }
         // 更新物种数据
         await this.updateSpecies();
         // 更新界面显示
@@ -327,11 +541,128 @@ class GameOfLife {
         const response = await fetch('/api/grid');
         const data = await response.json();
         
-        this.grid = data.grid;
+        const grid = data.grid;
+        const height = grid.length;
+        const width = height ? grid[0].length : 0;
+        if (width !== this.gridWidth || height !== this.gridHeight) {
+            this.resizeGrid(width, height);
+        } else if (this.grid.length !== height) {
+            this.renderer.invalidate();
+        } else {
+            // 与上一次的网格逐格比较，只标记变化的细胞
+            for (let i = 0; i < height; i++) {
+                const row = grid[i];
+                const previous = this.grid[i];
+                for (let j = 0; j < width; j++) {
+                    if (row[j] !== previous[j]) {
+                        this.renderer.markDirty(i * width + j);
+                    }
+                }
+            }
+        }
+        this.grid = grid;
         this.generation = data.generation;
         this.liveCells = data.live_cells.length;
     }
     
+    async connectStream() {
+        // 连接二进制增量流：首帧为关键帧，之后每代只接收出生/死亡细胞
+        try {
+            const response = await fetch('/api/stream');
+            if (!response.ok || !response.body) {
+                return;
+            }
+            const reader = response.body.getReader();
+            this.streaming = true;
+            let buffer = new Uint8Array(0);
+            
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) {
+                    break;
+                }
+                // 拼接未处理完的数据
+                const merged = new Uint8Array(buffer.length + value.length);
+                merged.set(buffer);
+                merged.set(value, buffer.length);
+                buffer = merged;
+                
+                // 帧头：类型(uint8) + 世代(uint32) + 负载长度(uint32)，小端
+                let offset = 0;
+                let changed = false;
+                while (buffer.length - offset >= 9) {
+                    const view = new DataView(buffer.buffer, buffer.byteOffset + offset);
+                    const type = view.getUint8(0);
+                    const generation = view.getUint32(1, true);
+                    const length = view.getUint32(5, true);
+                    if (buffer.length - offset - 9 < length) {
+                        break;
+                    }
+                    const payload = new DataView(buffer.buffer, buffer.byteOffset + offset + 9, length);
+                    if (type === 0) {
+                        this.applyKeyframe(payload);
+                        changed = true;
+                    } else if (type === 1) {
+                        this.applyDelta(payload);
+                        this.evolutionTime += 1; // 每次演化增加1秒
+                        changed = true;
+                    }
+                    this.generation = generation;
+                    offset += 9 + length;
+                }
+                buffer = buffer.slice(offset);
+                
+                if (changed) {
+                    this.render();
+                    this.updateUI();
+                }
+            }
+        } catch (error) {
+            console.error('增量流连接失败:', error);
+        }
+        // 流断开后回退到轮询 /api/grid
+        this.streaming = false;
+    }
+    
+    applyKeyframe(payload) {
+        // 关键帧：宽、高(uint16) + 行优先位图（字节内低位在前）
+        const width = payload.getUint16(0, true);
+        const height = payload.getUint16(2, true);
+        const grid = [];
+        let liveCells = 0;
+        for (let i = 0; i < height; i++) {
+            const row = new Array(width);
+            for (let j = 0; j < width; j++) {
+                const index = i * width + j;
+                const bit = (payload.getUint8(4 + (index >> 3)) >> (index & 7)) & 1;
+                row[j] = bit;
+                liveCells += bit;
+            }
+            grid.push(row);
+        }
+        if (width !== this.gridWidth || height !== this.gridHeight) {
+            this.resizeGrid(width, height);
+        }
+        this.renderer.invalidate();
+        this.grid = grid;
+        this.streamWidth = width;
+        this.liveCells = liveCells;
+    }
+    
+    applyDelta(payload) {
+        // 增量帧：出生数、死亡数(uint32) + 扁平下标(uint32)
+        const bornCount = payload.getUint32(0, true);
+        const diedCount = payload.getUint32(4, true);
+        for (let k = 0; k < bornCount + diedCount; k++) {
+            const index = payload.getUint32(8 + k * 4, true);
+            const i = Math.floor(index / this.streamWidth);
+            const j = index % this.streamWidth;
+            this.grid[i][j] = k < bornCount ? 1 : 0;
+            this.renderer.markDirty(index);
+        }
+        this.liveCells += bornCount - diedCount;
+    }
+    
     async updateSpecies() {
         const response = await fetch('/api/species');
         const data = await response.json();
@@ -341,30 +672,86 @@ class GameOfLife {
     }
     
     render() {
-        // 清空画布
-        this.ctx.fillStyle = '#fafafa';
-        this.ctx.fillRect(0, 0, this.canvas.width, this.canvas.height);
-        
-        // 绘制网格线
-        this.ctx.strokeStyle = '#e0e0e0';
-        this.ctx.lineWidth = 0.5;
-        
-        for (let x = 0; x <= this.gridWidth; x++) {
-            this.ctx.beginPath();
-            this.ctx.moveTo(x * this.cellSize, 0);
-            this.ctx.lineTo(x * this.cellSize, this.canvas.height);
-            this.ctx.stroke();
+        // 只重绘自上一帧以来变化的细胞（出生、死亡或物种颜色变化）
+        const start = performance.now();
+        this.updateSpeciesStyles();
+        const width = this.gridWidth;
+        this.renderer.draw(
+            (index) => {
+                const color = this.speciesFill.get(index);
+                if (color !== undefined) {
+                    return color;
+                }
+                const row = this.grid[Math.floor(index / width)];
+                return row && row[index % width] === 1 ? this.liveColor : 0;
+            },
+            (index) => this.speciesBorder.get(index) || 0
+        );
+        this.recordFrame(performance.now() - start);
+    }
+    
+    updateSpeciesStyles() {
+        // 物种数据或颜色渐变进度变化时重新计算物种细胞的颜色，并把新旧物种细胞标记为脏
+        // 计算颜色渐变进度（基于世代数，每100代完成从浅色到深色的过渡）
+        const colorProgress = Math.min(1.0, this.generation / 100);
+        if (this.styledSpecies === this.species && this.styledProgress === colorProgress) {
+            return;
         }
+        const renderer = this.renderer;
+        const fills = new Map();
+        const borders = new Map();
+        // 边框颜色也随世代加深
+        const borderColor = renderer.packColor(this.interpolateColor('#e0e0e0', '#333333', colorProgress));
         
-        for (let y = 0; y <= this.gridHeight; y++) {
-            this.ctx.beginPath();
-            this.ctx.moveTo(0, y * this.cellSize);
-            this.ctx.lineTo(this.canvas.width, y * this.cellSize);
-            this.ctx.stroke();
-        }
+        // 按物种顺序着色，后面的物种覆盖前面的物种
+        this.species.forEach(species => {
+            const stage = species.stage - 1; // 索引从0开始
+            
+            // 根据世代数计算当前阶段的颜色（从浅色到深色渐变）
+            const baseColor = this.baseStageColors[stage % this.baseStageColors.length];
+            const targetColor = this.targetStageColors[stage % this.targetStageColors.length];
+            const color = renderer.packColor(this.interpolateColor(baseColor, targetColor, colorProgress));
+            
+            species.group.forEach(([x, y]) => {
+                if (x >= this.gridHeight || y >= this.gridWidth) {
+                    return;
+                }
+                const index = x * this.gridWidth + y;
+                fills.set(index, color);
+                // 为高级物种添加边框
+                if (stage >= 1) {
+                    borders.set(index, borderColor);
+                } else {
+                    borders.delete(index);
+                }
+            });
+        });
         
-        // 绘制存活细胞和物种
-        this.renderSpecies();
+        // 颜色未变的细胞会在绘制时被跳过
+        this.speciesFill.forEach((_, index) => renderer.markDirty(index));
+        fills.forEach((_, index) => renderer.markDirty(index));
+        this.speciesFill = fills;
+        this.speciesBorder = borders;
+        this.styledSpecies = this.species;
+        this.styledProgress = colorProgress;
+    }
+    
+    recordFrame(duration) {
+        // 统计最近一秒内的渲染帧数和平均帧耗时，每0.5秒刷新一次显示
+        const now = performance.now();
+        this.frameTimes.push(now);
+        this.frameDurations.push(duration);
+        while (this.frameTimes[0] < now - 1000) {
+            this.frameTimes.shift();
+            this.frameDurations.shift();
+        }
+        if (now - this.frameStatsUpdatedAt < 500) {
+            return;
+        }
+        this.frameStatsUpdatedAt = now;
+        const average = this.frameDurations.reduce((sum, value) => sum + value, 0) / this.frameDurations.length;
+        document.getElementById('fps').textContent = this.frameTimes.length;
+        document.getElementById('frame-time').textContent = `${average.toFixed(2)}ms`;
     }
     
     // 颜色插值函数：从浅色到深色的渐变
@@ -389,45 +776,6 @@ class GameOfLife {
         return `#${((1 << 24) + (r << 16) + (g << 8) + b).toString(16).slice(1)}`;
     }
     
-    renderSpecies() {
-        // 计算颜色渐变进度（基于世代数，每100代完成从浅色到深色的过渡）
-        const colorProgress = Math.min(1.0, this.generation / 100);
-        
-        // 绘制存活细胞
-        for (let i = 0; i < this.gridHeight; i++) {
-            for (let j = 0; j < this.gridWidth; j++) {
-                if (this.grid[i][j] === 1) {
-                    this.ctx.fillStyle = '#f0f0f0'; // 默认浅灰色，物种会覆盖这个颜色
-                    this.ctx.fillRect(j * this.cellSize, i * this.cellSize, this.cellSize - 1, this.cellSize - 1);
-                }
-            }
-        }
-        
-        // 绘制物种，按阶段从低到高绘制，高级物种覆盖低级物种
-        this.species.forEach(species => {
-            const stage = species.stage - 1; // 索引从0开始
-            
-            // 根据世代数计算当前阶段的颜色（从浅色到深色渐变）
-            const baseColor = this.baseStageColors[stage % this.baseStageColors.length];
-            const targetColor = this.targetStageColors[stage % this.targetStageColors.length];
-            const color = this.interpolateColor(baseColor, targetColor, colorProgress);
-            
-            // 绘制物种的每个细胞
-            species.group.forEach(([x, y]) => {
-                this.ctx.fillStyle = color;
-                this.ctx.fillRect(y * this.cellSize, x * this.cellSize, this.cellSize - 1, this.cellSize - 1);
-                
-                // 为高级物种添加边框（边框颜色也随世代加深）
-                if (stage >= 1) {
-                    const borderColor = this.interpolateColor('#e0e0e0', '#333333', colorProgress);
-                    this.ctx.strokeStyle = borderColor;
-                    this.ctx.lineWidth = 1;
-                    this.ctx.strokeRect(y * this.cellSize, x * this.cellSize, this.cellSize - 1, this.cellSize - 1);
-                }
-            });
-        });
-    }
-    
     updateUI() {
         // 更新游戏信息
         document.getElementById('generation').textContent = this.generation;
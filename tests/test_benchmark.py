@@ -0,0 +1,84 @@
+# 基准测试模块测试
+import copy
+import os
+import tempfile
+import unittest
+from src.grid import Grid
+from src.benchmark import BenchmarkCase, default_cases, run_case, run_suite, save_baseline, load_baseline, compare, PHASES
+from src.config import BOUNDARY_TYPES, BENCHMARK_REPEATS
+
+class TestBenchmark(unittest.TestCase):
+    def test_seeded_randomize(self):
+        """测试指定种子时随机初始化可复现"""
+        a = Grid(width=30, height=30)
+        b = Grid(width=30, height=30)
+        a.randomize(0.3, seed=7)
+        b.randomize(0.3, seed=7)
+        self.assertEqual(a.live_cells, b.live_cells)
+        b.randomize(0.3, seed=8)
+        self.assertNotEqual(a.live_cells, b.live_cells)
+    
+    def test_default_cases(self):
+        """测试用例覆盖大小、密度和边界类型的全部组合"""
+        cases = default_cases([10, 20], [0.1, 0.2, 0.3])
+        self.assertEqual(len(cases), 2 * 3 * len(BOUNDARY_TYPES))
+        self.assertEqual(len({case.key for case in cases}), len(cases))
+    
+    def test_run_case(self):
+        """测试单个用例的结果字段"""
+        case = BenchmarkCase(20, 0.3, BOUNDARY_TYPES['periodic'])
+        result = run_case(case, generations=3)
+        self.assertGreater(result['generations_per_second'], 0)
+        self.assertEqual(set(result['phase_ms']), set(PHASES))
+        self.assertGreater(result['peak_memory_bytes'], 0)
+        # 固定种子：两次运行的演化结果相同
+        self.assertEqual(run_case(case, generations=3)['final_population'], result['final_population'])
+        # 重复计时取中位数并记录标准差
+        self.assertEqual(result['repeats'], BENCHMARK_REPEATS)
+        self.assertEqual(set(result['phase_ms_stdev']), set(PHASES))
+        self.assertEqual(run_case(case, generations=3, repeats=1)['generations_per_second_stdev'], 0.0)
+    
+    def test_baseline_roundtrip_and_compare(self):
+        """测试基线保存、读取与退化检测"""
+        suite = run_suite([BenchmarkCase(15, 0.3, BOUNDARY_TYPES['fixed'])], generations=2, repeats=2)
+        self.assertEqual(suite['repeats'], 2)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save_baseline(path, suite)
+            baseline = load_baseline(path)
+        self.assertEqual(compare(baseline, baseline), [])
+        
+        key = next(iter(suite['results']))
+        slower = copy.deepcopy(baseline)
+        slower['results'][key]['generations_per_second'] /= 2
+        regressions = compare(baseline, slower, tolerance=0.2, noise_stdevs=0)
+        self.assertEqual([item['metric'] for item in regressions], ['generations_per_second'])
+    
+    def test_compare_ignores_noise(self):
+        """测试单阶段耗时的变化需同时超过相对容差、绝对下限和重复测量的噪声"""
+        def suite(step_ms, stdev=0.0):
+            return {'results': {'case': {
+                'generations_per_second': 100.0, 'peak_memory_bytes': 1000,
+                'phase_ms': {phase: step_ms if phase == 'step' else 0.01 for phase in PHASES},
+                'phase_ms_stdev': {phase: stdev for phase in PHASES},
+            }}}
+        
+        def metrics(baseline, current, **kwargs):
+            return [item['metric'] for item in compare(baseline, current, **kwargs)]
+        
+        # 0.01ms -> 0.1ms是十倍，但绝对变化低于1ms的下限
+        jittery = suite(2.0)
+        for phase in PHASES:
+            jittery['results']['case']['phase_ms'][phase] *= 1.5 if phase == 'step' else 10
+        self.assertEqual(metrics(suite(2.0), jittery, min_phase_delta_ms=1.0), [])
+        self.assertEqual(len(metrics(suite(2.0), jittery, min_phase_delta_ms=0.0)), len(PHASES))
+        # 超过下限的退化仍被发现，除非变化在重复测量的噪声之内
+        self.assertEqual(metrics(suite(10.0), suite(15.0)), ['phase_ms.step'])
+        self.assertEqual(metrics(suite(10.0, stdev=2.0), suite(15.0, stdev=2.0), noise_stdevs=3.0), [])
+        # 旧基线没有标准差字段
+        old = suite(10.0)
+        del old['results']['case']['phase_ms_stdev']
+        self.assertEqual(metrics(old, suite(15.0)), ['phase_ms.step'])
+
+if __name__ == '__main__':
+    unittest.main()
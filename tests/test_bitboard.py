@@ -0,0 +1,59 @@
+# 位压缩网格测试
+import unittest
+from src.grid import Grid
+from src.bitboard import BitBoard, np
+from src.engine import SparseEngine, BitPackedEngine
+from src.config import BOUNDARY_TYPES
+from tests.test_engine import make_random_grid
+
+@unittest.skipIf(np is None, "需要安装 numpy")
+class TestBitBoard(unittest.TestCase):
+    """测试位压缩网格"""
+
+    def assert_same_evolution(self, width: int, height: int, boundary_type: str, seed: int) -> None:
+        grid = make_random_grid(width, height, boundary_type, seed)
+        board = BitBoard.from_grid(grid)
+        engine = SparseEngine()
+        for _ in range(10):
+            engine.step(grid)
+            board.step()
+            self.assertEqual(board.get_live_cells(), grid.get_live_cells())
+        self.assertEqual(board.to_grid().grid, grid.grid)
+
+    def test_periodic_boundary(self):
+        """测试周期性边界（宽度跨越多个字且不是64的整数倍）"""
+        for seed, width in enumerate([5, 64, 70, 130]):
+            self.assert_same_evolution(width, 11, BOUNDARY_TYPES['periodic'], seed)
+
+    def test_fixed_boundary(self):
+        """测试固定边界"""
+        for seed, width in enumerate([5, 64, 70, 130]):
+            self.assert_same_evolution(width, 11, BOUNDARY_TYPES['fixed'], seed)
+
+    def test_set_and_get_cell(self):
+        """测试设置和获取细胞状态"""
+        board = BitBoard(width=100, height=10)
+        board.set_cell(3, 70, 1)
+        self.assertEqual(board.get_cell(3, 70), 1)
+        self.assertEqual(board.get_cell(3, 71), 0)
+        self.assertEqual(board.population(), 1)
+        board.set_cell(3, 70, 0)
+        self.assertEqual(board.population(), 0)
+
+    def test_memory_density(self):
+        """测试每个细胞只占1位"""
+        board = BitBoard(width=512, height=512)
+        self.assertEqual(board.nbytes, 512 * 512 // 8)
+
+    def test_engine_matches_reference(self):
+        """测试位压缩引擎返回的出生/死亡集合与稀疏引擎一致"""
+        grid = make_random_grid(70, 20, BOUNDARY_TYPES['periodic'], seed=9)
+        candidate = grid.copy()
+        sparse_engine = SparseEngine()
+        bitpacked_engine = BitPackedEngine()
+        for _ in range(5):
+            self.assertEqual(bitpacked_engine.step(candidate), sparse_engine.step(grid))
+            self.assertEqual(candidate.grid, grid.grid)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# 分块查表内核测试
+import unittest
+from src.grid import Grid
+from src.engine import SparseEngine, LookupTableEngine, np
+from src.block_table import block_tables, step_rows, step_array
+from src.benchmark import compare_kernels
+from src.config import BOUNDARY_TYPES
+
+class TestBlockTable(unittest.TestCase):
+    def test_table_entries(self):
+        """测试查找表：空块保持为空，中心2x2方块保持不变"""
+        next_table, center_table = block_tables()
+        self.assertEqual(len(next_table), 65536)
+        self.assertEqual(next_table[0], 0)
+        square = (1 << 5) | (1 << 6) | (1 << 9) | (1 << 10)
+        self.assertEqual(next_table[square], 0b1111)
+        self.assertEqual(center_table[square], 0b1111)
+    
+    def test_matches_sparse_engine(self):
+        """测试两种路径、两种边界、奇偶尺寸下与稀疏引擎逐代一致"""
+        paths = [False] + ([True] if np is not None else [])
+        for boundary_type in BOUNDARY_TYPES.values():
+            for width, height in ((7, 5), (16, 12), (13, 9)):
+                for vectorized in paths:
+                    with self.subTest(boundary_type=boundary_type, size=(width, height), vectorized=vectorized):
+                        grid = Grid(width=width, height=height, boundary_type=boundary_type)
+                        grid.randomize(0.4, seed=width * height)
+                        reference = grid.copy()
+                        engine = LookupTableEngine(vectorized=vectorized)
+                        sparse = SparseEngine()
+                        for _ in range(4):
+                            self.assertEqual(engine.step(grid), sparse.step(reference))
+                        engine.step_n(grid, 5)
+                        sparse.step_n(reference, 5)
+                        self.assertEqual(grid.live_cells, reference.live_cells)
+    
+    @unittest.skipIf(np is None, "需要安装 numpy")
+    def test_array_path_matches_rows_path(self):
+        """测试NumPy路径与纯Python路径结果相同"""
+        grid = Grid(width=11, height=11, boundary_type=BOUNDARY_TYPES['periodic'])
+        grid.randomize(0.3, seed=1)
+        board = np.array(grid.grid, dtype=np.uint8)
+        new_board = step_array(board, grid.boundary_type)
+        born, died = step_rows(grid.grid, grid.height, grid.width, grid.boundary_type)
+        self.assertEqual(set(zip(*np.nonzero(new_board > board))), {(x, y) for (x, y) in born})
+        self.assertEqual(set(zip(*np.nonzero(new_board < board))), {(x, y) for (x, y) in died})
+    
+    def test_kernel_benchmark(self):
+        """测试内核对比结果包含逐格循环与查表实现"""
+        results = compare_kernels(12, 0.3, BOUNDARY_TYPES['fixed'], generations=1)
+        self.assertIn('python-loop', results)
+        self.assertIn('lookup-python', results)
+        self.assertTrue(all(value > 0 for value in results.values()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+# 并发访问测试
+import random
+import threading
+import time
+import unittest
+from src.game_state import GameState
+
+try:
+    import flask
+except ImportError:  # 接口压力测试需要flask
+    flask = None
+
+def assert_consistent(test: unittest.TestCase, rows, live_cells) -> None:
+    """检查网格行与存活集合描述的是同一块网格"""
+    expected = {(x, y) for x, row in enumerate(rows) for y, state in enumerate(row) if state == 1}
+    test.assertEqual(set(map(tuple, live_cells)), expected)
+
+class TestGameStateSnapshots(unittest.TestCase):
+    """测试写线程演化时读者看到的快照始终完整"""
+
+    def test_snapshots_not_torn(self):
+        """测试后台演化期间读取的快照前后一致"""
+        random.seed(0)
+        game = GameState(60, 40)
+        with game.lock:
+            game.grid.randomize(density=0.3)
+            game.touch()
+        game.loop.set_rate(1000)
+        game.start()
+
+        generations = []
+        for _ in range(200):
+            snapshot = game.snapshot
+            assert_consistent(self, snapshot.rows, snapshot.live_cells)
+            generations.append(snapshot.generation)
+        game.close()
+
+        self.assertEqual(generations, sorted(generations))
+
+    def test_species_computed_on_demand(self):
+        """测试快照中的物种在首次查询时才计算"""
+        game = GameState(20, 20)
+        with game.lock:
+            game.grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2)])
+            game.touch()
+        game.step()
+        self.assertIsNone(game.snapshot.species)
+
+        species = game.species_snapshot()
+        self.assertEqual(len(species), 1)
+        self.assertIs(game.snapshot.species, species)
+
+    def test_unchanged_rows_are_shared(self):
+        """测试演化后未变化的行与上一快照共享（写时复制）"""
+        game = GameState(20, 20)
+        with game.lock:
+            for (x, y) in [(5, 4), (5, 5), (5, 6)]:
+                game.grid.set_cell(x, y, 1)
+            game.touch()
+        before = game.snapshot
+        game.step()
+        after = game.snapshot
+
+        self.assertIs(after.rows[0], before.rows[0])
+        self.assertIsNot(after.rows[4], before.rows[4])
+        assert_consistent(self, after.rows, after.live_cells)
+        self.assertEqual(after.generation, before.generation + 1)
+
+@unittest.skipIf(flask is None, "需要安装 flask")
+class TestStreamWakeup(unittest.TestCase):
+    def test_change_before_wait_not_missed(self):
+        """测试增量流开始等待之前发生的演化会立即推送，而不是等到保活超时"""
+        import app
+        from src.stream_codec import FRAME_DELTA, decode_frames
+        game = GameState(20, 20)
+        game.grid.set_cell(5, 4, 1)
+        game.grid.set_cell(5, 5, 1)
+        game.grid.set_cell(5, 6, 1)
+        with game.lock:
+            game.touch()
+        snapshot = game.snapshot
+        game.step()  # 通知在流开始等待之前就已发出
+        start = time.perf_counter()
+        frame = next(app.follow_frames(game, snapshot.epoch, snapshot.generation))
+        self.assertLess(time.perf_counter() - start, 1.0)
+        self.assertEqual(next(decode_frames(frame))[0], FRAME_DELTA)
+        game.close()
+
+@unittest.skipIf(flask is None, "需要安装 flask")
+class TestEndpointStress(unittest.TestCase):
+    """并发请求各接口，检查网格从不出现撕裂"""
+
+    def test_parallel_requests(self):
+        """测试并行调用演化、编辑、随机与读取接口"""
+        import app
+        session = 'stress-test'
+        # 使用较小的网格让每次演化足够快，从而产生更多交错
+        app.registry.resident[session] = GameState(50, 50)
+        errors = []
+
+        def writer(seed: int) -> None:
+            client = app.app.test_client()
+            rng = random.Random(seed)
+            for _ in range(30):
+                action = rng.random()
+                if action < 0.5:
+                    response = client.post(f'/api/evolve?session={session}')
+                elif action < 0.8:
+                    response = client.post(f'/api/toggle_cell?session={session}',
+                                           json={'x': rng.randrange(50), 'y': rng.randrange(50)})
+                elif action < 0.9:
+                    response = client.post(f'/api/toggle_run?session={session}', json={'running': rng.random() < 0.5})
+                else:
+                    response = client.post(f'/api/randomize?session={session}', json={'density': 0.2})
+                if response.status_code != 200:
+                    errors.append(response.status_code)
+
+        def reader() -> None:
+            client = app.app.test_client()
+            for _ in range(40):
+                data = client.get(f'/api/grid?session={session}').get_json()
+                try:
+                    assert_consistent(self, data['grid'], data['live_cells'])
+                except AssertionError as error:
+                    errors.append(error)
+                if client.get(f'/api/species?session={session}').status_code != 200:
+                    errors.append('species')
+
+        threads = [threading.Thread(target=writer, args=(seed,)) for seed in range(4)]
+        threads += [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        app.registry.remove(session)
+
+        self.assertEqual(errors, [])
+
+if __name__ == '__main__':
+    unittest.main()
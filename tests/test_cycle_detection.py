@@ -0,0 +1,127 @@
+# 周期检测测试
+import unittest
+from src.grid import Grid
+from src.evolution import Evolution
+from src.engine import SparseEngine
+from src import zobrist
+from src.config import BOUNDARY_TYPES
+
+class TestZobristHash(unittest.TestCase):
+    def test_incremental_hash_matches_rehash(self):
+        """测试逐格更新与演化后的哈希与重新计算的结果一致"""
+        grid = Grid(width=20, height=20)
+        grid.randomize(0.3)
+        evolution = Evolution(grid)
+        for _ in range(5):
+            evolution.evolve()
+        expected = grid.board_hash
+        grid.rehash()
+        self.assertEqual(grid.board_hash, expected)
+    
+    def test_same_board_same_hash(self):
+        """测试相同的网格得到相同的哈希，空网格哈希为0"""
+        a = Grid(width=10, height=10)
+        b = Grid(width=10, height=10)
+        a.load_pattern([(1, 1), (2, 2)])
+        b.load_pattern([(2, 2), (1, 1)])
+        self.assertEqual(a.board_hash, b.board_hash)
+        a.set_cell(1, 1, 0)
+        a.set_cell(2, 2, 0)
+        self.assertEqual(a.board_hash, 0)
+
+    def test_keys_need_no_table(self):
+        """测试键由下标直接算出：不同大小的网格不保留键表，numpy路径与逐个计算一致"""
+        self.assertEqual(zobrist.zobrist_key(12345), zobrist.zobrist_key(12345))
+        self.assertNotEqual(zobrist.zobrist_key(0), zobrist.zobrist_key(1))
+        self.assertFalse(hasattr(Grid(width=400, height=400), 'zobrist_keys'))
+        cells = [(x, (x * 7) % 50) for x in range(50)]
+        expected = 0
+        for (x, y) in cells:
+            expected ^= zobrist.zobrist_key(x * 50 + y)
+        self.assertEqual(zobrist.hash_cells(cells, 50), expected)
+
+class TestCycleDetection(unittest.TestCase):
+    def test_still_life(self):
+        """测试静止图形被识别为周期1"""
+        grid = Grid(width=10, height=10)
+        grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2)])
+        evolution = Evolution(grid)
+        self.assertIsNone(evolution.cycle_period)
+        evolution.evolve()
+        evolution.evolve()
+        self.assertEqual(evolution.cycle_period, 1)
+    
+    def test_evolve_n_detects_blinker(self):
+        """测试批量演化也能识别闪烁器的周期2，之后的批量与单步回放与真实模拟一致"""
+        grid = Grid(width=10, height=10)
+        grid.load_pattern([(4, 3), (4, 4), (4, 5)])
+        reference = grid.copy()
+        evolution = Evolution(grid)
+        engine = SparseEngine()
+        for _ in range(2):
+            evolution.evolve_n(10)
+        engine.step_n(reference, 20)
+        self.assertEqual(evolution.cycle_period, 2)
+        
+        evolution.evolve_n(7)
+        evolution.evolve()
+        engine.step_n(reference, 8)
+        self.assertEqual(grid.live_cells, reference.live_cells)
+        self.assertEqual(evolution.generation, 28)
+    
+    def test_fast_forward_detects_still_life(self):
+        """测试快进后也能识别静止图形"""
+        grid = Grid(width=16, height=16, boundary_type=BOUNDARY_TYPES['periodic'])
+        grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2)])
+        evolution = Evolution(grid)
+        evolution.fast_forward(8)
+        evolution.fast_forward(8)
+        self.assertEqual(evolution.cycle_period, 1)
+    
+    def test_blinker_replays_cycle(self):
+        """测试闪烁器被识别为周期2，之后按周期回放的结果与真实模拟一致"""
+        grid = Grid(width=10, height=10)
+        grid.load_pattern([(4, 3), (4, 4), (4, 5)])
+        reference = grid.copy()
+        evolution = Evolution(grid)
+        engine = SparseEngine()
+        for _ in range(3):
+            evolution.evolve()
+            engine.step(reference)
+        self.assertEqual(evolution.cycle_period, 2)
+        
+        for _ in range(5):
+            evolution.evolve()
+            engine.step(reference)
+            self.assertEqual(grid.live_cells, reference.live_cells)
+        
+        # 多代推进按周期取余
+        evolution.evolve_n(1001)
+        engine.step(reference)
+        self.assertEqual(grid.live_cells, reference.live_cells)
+        self.assertEqual(evolution.generation, 1009)
+    
+    def test_glider_on_torus(self):
+        """测试环面上的滑翔机回到原位后被识别为周期4*边长"""
+        grid = Grid(width=8, height=8, boundary_type=BOUNDARY_TYPES['periodic'])
+        grid.load_pattern([(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)])
+        evolution = Evolution(grid)
+        for _ in range(33):
+            evolution.evolve()
+        self.assertEqual(evolution.cycle_period, 32)
+    
+    def test_edit_invalidates_cycle(self):
+        """测试网格被编辑后退出周期模式"""
+        grid = Grid(width=10, height=10)
+        grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2)])
+        evolution = Evolution(grid)
+        evolution.evolve()
+        evolution.evolve()
+        self.assertEqual(evolution.cycle_period, 1)
+        grid.set_cell(6, 6, 1)
+        self.assertIsNone(evolution.cycle_period)
+        evolution.evolve()
+        self.assertEqual(grid.get_cell(6, 6), 0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+# 演化引擎测试
+import random
+import unittest
+from src.grid import Grid
+from src.engine import PythonEngine, SparseEngine, NumpyEngine, create_engine, available_engines, np
+from src.config import BOUNDARY_TYPES
+
+def make_random_grid(width: int, height: int, boundary_type: str, seed: int,
+                     density: float = 0.3) -> Grid:
+    """按固定种子生成随机网格"""
+    random.seed(seed)
+    grid = Grid(width=width, height=height, boundary_type=boundary_type)
+    grid.randomize(density=density)
+    return grid
+
+class TestPythonEngine(unittest.TestCase):
+    """测试纯Python参考引擎"""
+
+    def test_blinker_oscillates(self):
+        """测试闪烁器周期为2"""
+        grid = Grid(width=5, height=5, boundary_type=BOUNDARY_TYPES['fixed'])
+        grid.load_pattern([(2, 1), (2, 2), (2, 3)])
+        engine = PythonEngine()
+
+        born, died = engine.step(grid)
+        self.assertEqual(grid.get_live_cells(), {(1, 2), (2, 2), (3, 2)})
+        self.assertEqual(born, {(1, 2), (3, 2)})
+        self.assertEqual(died, {(2, 1), (2, 3)})
+
+        engine.step(grid)
+        self.assertEqual(grid.get_live_cells(), {(2, 1), (2, 2), (2, 3)})
+
+    def test_grid_matches_live_cells(self):
+        """测试二维列表与存活集合保持一致"""
+        grid = make_random_grid(12, 9, BOUNDARY_TYPES['periodic'], seed=1)
+        engine = PythonEngine()
+        for _ in range(5):
+            engine.step(grid)
+
+        expected = {(x, y) for x in range(grid.height) for y in range(grid.width)
+                    if grid.grid[x][y] == 1}
+        self.assertEqual(grid.get_live_cells(), expected)
+
+    def test_unknown_engine(self):
+        """测试未知引擎名称"""
+        with self.assertRaises(ValueError):
+            create_engine('unknown')
+
+class TestSparseEngine(unittest.TestCase):
+    """测试稀疏引擎与参考引擎结果一致"""
+
+    def assert_same_evolution(self, grid: Grid, generations: int = 10) -> None:
+        candidate = grid.copy()
+        python_engine = PythonEngine()
+        sparse_engine = SparseEngine()
+
+        for _ in range(generations):
+            expected = python_engine.step(grid)
+            actual = sparse_engine.step(candidate)
+            self.assertEqual(actual, expected)
+            self.assertEqual(candidate.grid, grid.grid)
+            self.assertEqual(candidate.get_live_cells(), grid.get_live_cells())
+
+    def test_periodic_boundary(self):
+        """测试周期性边界"""
+        for seed in range(3):
+            self.assert_same_evolution(make_random_grid(23, 17, BOUNDARY_TYPES['periodic'], seed))
+
+    def test_fixed_boundary(self):
+        """测试固定边界"""
+        for seed in range(3):
+            self.assert_same_evolution(make_random_grid(23, 17, BOUNDARY_TYPES['fixed'], seed))
+
+    def test_narrow_periodic_grid(self):
+        """测试窄周期网格上邻居重复计数与参考引擎一致"""
+        self.assert_same_evolution(make_random_grid(2, 5, BOUNDARY_TYPES['periodic'], seed=4, density=0.5))
+
+    def test_empty_grid(self):
+        """测试空网格不产生任何变化"""
+        grid = Grid(width=50, height=50)
+        born, died = SparseEngine().step(grid)
+        self.assertEqual(born, set())
+        self.assertEqual(died, set())
+
+@unittest.skipIf(np is None, "需要安装 numpy")
+class TestNumpyEngine(unittest.TestCase):
+    """测试NumPy引擎与参考引擎结果一致"""
+
+    def assert_same_evolution(self, boundary_type: str, seed: int) -> None:
+        reference = make_random_grid(23, 17, boundary_type, seed)
+        candidate = reference.copy()
+        python_engine = PythonEngine()
+        numpy_engine = NumpyEngine()
+
+        for _ in range(10):
+            expected = python_engine.step(reference)
+            actual = numpy_engine.step(candidate)
+            self.assertEqual(actual, expected)
+            self.assertEqual(candidate.grid, reference.grid)
+            self.assertEqual(candidate.get_live_cells(), reference.get_live_cells())
+
+    def test_periodic_boundary(self):
+        """测试周期性边界"""
+        for seed in range(3):
+            self.assert_same_evolution(BOUNDARY_TYPES['periodic'], seed)
+
+    def test_fixed_boundary(self):
+        """测试固定边界"""
+        for seed in range(3):
+            self.assert_same_evolution(BOUNDARY_TYPES['fixed'], seed)
+
+    def test_array_cached_between_steps(self):
+        """测试数组在推进之间复用，网格被修改或换成别的网格后重新建立"""
+        grid = make_random_grid(20, 15, BOUNDARY_TYPES['periodic'], seed=4)
+        reference = grid.copy()
+        engine = NumpyEngine()
+        python_engine = PythonEngine()
+        engine.step(grid)
+        python_engine.step(reference)
+        self.assertIs(engine.to_array(grid), engine.to_array(grid))
+        
+        grid.set_cell(7, 7, 1 - grid.get_cell(7, 7))
+        reference.set_cell(7, 7, 1 - reference.get_cell(7, 7))
+        self.assertEqual(engine.step(grid), python_engine.step(reference))
+        self.assertEqual(grid.grid, reference.grid)
+        
+        other = reference.copy()
+        self.assertEqual(engine.step_n(other, 3), python_engine.step_n(reference, 3))
+        self.assertEqual(other.grid, reference.grid)
+        board_hash = other.board_hash
+        other.rehash()
+        self.assertEqual(other.board_hash, board_hash)
+
+class TestStepN(unittest.TestCase):
+    """测试各引擎的多代连续推进与逐代推进结果一致"""
+
+    def test_matches_repeated_steps(self):
+        """测试step_n的网格与净增量"""
+        for name in available_engines():
+            if name == 'tiled':
+                continue
+            for boundary_type in BOUNDARY_TYPES.values():
+                with self.subTest(engine=name, boundary=boundary_type):
+                    reference = make_random_grid(23, 17, boundary_type, seed=5)
+                    candidate = reference.copy()
+                    start = set(reference.get_live_cells())
+                    python_engine = PythonEngine()
+                    for _ in range(7):
+                        python_engine.step(reference)
+
+                    born, died = create_engine(name).step_n(candidate, 7)
+                    self.assertEqual(candidate.grid, reference.grid)
+                    self.assertEqual(candidate.get_live_cells(), reference.get_live_cells())
+                    self.assertEqual(born, reference.get_live_cells() - start)
+                    self.assertEqual(died, start - reference.get_live_cells())
+
+if __name__ == '__main__':
+    unittest.main()
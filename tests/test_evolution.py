@@ -102,6 +102,51 @@ class TestEvolution(unittest.TestCase):
         # 群体缩小后应该退化
         self.assertLessEqual(species_list[0].stage, 3, "物种应该退化到阶段3或更低")
     
+    def test_evolve_n(self):
+        """测试批量演化与逐代演化的网格一致，物种在最后统一结算"""
+        glider = [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]
+        self.grid.load_pattern(glider)
+        reference = self.grid.copy()
+        reference_evolution = Evolution(reference)
+        for _ in range(8):
+            reference_evolution.evolve(delta_time=0.1)
+        
+        born, died = self.evolution.evolve_n(8, delta_time=0.1)
+        self.assertEqual(self.grid.get_live_cells(), reference.get_live_cells())
+        self.assertEqual(born, reference.get_live_cells() - set(glider))
+        self.assertEqual(died, set(glider) - reference.get_live_cells())
+        
+        species_list = self.evolution.get_species_manager().get_species_list()
+        self.assertEqual(len(species_list), 1)
+        self.assertEqual(species_list[0].group, self.grid.get_live_cells())
+        self.assertAlmostEqual(species_list[0].survival_time, 0.8)
+    
+    def test_lazy_species_analysis(self):
+        """测试群体与物种只在查询时结算，结果缓存到网格被修改为止"""
+        block = [(1, 1), (1, 2), (2, 1), (2, 2)]
+        self.grid.load_pattern(block)
+        detector = self.evolution.get_group_detector()
+        calls = []
+        detect_groups = detector.detect_groups
+        detector.detect_groups = lambda: calls.append(1) or detect_groups()
+        
+        for _ in range(10):
+            self.evolution.evolve(delta_time=0.1)
+        self.assertEqual(calls, [])
+        
+        species_list = self.evolution.get_species_list()
+        self.assertEqual(len(calls), 1)
+        self.assertAlmostEqual(species_list[0].survival_time, 1.0)
+        
+        # 未修改时复用缓存
+        self.evolution.get_species_list()
+        self.assertEqual(len(calls), 1)
+        
+        # 修改网格后重新计算
+        self.grid.set_cell(8, 8, 1)
+        self.assertEqual(len(self.evolution.get_species_list()), 2)
+        self.assertEqual(len(calls), 2)
+    
     def test_empty_grid_evolution(self):
         """测试空网格演化"""
         # 确保空网格演化后仍然是空的
@@ -0,0 +1,64 @@
+# 批量实验测试
+import csv
+import json
+import os
+import tempfile
+import unittest
+from src.experiments import ExperimentRun, build_runs, run_experiment, run_sweep, ResultWriter, COLUMNS
+from src.config import BOUNDARY_TYPES, SPECIES_STAGES
+
+class TestExperiments(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.runs = build_runs([0, 1], [0.3], [12], list(BOUNDARY_TYPES.values()))
+    
+    def tearDown(self):
+        self.directory.cleanup()
+    
+    def test_run_experiment(self):
+        """测试每代一行统计，阶段计数之和等于物种数，且结果可复现"""
+        run = ExperimentRun(3, 0.3, 15, BOUNDARY_TYPES['periodic'])
+        rows = run_experiment(run, generations=4)
+        self.assertEqual([row['generation'] for row in rows], [0, 1, 2, 3, 4])
+        for row in rows:
+            self.assertEqual(set(row), set(COLUMNS))
+            self.assertEqual(sum(row[f'stage_{stage}'] for stage in SPECIES_STAGES), row['species'])
+        self.assertEqual(run_experiment(run, generations=4), rows)
+    
+    def test_csv_sweep(self):
+        """测试CSV输出覆盖全部实验，重复运行时跳过已完成的实验"""
+        path = os.path.join(self.directory.name, 'sweep.csv')
+        self.assertEqual(run_sweep(self.runs, path, generations=3, workers=1), 4)
+        with open(path, newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 4 * 4)
+        self.assertEqual({row['run'] for row in rows}, {run.key for run in self.runs})
+        self.assertEqual(run_sweep(self.runs, path, generations=3, workers=1), 0)
+    
+    def test_resume_drops_partial_rows(self):
+        """测试中断后续跑：丢弃未记入检查点的残留行，只补跑未完成的实验"""
+        path = os.path.join(self.directory.name, 'sweep.ndjson')
+        writer = ResultWriter(path)
+        first = self.runs[0]
+        writer.write(first.key, run_experiment(first, generations=2))
+        # 模拟写出一半时中断：第二个实验的行已写入，但未记入检查点
+        writer._file.write(json.dumps({'run': self.runs[1].key}) + '\n{"run": "trunc')
+        writer.close()
+        
+        self.assertEqual(run_sweep(self.runs, path, generations=2, workers=1), 3)
+        with open(path) as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 4 * 3)
+        self.assertEqual(sorted({row['run'] for row in rows}), sorted(run.key for run in self.runs))
+    
+    def test_process_pool(self):
+        """测试多进程运行的结果与串行一致"""
+        serial = os.path.join(self.directory.name, 'serial.ndjson')
+        parallel = os.path.join(self.directory.name, 'parallel.ndjson')
+        run_sweep(self.runs, serial, generations=2, workers=1)
+        run_sweep(self.runs, parallel, generations=2, workers=2)
+        with open(serial) as a, open(parallel) as b:
+            self.assertEqual(sorted(a), sorted(b))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+# 群体检测测试
+import unittest
+from src.grid import Grid
+from src.engine import SparseEngine
+from src.group_detection import (GroupDetection, IncrementalGroupDetection, LabelingGroupDetection,
+                                 create_group_detector, np)
+from src.config import BOUNDARY_TYPES
+from tests.test_engine import make_random_grid
+
+def as_partition(groups):
+    """把群体列表转换为与顺序无关的集合"""
+    return {frozenset(group) for group in groups}
+
+class TestDfsGroupDetection(unittest.TestCase):
+    def test_periodic_wrap(self):
+        """测试周期性边界下深度优先搜索把邻居坐标环绕回网格内，跨越首尾的细胞属于同一群体"""
+        grid = Grid(width=10, height=8, boundary_type=BOUNDARY_TYPES['periodic'])
+        # 跨越左右边缘、上下边缘和对角的细胞各自相连
+        grid.load_pattern([(3, 0), (3, 9), (0, 5), (7, 5), (0, 0), (7, 9)])
+        groups = GroupDetection(grid).detect_groups()
+        self.assertEqual(as_partition(groups), {frozenset({(3, 0), (3, 9)}), frozenset({(0, 5), (7, 5)}),
+                                                frozenset({(0, 0), (7, 9)})})
+        # 所有坐标都在网格范围内
+        for group in groups:
+            for (x, y) in group:
+                self.assertTrue(0 <= x < 8 and 0 <= y < 10)
+        
+        # 固定边界下同样的细胞互不相连
+        grid = Grid(width=10, height=8, boundary_type=BOUNDARY_TYPES['fixed'])
+        grid.load_pattern([(3, 0), (3, 9), (0, 5), (7, 5), (0, 0), (7, 9)])
+        self.assertEqual(len(GroupDetection(grid).detect_groups()), 6)
+
+class TestIncrementalGroupDetection(unittest.TestCase):
+    """测试增量群体检测与全量深度优先搜索结果一致"""
+
+    def assert_same_groups(self, grid: Grid, churn_threshold: float, generations: int = 30) -> None:
+        reference = GroupDetection(grid)
+        incremental = IncrementalGroupDetection(grid, churn_threshold=churn_threshold)
+        engine = SparseEngine()
+        for _ in range(generations):
+            self.assertEqual(as_partition(incremental.detect_groups()),
+                             as_partition(reference.detect_groups()))
+            engine.step(grid)
+
+    def test_incremental_updates(self):
+        """测试始终走增量路径"""
+        for boundary_type in BOUNDARY_TYPES.values():
+            for seed in range(3):
+                grid = make_random_grid(30, 24, boundary_type, seed, density=0.25)
+                self.assert_same_groups(grid, churn_threshold=float('inf'))
+
+    def test_fallback_relabel(self):
+        """测试变化较多时退回全量标记"""
+        grid = make_random_grid(30, 24, BOUNDARY_TYPES['periodic'], seed=5)
+        self.assert_same_groups(grid, churn_threshold=0.1)
+
+    def test_manual_edits(self):
+        """测试手动修改细胞（合并与分裂）"""
+        grid = Grid(width=10, height=10)
+        detector = IncrementalGroupDetection(grid, churn_threshold=float('inf'))
+        for y in range(5):
+            grid.set_cell(2, y, 1)
+        self.assertEqual(len(detector.detect_groups()), 1)
+
+        # 从中间断开，分裂成两个群体
+        grid.set_cell(2, 2, 0)
+        self.assertEqual(as_partition(detector.detect_groups()),
+                         {frozenset({(2, 0), (2, 1)}), frozenset({(2, 3), (2, 4)})})
+
+        # 斜向接回，重新合并为一个群体
+        grid.set_cell(3, 2, 1)
+        self.assertEqual(len(detector.detect_groups()), 1)
+
+    def test_periodic_wrap(self):
+        """测试跨越周期性边界的群体"""
+        grid = Grid(width=10, height=10)
+        detector = IncrementalGroupDetection(grid, churn_threshold=float('inf'))
+        detector.detect_groups()
+        grid.set_cell(0, 0, 1)
+        grid.set_cell(9, 9, 1)
+        self.assertEqual(len(detector.detect_groups()), 1)
+
+    def test_create_group_detector(self):
+        """测试按名称创建群体检测器"""
+        grid = Grid(width=10, height=10)
+        self.assertIsInstance(create_group_detector(grid, 'incremental'), IncrementalGroupDetection)
+        with self.assertRaises(ValueError):
+            create_group_detector(grid, 'unknown')
+
+class TestGroupIndex(unittest.TestCase):
+    """测试群体位置索引"""
+
+    def test_get_group_ids(self):
+        """测试批量获取群体ID"""
+        grid = Grid(width=10, height=10)
+        for cell in [(0, 0), (0, 1), (6, 6)]:
+            grid.set_cell(*cell, 1)
+        detector = GroupDetection(grid)
+        groups = detector.detect_groups()
+
+        ids = detector.get_group_ids([(0, 0), (0, 1), (6, 6), (3, 3)], groups)
+        self.assertEqual(ids[0], ids[1])
+        self.assertIn((6, 6), groups[ids[2]])
+        self.assertEqual(ids[3], -1)
+
+    def test_index_rebuilt_for_new_groups(self):
+        """测试传入新的群体列表时重建索引"""
+        grid = Grid(width=10, height=10)
+        detector = GroupDetection(grid)
+        self.assertEqual(detector.get_group_id(1, 1, [{(1, 1)}]), 0)
+        self.assertEqual(detector.get_group_id(1, 1, [{(2, 2)}, {(1, 1)}]), 1)
+
+@unittest.skipIf(np is None, "需要安装 numpy")
+class TestLabelingGroupDetection(unittest.TestCase):
+    """测试向量化连通域标记"""
+
+    def test_matches_dfs(self):
+        """测试与深度优先搜索结果一致"""
+        for boundary_type in BOUNDARY_TYPES.values():
+            for seed in range(3):
+                grid = make_random_grid(31, 23, boundary_type, seed, density=0.3)
+                self.assertEqual(as_partition(LabelingGroupDetection(grid).detect_groups()),
+                                 as_partition(GroupDetection(grid).detect_groups()))
+
+    def test_periodic_wrap(self):
+        """测试跨越周期性边界的群体（包括对角）"""
+        grid = Grid(width=10, height=10)
+        grid.set_cell(0, 0, 1)
+        grid.set_cell(9, 9, 1)
+        grid.set_cell(5, 0, 1)
+        grid.set_cell(5, 9, 1)
+        detector = LabelingGroupDetection(grid)
+        self.assertEqual(len(detector.detect_groups()), 2)
+
+        grid.boundary_type = BOUNDARY_TYPES['fixed']
+        self.assertEqual(len(detector.detect_groups()), 4)
+
+    def test_get_group_id(self):
+        """测试通过标签数组获取群体ID"""
+        grid = Grid(width=10, height=10)
+        grid.set_cell(0, 0, 1)
+        grid.set_cell(0, 1, 1)
+        grid.set_cell(6, 6, 1)
+        detector = LabelingGroupDetection(grid)
+        groups = detector.detect_groups()
+
+        group_id = detector.get_group_id(0, 1, groups)
+        self.assertIn((0, 0), groups[group_id])
+        self.assertEqual(detector.get_group_id(0, 0), group_id)
+        self.assertNotEqual(detector.get_group_id(6, 6), group_id)
+        self.assertEqual(detector.get_group_id(3, 3), -1)
+        self.assertEqual(detector.get_group_ids([(0, 0), (3, 3), (-1, 20)]), [group_id, -1, -1])
+
+    def test_sizes_and_centroids(self):
+        """测试群体大小与中心"""
+        grid = Grid(width=10, height=10, boundary_type=BOUNDARY_TYPES['fixed'])
+        for cell in [(0, 0), (0, 1), (1, 0), (1, 1), (5, 5), (5, 6), (5, 7)]:
+            grid.set_cell(*cell, 1)
+        detector = LabelingGroupDetection(grid)
+        groups = detector.detect_groups()
+
+        for group_id, group in enumerate(groups):
+            self.assertEqual(detector.sizes[group_id], len(group))
+            self.assertEqual(detector.calculate_group_center(group),
+                             GroupDetection(grid).calculate_group_center(group))
+        self.assertEqual(sorted(detector.sizes.tolist()), [3, 4])
+
+    def test_empty_grid(self):
+        """测试空网格"""
+        detector = LabelingGroupDetection(Grid(width=10, height=10))
+        self.assertEqual(detector.detect_groups(), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+# HashLife模块测试
+import unittest
+from src.grid import Grid
+from src.engine import SparseEngine
+from src.evolution import Evolution
+from src.hashlife import HashLife
+from src.config import BOUNDARY_TYPES
+from tests.test_engine import make_random_grid
+
+class TestHashLife(unittest.TestCase):
+    """测试HashLife与逐代演化结果一致"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.hashlife = HashLife()
+
+    def step_reference(self, grid: Grid, generations: int) -> None:
+        engine = SparseEngine()
+        for _ in range(generations):
+            engine.step(grid)
+
+    def test_advance_pow2(self):
+        """测试一次推进2^j代"""
+        for j in range(5):
+            reference = make_random_grid(21, 13, BOUNDARY_TYPES['periodic'], seed=j)
+            candidate = reference.copy()
+
+            self.step_reference(reference, 1 << j)
+            self.hashlife.advance_pow2(candidate, j)
+
+            self.assertEqual(candidate.get_live_cells(), reference.get_live_cells())
+            self.assertEqual(candidate.grid, reference.grid)
+
+    def test_fast_forward(self):
+        """测试推进任意代数"""
+        reference = make_random_grid(16, 30, BOUNDARY_TYPES['periodic'], seed=7)
+        candidate = reference.copy()
+
+        self.step_reference(reference, 45)
+        self.hashlife.fast_forward(candidate, 45)
+
+        self.assertEqual(candidate.get_live_cells(), reference.get_live_cells())
+
+    def test_glider_wraps_around(self):
+        """测试滑翔机在环面上绕行一周后回到原位"""
+        grid = Grid(width=8, height=8)
+        glider = [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]
+        grid.load_pattern(glider)
+
+        # 滑翔机每4代沿对角线移动1格，32代绕8x8环面一周
+        self.hashlife.fast_forward(grid, 32)
+        self.assertEqual(grid.get_live_cells(), set(glider))
+
+    def test_fixed_boundary_rejected(self):
+        """测试固定边界不被支持"""
+        grid = Grid(width=8, height=8, boundary_type=BOUNDARY_TYPES['fixed'])
+        with self.assertRaises(ValueError):
+            self.hashlife.fast_forward(grid, 4)
+
+class TestEvolutionFastForward(unittest.TestCase):
+    """测试演化模块快进接口"""
+
+    def test_fast_forward_matches_evolve(self):
+        """测试快进与逐代演化得到同样的网格"""
+        for boundary_type in BOUNDARY_TYPES.values():
+            reference = make_random_grid(20, 20, boundary_type, seed=3)
+            candidate = reference.copy()
+            reference_evolution = Evolution(reference)
+            candidate_evolution = Evolution(candidate)
+
+            for _ in range(20):
+                reference_evolution.evolve()
+            candidate_evolution.fast_forward(20)
+
+            self.assertEqual(candidate.get_live_cells(), reference.get_live_cells())
+
+    def test_species_accumulate_skipped_time(self):
+        """测试快进后物种按跳过的总时间结算"""
+        grid = Grid(width=10, height=10)
+        grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2)])
+        evolution = Evolution(grid)
+
+        evolution.fast_forward(100, delta_time=0.1)
+
+        species_list = evolution.get_species_manager().get_species_list()
+        self.assertEqual(len(species_list), 1)
+        self.assertAlmostEqual(species_list[0].survival_time, 10.0)
+
+if __name__ == '__main__':
+    unittest.main()
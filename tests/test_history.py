@@ -0,0 +1,100 @@
+# 演化历史记录测试
+import os
+import tempfile
+import unittest
+from src.evolution import Evolution
+from src.history import HistoryRecorder, clear_history_dir
+from src.config import BOUNDARY_TYPES
+from tests.test_engine import make_random_grid
+
+class TestHistoryRecorder(unittest.TestCase):
+    """测试历史记录与按世代回放"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'run.hist')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def record_run(self, generations: int, keyframe_interval: int = 5):
+        """演化并记录，返回记录器与每代的存活细胞"""
+        grid = make_random_grid(30, 20, BOUNDARY_TYPES['periodic'], seed=1)
+        evolution = Evolution(grid)
+        recorder = HistoryRecorder(self.path, keyframe_interval=keyframe_interval)
+        evolution.set_recorder(recorder)
+        states = [set(grid.get_live_cells())]
+        for _ in range(generations):
+            evolution.evolve()
+            states.append(set(grid.get_live_cells()))
+        return recorder, evolution, states
+
+    def test_seek_every_generation(self):
+        """测试回放到任意一代都与实际演化一致"""
+        recorder, _, states = self.record_run(23)
+        for generation, expected in enumerate(states):
+            found, width, height, cells = recorder.seek(generation)
+            self.assertEqual(found, generation)
+            self.assertEqual((width, height), (30, 20))
+            self.assertEqual(cells, expected)
+        self.assertEqual(recorder.keyframe_generations, [0, 5, 10, 15, 20])
+        self.assertEqual(recorder.generations(), (0, 23))
+        recorder.close()
+
+    def test_seek_beyond_range(self):
+        """测试超出最新世代时返回最新记录，早于最早记录时返回None"""
+        recorder, _, states = self.record_run(7)
+        found, _, _, cells = recorder.seek(100)
+        self.assertEqual(found, 7)
+        self.assertEqual(cells, states[-1])
+        self.assertIsNone(recorder.seek(-1))
+        recorder.close()
+
+    def test_batched_and_edited_generations(self):
+        """测试批量演化与手动编辑后的记录"""
+        recorder, evolution, _ = self.record_run(3)
+        evolution.evolve_n(10)
+        after_batch = set(evolution.grid.get_live_cells())
+        evolution.grid.set_cell(0, 0, 1 - evolution.grid.get_cell(0, 0))
+        evolution.grid_changed()
+        edited = set(evolution.grid.get_live_cells())
+
+        self.assertEqual(recorder.seek(12)[0], 3)
+        self.assertEqual(recorder.seek(13)[3], edited)
+        self.assertNotEqual(edited, after_batch)
+        recorder.close()
+
+    def test_restart_truncates(self):
+        """测试世代回退（新开一局）时清空旧历史"""
+        recorder, evolution, _ = self.record_run(10)
+        evolution.generation = 0
+        evolution.grid_changed()
+        self.assertEqual(recorder.generations(), (0, 0))
+        self.assertEqual(recorder.keyframe_generations, [0])
+        recorder.close()
+
+    def test_reopen_existing_file(self):
+        """测试重新打开已有历史文件后仍可回放"""
+        recorder, _, states = self.record_run(12)
+        recorder.close()
+
+        reopened = HistoryRecorder(self.path, keyframe_interval=5)
+        self.assertEqual(reopened.seek(12)[3], states[12])
+        self.assertEqual(reopened.seek(7)[3], states[7])
+        reopened.close()
+
+    def test_delete_and_clear_dir(self):
+        """测试删除历史文件，以及清空目录时只删除历史文件"""
+        recorder, _, _ = self.record_run(3)
+        recorder.delete()
+        self.assertEqual(os.listdir(self.directory.name), [])
+
+        recorder, _, _ = self.record_run(3)
+        recorder.close()
+        other = os.path.join(self.directory.name, 'notes.txt')
+        open(other, 'w').close()
+        clear_history_dir(self.directory.name)
+        self.assertEqual(os.listdir(self.directory.name), ['notes.txt'])
+
+if __name__ == '__main__':
+    unittest.main()
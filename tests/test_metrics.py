@@ -0,0 +1,88 @@
+# 性能指标测试
+import unittest
+from src.grid import Grid
+from src.evolution import Evolution
+from src.metrics import Metrics
+
+try:
+    import flask
+except ImportError:  # 接口测试需要flask
+    flask = None
+
+class TestMetrics(unittest.TestCase):
+    def test_percentiles_use_recent_window(self):
+        """测试分位数只基于最近window次样本，总和与次数包含全部样本"""
+        metrics = Metrics(window=10)
+        for value in range(100):
+            metrics.observe('step', float(value))
+        percentiles = metrics.percentiles('step', [0.5, 0.9])
+        self.assertEqual(percentiles[0.5], 95.0)
+        self.assertEqual(percentiles[0.9], 99.0)
+        summary = metrics.summary()['phases']['step']
+        self.assertEqual(summary['count'], 100)
+        self.assertEqual(summary['total_seconds'], sum(range(100)))
+    
+    def test_prometheus_text(self):
+        """测试Prometheus文本格式"""
+        metrics = Metrics()
+        metrics.observe('step', 0.5)
+        metrics.count('groups_found', 3)
+        text = metrics.to_prometheus(prefix='test')
+        self.assertIn('# TYPE test_phase_seconds summary', text)
+        self.assertIn('test_phase_seconds{phase="step",quantile="0.5"} 0.500000000', text)
+        self.assertIn('test_phase_seconds_count{phase="step"} 1', text)
+        self.assertIn('test_groups_found_total 3', text)
+
+class TestEvolutionMetrics(unittest.TestCase):
+    def setUp(self):
+        self.grid = Grid(width=20, height=20)
+        self.grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2), (10, 9), (10, 10), (10, 11)])
+        self.evolution = Evolution(self.grid)
+    
+    def test_disabled_by_default(self):
+        """测试默认不采集指标"""
+        self.evolution.evolve()
+        self.evolution.get_species_list()
+        self.assertIsNone(self.evolution.metrics)
+    
+    def test_phases_and_counters(self):
+        """测试启用后记录各阶段耗时与计数"""
+        metrics = self.evolution.enable_metrics()
+        self.evolution.evolve()
+        self.evolution.evolve_n(3)
+        self.evolution.get_species_list()
+        summary = metrics.summary()
+        self.assertEqual(set(summary['phases']),
+                         {'step', 'step_n', 'detect_groups', 'species_update', 'process_evolution'})
+        self.assertEqual(summary['counters']['generations'], 4)
+        self.assertEqual(summary['counters']['groups_found'], 2)
+        self.assertEqual(summary['counters']['analyses'], 1)
+        self.assertGreater(summary['counters']['cells_visited'], 0)
+        
+        self.evolution.disable_metrics()
+        self.evolution.evolve()
+        self.assertEqual(metrics.summary()['counters']['generations'], 4)
+
+@unittest.skipIf(flask is None, "需要安装 flask")
+class TestMetricsEndpoint(unittest.TestCase):
+    def test_metrics_endpoint(self):
+        """测试/api/metrics返回Prometheus文本"""
+        import app
+        previous = app.metrics
+        app.metrics = Metrics()
+        session = 'metrics-test'
+        try:
+            client = app.app.test_client()
+            client.post(f'/api/evolve?session={session}')
+            response = client.get('/api/metrics')
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.mimetype.startswith('text/plain'))
+            text = response.get_data(as_text=True)
+            self.assertIn('game_of_life_resident_sessions', text)
+            self.assertIn('game_of_life_phase_seconds_count{phase="step"} 1', text)
+        finally:
+            app.metrics = previous
+            app.registry.remove(session)
+
+if __name__ == '__main__':
+    unittest.main()
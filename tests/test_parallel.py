@@ -0,0 +1,135 @@
+# 多进程条带分解测试
+import unittest
+from multiprocessing import shared_memory
+from src.grid import Grid
+from src.engine import SparseEngine, ParallelEngine, np
+from src.group_detection import GroupDetection, ParallelGroupDetection
+from src.evolution import Evolution
+from src.parallel import split_strips
+from src.config import BOUNDARY_TYPES
+
+def canonical(groups):
+    """把群体列表转换为与顺序无关的形式"""
+    return sorted(sorted(group) for group in groups)
+
+class TestSplitStrips(unittest.TestCase):
+    def test_split_covers_all_rows(self):
+        """测试条带首尾相接覆盖全部行，且行数最多相差1"""
+        strips = split_strips(10, 3)
+        self.assertEqual(strips, [(0, 4), (4, 7), (7, 10)])
+        # 条带数不超过行数
+        self.assertEqual(split_strips(2, 8), [(0, 1), (1, 2)])
+
+@unittest.skipIf(np is None, "需要安装 numpy")
+class TestParallelEngine(unittest.TestCase):
+    def test_matches_sparse_engine(self):
+        """测试两种边界下多进程引擎与稀疏引擎逐代结果一致（含只有一行的条带）"""
+        for boundary_type in BOUNDARY_TYPES.values():
+            for workers in (3, 17):
+                with self.subTest(boundary_type=boundary_type, workers=workers):
+                    grid = Grid(width=23, height=17, boundary_type=boundary_type)
+                    grid.randomize(0.35, seed=workers)
+                    reference = grid.copy()
+                    engine = ParallelEngine(workers=workers)
+                    sparse = SparseEngine()
+                    for _ in range(4):
+                        born, died = engine.step(grid)
+                        expected = sparse.step(reference)
+                        self.assertEqual((born, died), expected)
+                    engine.step_n(grid, 5)
+                    sparse.step_n(reference, 5)
+                    self.assertEqual(grid.live_cells, reference.live_cells)
+                    self.assertEqual(grid.board_hash, reference.board_hash)
+                    engine.close()
+    
+    def test_edits_between_steps(self):
+        """测试共享内存跨调用保存当前代，网格在推进之间被修改后重新写入"""
+        grid = Grid(width=20, height=20, boundary_type=BOUNDARY_TYPES['fixed'])
+        grid.randomize(0.3, seed=2)
+        reference = grid.copy()
+        engine = ParallelEngine(workers=3)
+        sparse = SparseEngine()
+        engine.step_n(grid, 3)
+        sparse.step_n(reference, 3)
+        for cell in ((0, 0), (10, 10), (19, 5)):
+            grid.set_cell(*cell, 1 - grid.grid[cell[0]][cell[1]])
+            reference.set_cell(*cell, 1 - reference.grid[cell[0]][cell[1]])
+        engine.step_n(grid, 2)
+        sparse.step_n(reference, 2)
+        self.assertEqual(grid.live_cells, reference.live_cells)
+        # 换一块同样大小的网格也会重新写入
+        other = reference.copy()
+        engine.step(other)
+        sparse.step(reference)
+        self.assertEqual(other.live_cells, reference.live_cells)
+        engine.close()
+    
+    def test_glider_crosses_seams(self):
+        """测试滑翔机穿过条带接缝和环面边缘后回到原位"""
+        grid = Grid(width=8, height=8, boundary_type=BOUNDARY_TYPES['periodic'])
+        glider = [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]
+        grid.load_pattern(glider)
+        engine = ParallelEngine(workers=4)
+        engine.step_n(grid, 32)
+        self.assertEqual(grid.live_cells, set(glider))
+        engine.close()
+
+@unittest.skipIf(np is None, "需要安装 numpy")
+class TestParallelGroupDetection(unittest.TestCase):
+    def test_matches_dfs(self):
+        """测试条带内标记加接缝合并的结果与深度优先搜索一致"""
+        for boundary_type in BOUNDARY_TYPES.values():
+            with self.subTest(boundary_type=boundary_type):
+                grid = Grid(width=30, height=20, boundary_type=boundary_type)
+                grid.randomize(0.3, seed=5)
+                detector = ParallelGroupDetection(grid, workers=4)
+                self.assertEqual(canonical(detector.detect_groups()),
+                                 canonical(GroupDetection(grid).detect_groups()))
+                detector.close()
+    
+    def test_groups_across_seams_and_edges(self):
+        """测试跨越条带接缝、斜向接缝以及环面首尾行的群体被合并"""
+        grid = Grid(width=10, height=8, boundary_type=BOUNDARY_TYPES['periodic'])
+        # 竖直跨越所有接缝的一列、斜向相连的两个细胞、跨越首尾行的一对细胞
+        grid.load_pattern([(x, 0) for x in range(8)] + [(3, 5), (4, 6), (7, 8), (0, 9)])
+        detector = ParallelGroupDetection(grid, workers=4)
+        groups = canonical(detector.detect_groups())
+        self.assertEqual(groups, canonical(GroupDetection(grid).detect_groups()))
+        self.assertEqual(len(groups), 2)
+        
+        cells, group_ids = detector.detect_group_labels()
+        self.assertEqual(sorted(cells.tolist()), sorted(x * 10 + y for (x, y) in grid.live_cells))
+        self.assertEqual(sorted(group_ids.tolist()), [0] * 10 + [1] * 2)
+        detector.close()
+
+@unittest.skipIf(np is None, "需要安装 numpy")
+class TestSharedMemoryLifetime(unittest.TestCase):
+    def assertReleased(self, board):
+        """共享内存已被删除，无法再按名称附加"""
+        for block in board._blocks:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=block.name)
+    
+    def test_lazy_allocation_and_close(self):
+        """测试共享内存在首次使用时才分配，关闭演化或切换引擎时释放"""
+        grid = Grid(width=12, height=12, boundary_type=BOUNDARY_TYPES['periodic'])
+        grid.randomize(0.3, seed=4)
+        evolution = Evolution(grid, engine='parallel', detector='parallel')
+        self.assertIsNone(evolution.engine.board)
+        self.assertIsNone(evolution.group_detector.board)
+        
+        evolution.evolve(delta_time=0.1)
+        evolution.analyze()
+        engine_board = evolution.engine.board
+        detector_board = evolution.group_detector.board
+        self.assertIsNotNone(engine_board)
+        self.assertIsNotNone(detector_board)
+        
+        evolution.set_engine('sparse')
+        self.assertReleased(engine_board)
+        evolution.close()
+        self.assertIsNone(evolution.group_detector.board)
+        self.assertReleased(detector_board)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+# 图案文件模块测试
+import os
+import tempfile
+import unittest
+from src.grid import Grid
+from src.pattern_io import parse_rle, format_rle, parse_cells, format_cells, read_pattern, write_pattern
+
+GLIDER_RLE = """#N Glider
+#C A comment line
+x = 3, y = 3, rule = B3/S23
+bob$2bo$3o!
+"""
+
+GLIDER_CELLS = """!Name: Glider
+.O.
+..O
+OOO
+"""
+
+GLIDER = {(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)}
+
+class TestPatternIO(unittest.TestCase):
+    """测试RLE与.cells格式的读写"""
+
+    def test_parse_rle(self):
+        """测试解析RLE"""
+        self.assertEqual(set(parse_rle(GLIDER_RLE)), GLIDER)
+
+    def test_parse_rle_blank_rows(self):
+        """测试RLE中带计数的换行表示空行"""
+        self.assertEqual(set(parse_rle('x = 2, y = 4\n2o3$2o!')), {(0, 0), (0, 1), (3, 0), (3, 1)})
+
+    def test_parse_cells(self):
+        """测试解析.cells"""
+        self.assertEqual(set(parse_cells(GLIDER_CELLS)), GLIDER)
+
+    def test_parse_clamped_to_grid(self):
+        """测试给出范围时超出的细胞被丢弃，巨大的游程不会展开"""
+        self.assertEqual(parse_rle('999999999o!', 2, 3), [(0, 0), (0, 1), (0, 2)])
+        self.assertEqual(set(parse_rle('2o$999999999$o$o!', 3, 5)), {(0, 0), (0, 1)})
+        self.assertEqual(set(parse_rle(GLIDER_RLE, 2, 2)), {(0, 1)})
+        self.assertEqual(set(parse_cells(GLIDER_CELLS, 2, 2)), {(0, 1)})
+        self.assertEqual(parse_rle('3o!', 0, 0), [])
+    
+    def test_round_trip(self):
+        """测试编码后再解析得到同样的图案（平移到原点）"""
+        cells = {(5, 7), (5, 8), (9, 7), (12, 20), (12, 21), (12, 22)}
+        normalized = {(x - 5, y - 7) for (x, y) in cells}
+        self.assertEqual(set(parse_rle(format_rle(cells))), normalized)
+        self.assertEqual(set(parse_cells(format_cells(cells))), normalized)
+
+    def test_long_rle_lines_wrap(self):
+        """测试RLE每行不超过70个字符"""
+        cells = {(0, y) for y in range(0, 400, 2)}
+        text = format_rle(cells)
+        self.assertTrue(all(len(line) <= 70 for line in text.splitlines()))
+        self.assertEqual(set(parse_rle(text)), cells)
+
+    def test_file_round_trip_into_grid(self):
+        """测试写出文件后读回并加载到网格"""
+        with tempfile.TemporaryDirectory() as directory:
+            for extension in ('.rle', '.cells'):
+                path = os.path.join(directory, 'glider' + extension)
+                write_pattern(path, GLIDER, name='Glider')
+                grid = Grid(width=10, height=10)
+                grid.load_pattern(read_pattern(path, origin=(3, 4)))
+                self.assertEqual(grid.get_live_cells(), {(x + 3, y + 4) for (x, y) in GLIDER})
+
+    def test_unknown_extension(self):
+        """测试不支持的扩展名"""
+        with self.assertRaises(ValueError):
+            read_pattern('pattern.lif')
+
+if __name__ == '__main__':
+    unittest.main()
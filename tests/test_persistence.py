@@ -0,0 +1,109 @@
+# 存档模块测试
+import os
+import tempfile
+import time
+import unittest
+import zlib
+from src.grid import Grid
+from src.evolution import Evolution
+from src import persistence
+from src.species_manager import Species
+from src.config import BOUNDARY_TYPES
+from tests.test_engine import make_random_grid
+
+class TestPersistence(unittest.TestCase):
+    """测试二进制存档的保存与读取"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'game.gols')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_round_trip_with_species(self):
+        """测试网格、世代与物种状态（含生存时间）完整恢复"""
+        grid = make_random_grid(37, 23, BOUNDARY_TYPES['fixed'], seed=1)
+        evolution = Evolution(grid)
+        for _ in range(5):
+            evolution.evolve(delta_time=0.1)
+        species_manager = evolution.get_species_manager()
+        persistence.save(self.path, grid, species_manager.get_species_list(), 5,
+                         species_manager.next_species_id)
+
+        saved = persistence.load(self.path)
+        self.assertEqual(saved.grid.get_size(), grid.get_size())
+        self.assertEqual(saved.grid.boundary_type, BOUNDARY_TYPES['fixed'])
+        self.assertEqual(saved.grid.grid, grid.grid)
+        self.assertEqual(saved.grid.get_live_cells(), grid.get_live_cells())
+        self.assertEqual(saved.generation, 5)
+        self.assertEqual(saved.next_species_id, species_manager.next_species_id)
+        self.assertEqual(
+            [(s.species_id, s.group, s.stage, s.survival_time, s.evolution_progress)
+             for s in species_manager.get_species_list()],
+            [(s.species_id, s.group, s.stage, s.survival_time, s.evolution_progress)
+             for s in saved.species])
+
+    def test_corrupted_file(self):
+        """测试损坏或非存档文件被拒绝"""
+        grid = make_random_grid(10, 10, BOUNDARY_TYPES['periodic'], seed=2)
+        data = bytearray(persistence.dumps(grid))
+        data[-1] ^= 0xFF
+        with self.assertRaises(ValueError):
+            persistence.loads(bytes(data))
+        with self.assertRaises(ValueError):
+            persistence.loads(b'not a save file at all, definitely not')
+
+    def test_malformed_headers_and_lengths(self):
+        """测试校验和无法发现的头部损坏以及越界的长度和下标都抛出ValueError"""
+        grid = Grid(width=6, height=5)
+        grid.load_pattern([(1, 1), (1, 2)])
+        species = Species({(1, 1), (1, 2)}, 1, 0)
+        data = persistence.dumps(grid, [species], rule='B3/S23')
+        fields = list(persistence.HEADER.unpack_from(data))
+        
+        def rebuild(body=None, **changes):
+            """改写头部字段或正文，并按新正文重算校验和"""
+            header = dict(zip(('magic', 'version', 'boundary', 'width', 'height', 'generation',
+                               'next_species_id', 'species_count', 'checksum'), fields))
+            header.update(changes)
+            body = data[persistence.HEADER.size:] if body is None else body
+            header['checksum'] = zlib.crc32(body)
+            return persistence.HEADER.pack(*header.values()) + body
+        
+        body = bytearray(data[persistence.HEADER.size:])
+        board_size = (6 * 5 + 7) // 8
+        index_offset = board_size + persistence.SPECIES_HEADER.size
+        out_of_range = bytearray(body)
+        out_of_range[index_offset:index_offset + 4] = (6 * 5).to_bytes(4, 'little')
+        long_rule = body[:-len('B3/S23') - persistence.RULE_HEADER.size] + persistence.RULE_HEADER.pack(200) + b'B3/S23'
+        cases = {
+            'boundary': rebuild(boundary=7),
+            'species_count': rebuild(species_count=50),
+            'board_size': rebuild(width=6000, height=5000),
+            'species_index': rebuild(bytes(out_of_range)),
+            'rule_length': rebuild(bytes(long_rule)),
+        }
+        for name, corrupted in cases.items():
+            with self.subTest(name=name):
+                with self.assertRaises(ValueError):
+                    persistence.loads(corrupted)
+        self.assertEqual(persistence.loads(rebuild()).grid.get_live_cells(), {(1, 1), (1, 2)})
+
+    def test_large_board_is_fast(self):
+        """测试大网格的保存与读取在毫秒级完成"""
+        if persistence.np is None:
+            self.skipTest("需要安装 numpy")
+        grid = make_random_grid(500, 500, BOUNDARY_TYPES['periodic'], seed=3)
+        start = time.perf_counter()
+        persistence.save(self.path, grid)
+        saved = persistence.load(self.path)
+        elapsed = time.perf_counter() - start
+
+        self.assertEqual(saved.grid.get_live_cells(), grid.get_live_cells())
+        self.assertEqual(os.path.getsize(self.path), persistence.HEADER.size + 500 * 500 // 8
+                         + persistence.RULE_HEADER.size + len(persistence.DEFAULT_RULE))
+        self.assertLess(elapsed, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+# 规则编译模块测试
+import os
+import tempfile
+import unittest
+import zlib
+from src.grid import Grid
+from src.engine import create_engine, np
+from src.evolution import Evolution
+from src.game_state import GameState
+from src.rules import compile_rule, CONWAY
+from src import persistence
+from src.config import BOUNDARY_TYPES, LIFE_RULES
+
+try:
+    import flask
+except ImportError:  # 接口测试需要flask
+    flask = None
+
+def reference_step(grid: Grid, birth, survive) -> set:
+    """逐格数邻居的参考实现，返回下一代的存活细胞"""
+    new_cells = set()
+    for x in range(grid.height):
+        for y in range(grid.width):
+            count = grid.count_live_neighbors(x, y)
+            if (count in survive) if grid.get_cell(x, y) else (count in birth):
+                new_cells.add((x, y))
+    return new_cells
+
+class TestRuleCompiler(unittest.TestCase):
+    def test_parse_notations(self):
+        """测试B/S记法、S/B记法与预设名称解析为同一张表"""
+        highlife = compile_rule('B36/S23')
+        self.assertEqual(highlife.birth, {3, 6})
+        self.assertEqual(highlife.survive, {2, 3})
+        self.assertEqual(compile_rule('b36/s23'), highlife)
+        self.assertEqual(compile_rule('23/36'), highlife)
+        self.assertEqual(compile_rule('highlife'), highlife)
+        self.assertEqual(highlife.notation, 'B36/S23')
+        self.assertTrue(CONWAY.is_conway)
+        self.assertFalse(highlife.is_conway)
+        for name, notation in LIFE_RULES.items():
+            with self.subTest(name=name):
+                self.assertEqual(compile_rule(name).notation, notation)
+
+    def test_lookup_table(self):
+        """测试查找表按 自身状态*9+邻居数 给出下一代"""
+        rule = compile_rule('day_and_night')
+        self.assertEqual(len(rule.table), 18)
+        self.assertEqual([rule.next_state(0, n) for n in range(9)], [0, 0, 0, 1, 0, 0, 1, 1, 1])
+        self.assertEqual([rule.next_state(1, n) for n in range(9)], [0, 0, 0, 1, 1, 0, 1, 1, 1])
+
+    def test_invalid_rules(self):
+        """测试无法解析的规则和B0规则被拒绝"""
+        for text in ('B9/S23', 'conway!', 'B3S23', 'B03/S23'):
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    compile_rule(text)
+
+class TestRuleEngines(unittest.TestCase):
+    def test_engines_follow_rule(self):
+        """测试各引擎在HighLife、Day & Night和Seeds下与参考实现逐代一致"""
+        names = ['python', 'sparse', 'lookup'] + (['numpy', 'bitpacked'] if np is not None else [])
+        for notation in ('highlife', 'day_and_night', 'seeds', 'B3/S012345678'):
+            rule = compile_rule(notation)
+            for boundary_type in BOUNDARY_TYPES.values():
+                for name in names:
+                    with self.subTest(rule=notation, boundary_type=boundary_type, engine=name):
+                        grid = Grid(width=13, height=11, boundary_type=boundary_type)
+                        grid.randomize(0.45, seed=7)
+                        reference = grid.copy()
+                        engine = create_engine(name, rule)
+                        for _ in range(3):
+                            expected = reference_step(reference, rule.birth, rule.survive)
+                            born, died = engine.step(grid)
+                            self.assertEqual(grid.live_cells, expected)
+                            self.assertEqual(born, expected - reference.live_cells)
+                            self.assertEqual(died, reference.live_cells - expected)
+                            reference.load_pattern(expected)
+                        engine.step_n(grid, 4)
+                        for _ in range(4):
+                            reference.load_pattern(reference_step(reference, rule.birth, rule.survive))
+                        self.assertEqual(grid.live_cells, reference.live_cells)
+
+    def test_highlife_replicator(self):
+        """测试HighLife的复制子12代后复制出两份，而康威规则下不会"""
+        replicator = [(0, 2), (0, 3), (0, 4), (1, 1), (1, 4), (2, 0), (2, 4),
+                      (3, 0), (3, 3), (4, 0), (4, 1), (4, 2)]
+        counts = {}
+        for rule in ('highlife', 'conway'):
+            grid = Grid(width=40, height=40)
+            grid.load_pattern([(x + 18, y + 18) for (x, y) in replicator])
+            create_engine('sparse', compile_rule(rule)).step_n(grid, 12)
+            counts[rule] = len(grid.live_cells)
+        self.assertEqual(counts['highlife'], 2 * len(replicator))
+        self.assertNotEqual(counts['conway'], counts['highlife'])
+
+    def test_evolution_set_rule(self):
+        """测试切换规则后推进与快进都使用新规则"""
+        grid = Grid(width=32, height=32, boundary_type=BOUNDARY_TYPES['periodic'])
+        grid.randomize(0.4, seed=3)
+        reference = grid.copy()
+        evolution = Evolution(grid, engine='sparse')
+        rule = evolution.set_rule('B36/S23')
+        evolution.evolve(delta_time=0.1)
+        reference.load_pattern(reference_step(reference, rule.birth, rule.survive))
+        self.assertEqual(grid.live_cells, reference.live_cells)
+        evolution.fast_forward(8)
+        for _ in range(8):
+            reference.load_pattern(reference_step(reference, rule.birth, rule.survive))
+        self.assertEqual(grid.live_cells, reference.live_cells)
+        with self.assertRaises(ValueError):
+            evolution.set_rule('B0/S8')
+        self.assertEqual(evolution.rule, rule)
+
+class TestRulePersistence(unittest.TestCase):
+    def test_round_trip(self):
+        """测试存档保存规则，旧版本存档按默认规则读取"""
+        game = GameState(20, 20)
+        game.evolution.set_rule('day_and_night')
+        restored = GameState.from_bytes(game.to_bytes())
+        self.assertEqual(restored.evolution.rule.notation, 'B3678/S34678')
+
+        # 去掉规则段并改写版本号和校验和，得到版本1的存档
+        data = persistence.dumps(Grid(width=8, height=8), rule='B36/S23')
+        body = data[persistence.HEADER.size:-(persistence.RULE_HEADER.size + len('B36/S23'))]
+        fields = list(persistence.HEADER.unpack_from(data))
+        fields[1] = 1
+        fields[-1] = zlib.crc32(body)
+        saved = persistence.loads(persistence.HEADER.pack(*fields) + body)
+        self.assertEqual(saved.rule, CONWAY.notation)
+
+    def test_invalid_rule_rejected(self):
+        """测试校验和正确但规则无效的存档被拒绝，加载失败时会话保持原状"""
+        data = persistence.dumps(Grid(width=8, height=8), rule='B0/S23')
+        with self.assertRaises(ValueError):
+            persistence.loads(data)
+        
+        game = GameState(10, 10)
+        game.grid.load_pattern([(4, 3), (4, 4), (4, 5)])
+        saved = persistence.SavedState(Grid(width=6, height=6), [], 7, 0, 'B0/S23')
+        with self.assertRaises(ValueError):
+            game.load_saved(saved)
+        game.step(delta_time=0.1)
+        self.assertEqual(game.grid.live_cells, {(3, 4), (4, 4), (5, 4)})
+    
+    def test_file_round_trip(self):
+        """测试写入文件后读回规则"""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'game.gols')
+            persistence.save(path, Grid(width=8, height=8), rule='B2/S')
+            self.assertEqual(persistence.load(path).rule, 'B2/S')
+
+@unittest.skipIf(flask is None, "需要安装 flask")
+class TestRuleEndpoint(unittest.TestCase):
+    def test_rule_endpoint(self):
+        """测试/api/rule查询、切换规则并拒绝无效规则"""
+        import app
+        session = 'rule-test'
+        try:
+            client = app.app.test_client()
+            response = client.get(f'/api/rule?session={session}')
+            self.assertEqual(response.get_json()['rule'], CONWAY.notation)
+            self.assertEqual(response.get_json()['presets'], LIFE_RULES)
+            response = client.post(f'/api/rule?session={session}', json={'rule': 'highlife'})
+            self.assertEqual(response.get_json()['rule'], 'B36/S23')
+            response = client.post(f'/api/rule?session={session}', json={'rule': 'B0/S'})
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(client.get(f'/api/rule?session={session}').get_json()['rule'], 'B36/S23')
+        finally:
+            app.registry.remove(session)
+    
+    def test_load_bad_rule(self):
+        """测试上传规则无效的存档返回400，之后会话仍可正常演化"""
+        import app
+        session = 'rule-load-test'
+        try:
+            client = app.app.test_client()
+            client.post(f'/api/randomize?session={session}', json={'density': 0.3})
+            data = persistence.dumps(Grid(width=8, height=8), rule='B0/S23')
+            response = client.post(f'/api/load?session={session}', data=data)
+            self.assertEqual(response.status_code, 400)
+            response = client.post(f'/api/evolve?session={session}', json={'steps': 3})
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(response.get_json()['generation'], 3)
+        finally:
+            app.registry.remove(session)
+
+if __name__ == '__main__':
+    unittest.main()
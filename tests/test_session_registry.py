@@ -0,0 +1,162 @@
+# 多会话注册表测试
+import os
+import tempfile
+import threading
+import unittest
+from src.game_state import GameState
+from src.session_registry import SessionRegistry
+from tests.test_engine import make_random_grid
+from src.config import BOUNDARY_TYPES
+
+def make_game(seed: int, width: int = 30, height: int = 20) -> GameState:
+    """生成随机初始化并演化过几代的会话"""
+    game = GameState(width, height)
+    source = make_random_grid(width, height, BOUNDARY_TYPES['periodic'], seed)
+    for (x, y) in source.get_live_cells():
+        game.grid.set_cell(x, y, 1)
+    for _ in range(3):
+        game.step()
+    return game
+
+class TestGameStateSerialization(unittest.TestCase):
+    """测试会话序列化"""
+
+    def test_round_trip(self):
+        """测试序列化后恢复网格、世代与物种"""
+        game = make_game(seed=1)
+        restored = GameState.from_bytes(game.to_bytes())
+
+        self.assertEqual(restored.grid.get_size(), game.grid.get_size())
+        self.assertEqual(restored.grid.boundary_type, game.grid.boundary_type)
+        self.assertEqual(restored.grid.get_live_cells(), game.grid.get_live_cells())
+        self.assertEqual(restored.grid.grid, game.grid.grid)
+        self.assertEqual(restored.generation, game.generation)
+
+        original = game.evolution.get_species_manager()
+        recovered = restored.evolution.get_species_manager()
+        self.assertEqual(
+            [(s.species_id, s.group, s.stage, s.survival_time) for s in original.get_species_list()],
+            [(s.species_id, s.group, s.stage, s.survival_time) for s in recovered.get_species_list()])
+        self.assertEqual(recovered.next_species_id, original.next_species_id)
+
+    def test_serialized_form_is_compact(self):
+        """测试序列化结果远小于内存占用"""
+        game = make_game(seed=2, width=200, height=200)
+        self.assertLess(len(game.to_bytes()) * 10, game.memory_usage())
+
+class TestSessionRegistry(unittest.TestCase):
+    """测试会话的创建、LRU换出与恢复"""
+
+    def test_sessions_are_independent(self):
+        """测试不同会话互不影响"""
+        registry = SessionRegistry()
+        registry.get('a').grid.set_cell(1, 1, 1)
+        self.assertEqual(registry.get('b').grid.get_live_cells(), set())
+        self.assertEqual(registry.get('a').grid.get_live_cells(), {(1, 1)})
+
+    def test_lru_eviction_and_rehydration(self):
+        """测试超过数量上限时换出最久未用的会话，再次访问时透明恢复"""
+        registry = SessionRegistry(factory=lambda: make_game(seed=3), max_resident=2)
+        cells = registry.get('a').grid.get_live_cells()
+        registry.get('b')
+        registry.get('a')
+        registry.get('c')
+
+        self.assertEqual(list(registry.resident), ['a', 'c'])
+        self.assertIn('b', registry.evicted)
+
+        registry.get('b')
+        self.assertNotIn('b', registry.evicted)
+        self.assertEqual(registry.rehydrations, 1)
+        self.assertEqual(registry.get('a').grid.get_live_cells(), cells)
+
+    def test_running_session_not_evicted(self):
+        """测试运行中的会话不会被换出"""
+        registry = SessionRegistry(max_resident=1)
+        game = registry.get('a')
+        game.is_running = True
+        registry.get('b')
+        self.assertIn('a', registry.resident)
+        game.is_running = False
+
+    def test_leased_session_not_evicted(self):
+        """测试持有租约的会话不会被换出，归还后才会换出，修改不会丢失"""
+        registry = SessionRegistry(max_resident=1)
+        game = registry.acquire('a')
+        registry.get('b')
+        self.assertIn('a', registry.resident)
+        game.grid.set_cell(1, 1, 1)
+        registry.release(game)
+        registry.get('c')
+        self.assertIn('a', registry.evicted)
+        self.assertEqual(registry.get('a').grid.get_live_cells(), {(1, 1)})
+    
+    def test_busy_session_not_evicted(self):
+        """测试写锁被其他线程持有时不换出该会话"""
+        registry = SessionRegistry(max_resident=1)
+        game = registry.get('a')
+        locked = threading.Event()
+        done = threading.Event()
+        
+        def hold_lock():
+            with game.lock:
+                locked.set()
+                done.wait()
+        
+        thread = threading.Thread(target=hold_lock)
+        thread.start()
+        locked.wait()
+        try:
+            registry.get('b')
+            self.assertIn('a', registry.resident)
+        finally:
+            done.set()
+            thread.join()
+
+    def test_history_files_removed(self):
+        """测试会话被销毁或换出时删除其历史文件和索引文件"""
+        with tempfile.TemporaryDirectory() as directory:
+            registry = SessionRegistry(max_resident=1)
+            paths = {}
+            for session_id in ('a', 'b'):
+                paths[session_id] = os.path.join(directory, f'{session_id}.hist')
+                game = registry.get(session_id)
+                game.enable_history(paths[session_id])
+                game.step()
+                self.assertTrue(os.path.exists(paths[session_id] + '.idx'))
+            # 'b'的加入使'a'被换出
+            self.assertIn('a', registry.evicted)
+            self.assertFalse(os.path.exists(paths['a']))
+            self.assertFalse(os.path.exists(paths['a'] + '.idx'))
+            
+            registry.remove('b')
+            self.assertEqual(os.listdir(directory), [])
+
+    def test_memory_cap(self):
+        """测试超过内存上限时换出空闲会话"""
+        registry = SessionRegistry(factory=lambda: make_game(seed=4), max_resident_bytes=1)
+        registry.get('a')
+        registry.get('b')
+        self.assertEqual(list(registry.resident), ['b'])
+
+    def test_total_cap_drops_oldest(self):
+        """测试会话总数超限时丢弃最久未用的已换出会话"""
+        registry = SessionRegistry(max_resident=1, max_total=2)
+        for session_id in ['a', 'b', 'c']:
+            registry.get(session_id)
+        self.assertNotIn('a', registry)
+        self.assertEqual(len(registry), 2)
+
+    def test_metrics(self):
+        """测试指标包含常驻会话数与每会话字节数"""
+        registry = SessionRegistry(max_resident=1)
+        registry.get('a')
+        registry.get('b')
+        metrics = registry.metrics()
+        self.assertEqual(metrics['resident_sessions'], 1)
+        self.assertEqual(metrics['evicted_sessions'], 1)
+        self.assertEqual(metrics['sessions'][0]['id'], 'b')
+        self.assertGreater(metrics['sessions'][0]['bytes'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
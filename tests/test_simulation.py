@@ -0,0 +1,99 @@
+# 后台模拟循环测试
+import threading
+import time
+import unittest
+from src.simulation import SimulationLoop
+from src.game_state import GameState
+
+class TestSimulationLoop(unittest.TestCase):
+    """测试后台模拟循环的启停与速率"""
+
+    def test_start_and_stop(self):
+        """测试启动后持续演化，暂停后不再演化"""
+        stepped = threading.Event()
+        loop = SimulationLoop(stepped.set, steps_per_second=200)
+        loop.start()
+        self.assertTrue(stepped.wait(timeout=2))
+        self.assertTrue(loop.is_running())
+
+        loop.stop()
+        time.sleep(0.05)
+        steps = loop.steps
+        time.sleep(0.1)
+        self.assertEqual(loop.steps, steps)
+        self.assertFalse(loop.is_running())
+        loop.close()
+
+    def test_rate_limit(self):
+        """测试演化速率不超过目标速率"""
+        loop = SimulationLoop(lambda: None, steps_per_second=50)
+        loop.start()
+        time.sleep(0.3)
+        loop.close()
+        self.assertGreater(loop.steps, 0)
+        self.assertLessEqual(loop.steps, 20)
+
+    def test_slow_step_does_not_accumulate(self):
+        """测试单步耗时超过节拍时不会补步"""
+        loop = SimulationLoop(lambda: time.sleep(0.02), steps_per_second=1000)
+        loop.start()
+        time.sleep(0.2)
+        loop.stop()
+        loop.close()
+        self.assertLessEqual(loop.steps, 12)
+
+    def test_failing_step_pauses(self):
+        """测试step抛出异常时循环暂停并报告未运行，之后可以重新启动"""
+        calls = []
+        errors = []
+        resumed = threading.Event()
+        
+        def step():
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("boom")
+            resumed.set()
+        
+        loop = SimulationLoop(step, steps_per_second=200, on_error=errors.append)
+        with self.assertLogs('src.simulation', level='ERROR'):
+            loop.start()
+            deadline = time.monotonic() + 2
+            while not errors and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertEqual([str(error) for error in errors], ['boom'])
+        self.assertIs(loop.last_error, errors[0])
+        self.assertFalse(loop.is_running())
+        self.assertEqual(loop.steps, 0)
+        
+        loop.start()
+        self.assertTrue(resumed.wait(timeout=2))
+        self.assertTrue(loop.is_running())
+        loop.close()
+    
+    def test_game_state_reports_failed_loop(self):
+        """测试后台演化出错后会话不再显示为运行中"""
+        game = GameState(10, 10)
+        
+        def broken_evolve(delta_time=0.1):
+            raise IndexError("broken")
+        
+        game.evolution.evolve = broken_evolve
+        with self.assertLogs('src.simulation', level='ERROR'):
+            game.start()
+            deadline = time.monotonic() + 2
+            while game.is_running and time.monotonic() < deadline:
+                time.sleep(0.01)
+        self.assertFalse(game.is_running)
+        self.assertFalse(game.loop.is_running())
+        game.close()
+    
+    def test_set_rate_clamped(self):
+        """测试速率被限制在允许范围内"""
+        loop = SimulationLoop(lambda: None)
+        loop.set_rate(0)
+        self.assertGreater(loop.steps_per_second, 0)
+        loop.set_rate(10 ** 9)
+        self.assertLessEqual(loop.steps_per_second, 1000)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,192 @@
+# 物种管理模块测试
+import random
+import unittest
+from src.grid import Grid
+from src.tiled_grid import TiledGrid
+from src.evolution import Evolution
+from src.species_manager import SpeciesManager
+from src.config import BOUNDARY_TYPES
+
+class TestSpeciesTracking(unittest.TestCase):
+    """测试物种身份跨代延续"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.grid = Grid(width=20, height=20)
+        self.species_manager = SpeciesManager(self.grid)
+
+    def test_survival_time_accumulates(self):
+        """测试同一群体的生存时间持续累积"""
+        block = {(1, 1), (1, 2), (2, 1), (2, 2)}
+        for _ in range(30):
+            self.species_manager.update([set(block)], 0.1)
+
+        species_list = self.species_manager.get_species_list()
+        self.assertEqual(len(species_list), 1)
+        self.assertAlmostEqual(species_list[0].survival_time, 3.0)
+
+    def test_identity_follows_moving_group(self):
+        """测试群体移动时（与上一轮有重叠）保持同一物种"""
+        self.species_manager.update([{(1, 1), (1, 2), (1, 3)}], 1.0)
+        species = self.species_manager.get_species_list()[0]
+
+        self.species_manager.update([{(0, 2), (1, 2), (2, 2)}], 1.0)
+        species_list = self.species_manager.get_species_list()
+        self.assertIs(species_list[0], species)
+        self.assertEqual(species.survival_time, 2.0)
+
+    def test_identity_follows_displaced_group(self):
+        """测试批量推进后群体与上一轮没有重叠时，按不超过经过代数的位移保持同一物种"""
+        self.species_manager.update([{(1, 1), (1, 2), (1, 3)}], 1.0)
+        species = self.species_manager.get_species_list()[0]
+
+        self.species_manager.update([{(4, 4), (4, 5), (4, 6)}], 1.0, generations=3)
+        self.assertIs(self.species_manager.get_species_list()[0], species)
+        self.assertEqual(species.survival_time, 2.0)
+
+        # 位移超过经过的代数，视为新物种
+        self.species_manager.update([{(10, 10), (10, 11), (10, 12)}], 1.0, generations=3)
+        self.assertIsNot(self.species_manager.get_species_list()[0], species)
+
+    def test_glider_keeps_identity_between_sparse_analyses(self):
+        """测试每隔8代才结算一次时，滑翔机始终是同一物种，生存时间持续累积"""
+        grid = Grid(width=40, height=40)
+        grid.load_pattern([(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)])
+        evolution = Evolution(grid)
+        evolution.analyze()
+        species = evolution.get_species_manager().get_species_list()[0]
+        for _ in range(4):
+            previous = set(grid.get_live_cells())
+            evolution.evolve_n(8, delta_time=0.1)
+            self.assertFalse(previous & grid.get_live_cells())
+            evolution.analyze()
+            species_list = evolution.get_species_manager().get_species_list()
+            self.assertEqual(len(species_list), 1)
+            self.assertIs(species_list[0], species)
+        self.assertAlmostEqual(species.survival_time, 3.2)
+
+    def test_infinite_grid_displaced_matching(self):
+        """测试无限网格上按位移匹配：滑翔机穿过坐标原点仍是同一物种，随机初始图案结算不出错"""
+        grid = TiledGrid(boundary_type=BOUNDARY_TYPES['fixed'])
+        grid.load_pattern([(x - 20, y - 20) for (x, y) in [(0, 1), (1, 2), (2, 0), (2, 1), (2, 2)]])
+        evolution = Evolution(grid, engine='tiled')
+        evolution.analyze()
+        species = evolution.get_species_manager().get_species_list()[0]
+        for _ in range(6):
+            evolution.evolve_n(16, delta_time=0.1)
+            species_list = evolution.get_species_manager().get_species_list()
+            self.assertEqual(species_list, [species])
+        self.assertTrue(all(x > 0 and y > 0 for (x, y) in grid.get_live_cells()))
+        
+        rng = random.Random(3)
+        grid.load_pattern([(x, y) for x in range(-15, 15) for y in range(-15, 15) if rng.random() < 0.35])
+        evolution.reset_species()
+        for _ in range(20):
+            evolution.evolve_n(4, delta_time=0.1)
+            evolution.get_species_manager().get_species_list()
+    
+    def test_split_inherits_survival_time(self):
+        """测试分裂后每个子群体继承原群体的生存时间"""
+        line = {(5, y) for y in range(8)}
+        self.species_manager.update([line], 5.0)
+        parent = self.species_manager.get_species_list()[0]
+
+        left = {(5, y) for y in range(3)}
+        right = {(5, y) for y in range(4, 8)}
+        self.species_manager.update([left, right], 1.0)
+
+        species_list = self.species_manager.get_species_list()
+        self.assertEqual(len(species_list), 2)
+        self.assertEqual([species.survival_time for species in species_list], [6.0, 6.0])
+        # 较大的子群体延续原物种身份
+        self.assertIs(species_list[1], parent)
+        self.assertNotEqual(species_list[0].species_id, parent.species_id)
+
+    def test_merge_keeps_dominant_parent(self):
+        """测试合并后延续重叠最多的亲代物种"""
+        small = {(1, 1), (1, 2)}
+        large = {(1, 4), (1, 5), (1, 6), (2, 5)}
+        self.species_manager.update([small], 4.0)
+        self.species_manager.update([small, large], 1.0)
+        large_species = self.species_manager.get_species_list()[1]
+
+        self.species_manager.update([small | large | {(1, 3)}], 1.0)
+        species_list = self.species_manager.get_species_list()
+        self.assertEqual(len(species_list), 1)
+        self.assertIs(species_list[0], large_species)
+        self.assertEqual(species_list[0].survival_time, 2.0)
+
+    def test_new_group_starts_fresh(self):
+        """测试没有重叠的新群体从零开始计时"""
+        self.species_manager.update([{(1, 1)}], 3.0)
+        self.species_manager.update([{(1, 1)}, {(10, 10), (10, 11)}], 1.0)
+        times = sorted(species.survival_time for species in self.species_manager.get_species_list())
+        self.assertEqual(times, [1.0, 4.0])
+
+    def test_reset(self):
+        """测试重置后不再继承旧物种"""
+        self.species_manager.update([{(1, 1)}], 3.0)
+        self.species_manager.reset()
+        self.species_manager.update([{(1, 1)}], 1.0)
+        self.assertEqual(self.species_manager.get_species_list()[0].survival_time, 1.0)
+
+    def test_evolution_accumulates_survival_time(self):
+        """测试演化过程中稳定群体的生存时间持续累积"""
+        evolution = Evolution(self.grid)
+        self.grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2)])
+        for _ in range(130):
+            evolution.evolve(delta_time=0.1)
+
+        species_list = evolution.get_species_manager().get_species_list()
+        self.assertEqual(len(species_list), 1)
+        self.assertAlmostEqual(species_list[0].survival_time, 13.0)
+
+class TestSpeciesIndex(unittest.TestCase):
+    """测试物种位置索引"""
+
+    def setUp(self):
+        """设置测试环境"""
+        self.grid = Grid(width=20, height=20)
+        self.species_manager = SpeciesManager(self.grid)
+        self.block = {(1, 1), (1, 2), (2, 1), (2, 2)}
+        self.line = {(10, 5), (10, 6), (10, 7)}
+        self.species_manager.update([self.block, self.line], 1.0)
+
+    def test_get_species_at(self):
+        """测试单点查询"""
+        block_species = self.species_manager.get_species_at(1, 2)
+        self.assertIs(block_species.group, self.block)
+        self.assertIsNone(self.species_manager.get_species_at(5, 5))
+
+    def test_index_follows_update(self):
+        """测试物种更新后索引同步更新"""
+        self.species_manager.update([self.block], 1.0)
+        self.assertIsNone(self.species_manager.get_species_at(10, 6))
+
+    def test_index_memory_usage(self):
+        """测试索引大小随物种细胞数增长，清空后缩小"""
+        small = SpeciesManager(self.grid).index_memory_usage()
+        large = SpeciesManager(self.grid)
+        large.update([{(x, y) for x in range(10) for y in range(10)}], 1.0)
+        self.assertGreater(large.index_memory_usage(), small)
+        large.reset()
+        self.assertEqual(large.index_memory_usage(), small)
+    
+    def test_get_species_at_many(self):
+        """测试批量查询"""
+        result = self.species_manager.get_species_at_many([(1, 1), (10, 7), (0, 0)])
+        self.assertIs(result[0].group, self.block)
+        self.assertIs(result[1].group, self.line)
+        self.assertIsNone(result[2])
+
+    def test_get_species_in_area(self):
+        """测试矩形区域查询（小区域逐格查询与大区域遍历结果一致）"""
+        small = self.species_manager.get_species_in_area(2, 2, 0, 0)
+        self.assertEqual([species.group for species in small], [self.block])
+
+        large = self.species_manager.get_species_in_area(0, 0, 19, 19)
+        self.assertEqual(len(large), 2)
+        self.assertEqual(self.species_manager.get_species_in_area(15, 15, 19, 19), [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+# 增量流编码测试
+import unittest
+from src.grid import Grid
+from src.engine import SparseEngine
+from src.stream_codec import (
+    FRAME_KEYFRAME, FRAME_DELTA, FRAME_KEEPALIVE,
+    encode_keyframe, encode_delta, encode_keepalive,
+    decode_frames, decode_keyframe, decode_delta
+)
+from src.config import BOUNDARY_TYPES
+from tests.test_engine import make_random_grid
+
+class TestStreamCodec(unittest.TestCase):
+    """测试关键帧与增量帧的编解码"""
+
+    def test_keyframe_round_trip(self):
+        """测试关键帧编码后可还原存活细胞"""
+        grid = make_random_grid(13, 7, BOUNDARY_TYPES['periodic'], seed=2)
+        data = encode_keyframe(grid.get_live_cells(), grid.width, grid.height, 5)
+
+        frames = list(decode_frames(data))
+        self.assertEqual(len(frames), 1)
+        frame_type, generation, payload = frames[0]
+        self.assertEqual(frame_type, FRAME_KEYFRAME)
+        self.assertEqual(generation, 5)
+        self.assertEqual(decode_keyframe(payload), (13, 7, grid.get_live_cells()))
+
+    def test_deltas_replay_evolution(self):
+        """测试关键帧加连续增量帧可重建演化结果"""
+        grid = make_random_grid(20, 15, BOUNDARY_TYPES['fixed'], seed=3)
+        engine = SparseEngine()
+        data = encode_keyframe(grid.get_live_cells(), grid.width, grid.height, 0)
+        for generation in range(1, 6):
+            born, died = engine.step(grid)
+            data += encode_delta(born, died, grid.width, generation)
+        data += encode_keepalive(5)
+
+        cells = set()
+        last_generation = None
+        for frame_type, generation, payload in decode_frames(data):
+            if frame_type == FRAME_KEYFRAME:
+                _, _, cells = decode_keyframe(payload)
+            elif frame_type == FRAME_DELTA:
+                born, died = decode_delta(payload, 20)
+                cells = (cells - died) | born
+            else:
+                self.assertEqual(frame_type, FRAME_KEEPALIVE)
+            last_generation = generation
+
+        self.assertEqual(cells, grid.get_live_cells())
+        self.assertEqual(last_generation, 5)
+
+    def test_delta_smaller_than_keyframe(self):
+        """测试稀疏变化时增量帧远小于关键帧"""
+        grid = Grid(width=200, height=200)
+        grid.load_pattern([(100, 99), (100, 100), (100, 101)])
+        born, died = SparseEngine().step(grid)
+        delta = encode_delta(born, died, grid.width, 1)
+        keyframe = encode_keyframe(grid.get_live_cells(), grid.width, grid.height, 1)
+        self.assertLess(len(delta), len(keyframe) // 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,146 @@
+# 分块网格测试
+import random
+import unittest
+from src.grid import Grid
+from src.tiled_grid import TiledGrid
+from src.engine import SparseEngine
+from src.evolution import Evolution
+from src.config import BOUNDARY_TYPES
+from tests.test_engine import make_random_grid
+
+def to_tiled(grid: Grid, tile_size: int) -> TiledGrid:
+    """把普通网格转换为分块网格"""
+    tiled = TiledGrid(grid.width, grid.height, grid.boundary_type, tile_size=tile_size)
+    for (x, y) in grid.get_live_cells():
+        tiled.set_cell(x, y, 1)
+    return tiled
+
+class TestTiledGridInterface(unittest.TestCase):
+    """测试分块网格接口"""
+
+    def test_set_and_get_cell(self):
+        """测试设置和获取细胞状态"""
+        grid = TiledGrid(width=10, height=10, tile_size=4)
+        grid.set_cell(5, 6, 1)
+        self.assertEqual(grid.get_cell(5, 6), 1)
+        self.assertEqual(grid.get_cell(6, 5), 0)
+        self.assertEqual(grid.get_live_cells(), {(5, 6)})
+
+    def test_empty_tiles_released(self):
+        """测试分块变空后释放存储"""
+        grid = TiledGrid(width=10, height=10, tile_size=4)
+        grid.set_cell(5, 6, 1)
+        self.assertEqual(len(grid.tiles), 1)
+        grid.set_cell(5, 6, 0)
+        self.assertEqual(len(grid.tiles), 0)
+        self.assertEqual(grid.memory_usage(), 0)
+
+    def test_count_live_neighbors(self):
+        """测试跨分块计算存活邻居数量"""
+        grid = TiledGrid(width=10, height=10, tile_size=4)
+        for i in range(3, 6):
+            for j in range(3, 6):
+                grid.set_cell(i, j, 1)
+        self.assertEqual(grid.count_live_neighbors(4, 4), 8)
+
+    def test_periodic_requires_size(self):
+        """测试无限网格不能使用周期性边界"""
+        with self.assertRaises(ValueError):
+            TiledGrid(boundary_type=BOUNDARY_TYPES['periodic'])
+
+class TestTiledGridStep(unittest.TestCase):
+    """测试分块网格演化与稀疏引擎结果一致"""
+
+    def assert_same_evolution(self, grid: Grid, tile_size: int, generations: int = 12) -> None:
+        tiled = to_tiled(grid, tile_size)
+        engine = SparseEngine()
+        for _ in range(generations):
+            expected = engine.step(grid)
+            actual = tiled.step()
+            self.assertEqual(actual, expected)
+            self.assertEqual(tiled.get_live_cells(), grid.get_live_cells())
+
+    def test_periodic_boundary(self):
+        """测试周期性边界（网格大小不是分块边长的整数倍）"""
+        for seed in range(3):
+            self.assert_same_evolution(make_random_grid(23, 17, BOUNDARY_TYPES['periodic'], seed), tile_size=8)
+
+    def test_fixed_boundary(self):
+        """测试固定边界"""
+        for seed in range(3):
+            self.assert_same_evolution(make_random_grid(23, 17, BOUNDARY_TYPES['fixed'], seed), tile_size=8)
+
+    def test_tile_larger_than_grid(self):
+        """测试分块比网格还大时周期性边界仍然正确"""
+        self.assert_same_evolution(make_random_grid(5, 3, BOUNDARY_TYPES['periodic'], seed=2, density=0.5),
+                                   tile_size=8)
+
+    def test_stable_tiles_skipped(self):
+        """测试稳定后不再有脏分块"""
+        grid = TiledGrid(width=100, height=100, boundary_type=BOUNDARY_TYPES['fixed'], tile_size=8)
+        grid.load_pattern([(1, 1), (1, 2), (2, 1), (2, 2)])
+        grid.step()
+        self.assertEqual(grid.dirty, set())
+        born, died = grid.step()
+        self.assertEqual((born, died), (set(), set()))
+
+    def test_unbounded_glider(self):
+        """测试无限网格上滑翔机可以走出任意范围"""
+        grid = TiledGrid(boundary_type=BOUNDARY_TYPES['fixed'], tile_size=8)
+        glider = [(1, 2), (2, 3), (3, 1), (3, 2), (3, 3)]
+        grid.load_pattern(glider)
+        for _ in range(400):
+            grid.step()
+
+        # 滑翔机每4代沿对角线移动1格
+        self.assertEqual(grid.get_live_cells(), {(x + 100, y + 100) for (x, y) in glider})
+        self.assertLessEqual(len(grid.tiles), 4)
+
+    def test_evolution_with_tiled_engine(self):
+        """测试演化模块可以驱动分块网格"""
+        random.seed(5)
+        grid = TiledGrid(width=30, height=30, boundary_type=BOUNDARY_TYPES['fixed'], tile_size=8)
+        grid.randomize(density=0.3)
+        reference = Grid(width=30, height=30, boundary_type=BOUNDARY_TYPES['fixed'])
+        reference.load_pattern(list(grid.get_live_cells()))
+
+        tiled_evolution = Evolution(grid, engine='tiled')
+        reference_evolution = Evolution(reference)
+        for _ in range(5):
+            tiled_evolution.evolve()
+            reference_evolution.evolve()
+
+        self.assertEqual(grid.get_live_cells(), reference.get_live_cells())
+        self.assertEqual(len(tiled_evolution.get_species_manager().get_species_list()),
+                         len(reference_evolution.get_species_manager().get_species_list()))
+
+    def test_evolve_n_and_fast_forward(self):
+        """测试分块网格上的批量推进与快进（周期性边界走HashLife）与普通网格一致"""
+        for boundary_type in BOUNDARY_TYPES.values():
+            with self.subTest(boundary_type=boundary_type):
+                random.seed(9)
+                grid = TiledGrid(width=24, height=24, boundary_type=boundary_type, tile_size=8)
+                grid.randomize(density=0.3)
+                reference = Grid(width=24, height=24, boundary_type=boundary_type)
+                reference.load_pattern(list(grid.get_live_cells()))
+                start = grid.get_live_cells()
+                
+                tiled_evolution = Evolution(grid, engine='tiled')
+                reference_evolution = Evolution(reference, engine='sparse')
+                born, died = tiled_evolution.evolve_n(5)
+                reference_evolution.evolve_n(5)
+                self.assertEqual(grid.get_live_cells(), reference.get_live_cells())
+                self.assertEqual(born, grid.get_live_cells() - start)
+                self.assertEqual(died, start - grid.get_live_cells())
+                
+                tiled_evolution.fast_forward(6)
+                reference_evolution.fast_forward(6)
+                self.assertEqual(grid.get_live_cells(), reference.get_live_cells())
+                self.assertEqual(tiled_evolution.generation, 11)
+                # 快进后分块网格仍可继续逐代推进
+                tiled_evolution.evolve()
+                reference_evolution.evolve()
+                self.assertEqual(grid.get_live_cells(), reference.get_live_cells())
+
+if __name__ == '__main__':
+    unittest.main()